@@ -0,0 +1,140 @@
+"""
+Microbenchmark: NumPy indicator kernels vs the previous pandas implementation.
+
+Usage:
+    python python/bench_indicator_kernels.py [--sizes 50 500 50000] [--repeat 7]
+
+For every series length the script times the pandas code that
+TechnicalIndicators used before (one DataFrame per call, diff / ewm /
+rolling / iloc) against indicator_kernels, checks that both agree and
+prints the per-call latency and speedup.
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import indicator_kernels as kernels
+
+
+# =============================================================================
+# Reference pandas implementations (previous TechnicalIndicators code paths)
+# =============================================================================
+
+def pandas_rsi(prices, period=14):
+    df = pd.DataFrame({'price': prices})
+    delta = df['price'].diff()
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    avg_gain = gain.ewm(alpha=1/period, min_periods=period).mean()
+    avg_loss = loss.ewm(alpha=1/period, min_periods=period).mean()
+    return (100 - (100 / (1 + avg_gain / avg_loss))).to_numpy()
+
+
+def pandas_macd(prices, fast_period=12, slow_period=26, signal_period=9):
+    df = pd.DataFrame({'price': prices})
+    macd_line = df['price'].ewm(span=fast_period).mean() - df['price'].ewm(span=slow_period).mean()
+    signal_line = macd_line.ewm(span=signal_period).mean()
+    return (macd_line - signal_line).to_numpy()
+
+
+def pandas_bollinger(prices, period=20, std_dev=2):
+    df = pd.DataFrame({'price': prices})
+    sma = df['price'].rolling(window=period).mean()
+    std = df['price'].rolling(window=period).std()
+    return (sma + std * std_dev).to_numpy()
+
+
+def pandas_ema(prices, period=21):
+    return pd.DataFrame({'price': prices})['price'].ewm(span=period).mean().to_numpy()
+
+
+def pandas_sma(prices, period=20):
+    return pd.DataFrame({'price': prices})['price'].rolling(window=period).mean().to_numpy()
+
+
+def pandas_stochastic(prices, highs, lows, k_period=14, d_period=3):
+    df = pd.DataFrame({'close': prices, 'high': highs, 'low': lows})
+    lowest_low = df['low'].rolling(window=k_period).min()
+    highest_high = df['high'].rolling(window=k_period).max()
+    k_percent = ((df['close'] - lowest_low) / (highest_high - lowest_low)) * 100
+    return k_percent.rolling(window=d_period).mean().to_numpy()
+
+
+# =============================================================================
+# NumPy kernel equivalents
+# =============================================================================
+
+def numpy_macd(prices):
+    return kernels.macd_series(prices)[2]
+
+
+def numpy_bollinger(prices):
+    return kernels.bollinger_series(prices)[0]
+
+
+def numpy_stochastic(prices, highs, lows):
+    return kernels.stochastic_series(prices, highs, lows)[1]
+
+
+CASES = [
+    ('RSI', pandas_rsi, kernels.rsi_series, False),
+    ('MACD', pandas_macd, numpy_macd, False),
+    ('Bollinger', pandas_bollinger, numpy_bollinger, False),
+    ('EMA', pandas_ema, lambda p: kernels.ema(p, 21), False),
+    ('SMA', pandas_sma, lambda p: kernels.rolling_mean(p, 20), False),
+    ('Stochastic', pandas_stochastic, numpy_stochastic, True),
+]
+
+
+def synthetic_ohlc(size: int, seed: int = 42):
+    """Random-walk close prices with highs/lows around them (lists, like the JSON input)."""
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, size)))
+    spread = np.abs(rng.normal(0, 0.005, size)) * closes
+    return closes.tolist(), (closes + spread).tolist(), (closes - spread).tolist()
+
+
+def best_time(func, repeat: int) -> float:
+    """Best per-call time in seconds."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 500, 50000])
+    parser.add_argument('--repeat', type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'indicator':<12}{'size':>8}{'pandas (us)':>14}{'numpy (us)':>14}{'speedup':>10}{'max diff':>12}")
+    print("-" * 70)
+
+    for size in args.sizes:
+        closes, highs, lows = synthetic_ohlc(size)
+
+        for name, pandas_func, numpy_func, needs_high_low in CASES:
+            inputs = (closes, highs, lows) if needs_high_low else (closes,)
+
+            expected = pandas_func(*inputs)
+            actual = numpy_func(*inputs)
+            both = ~(np.isnan(expected) | np.isnan(actual))
+            max_diff = float(np.max(np.abs(expected[both] - actual[both]))) if both.any() else 0.0
+
+            pandas_time = best_time(lambda: pandas_func(*inputs), args.repeat)
+            numpy_time = best_time(lambda: numpy_func(*inputs), args.repeat)
+
+            print(f"{name:<12}{size:>8}{pandas_time * 1e6:>14.1f}{numpy_time * 1e6:>14.1f}"
+                  f"{pandas_time / numpy_time:>9.1f}x{max_diff:>12.2e}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
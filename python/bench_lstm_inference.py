@@ -0,0 +1,75 @@
+"""
+Benchmark: per-step LSTM inference latency, model.predict vs the compiled path.
+
+Usage:
+    python python/bench_lstm_inference.py [--model python/models/lstm_model.keras]
+                                          [--calls 200] [--batch 1]
+
+Times one forward pass on a random (batch, sequence_length, n_features) input
+through Keras model.predict, an eager model(x, training=False) call and
+lstm_inference.CompiledPredictor, checks that all three agree and prints the
+mean / median latency per call and the speedup over model.predict.
+"""
+
+import os
+os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from tensorflow.keras.models import load_model
+
+from lstm_inference import CompiledPredictor
+
+
+def time_calls(func, inputs, calls: int) -> np.ndarray:
+    func(inputs)  # warm-up (tracing / predict function construction)
+    times = np.empty(calls)
+    for i in range(calls):
+        start = time.perf_counter()
+        func(inputs)
+        times[i] = time.perf_counter() - start
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default="python/models/lstm_model.keras")
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--batch', type=int, default=1)
+    args = parser.parse_args()
+
+    model = load_model(args.model)
+    predictor = CompiledPredictor(model)
+    inputs = np.random.default_rng(0).random(
+        (args.batch, predictor.sequence_length, predictor.n_features)).astype(np.float32)
+
+    paths = {
+        'model.predict': lambda x: model.predict(x, verbose=0),
+        'model(x) eager': lambda x: model(x, training=False).numpy(),
+        'CompiledPredictor': predictor
+    }
+
+    reference = paths['model.predict'](inputs)
+    for name, func in paths.items():
+        np.testing.assert_allclose(func(inputs), reference, rtol=1e-5, atol=1e-6, err_msg=name)
+
+    print(f"{args.model}: batch {args.batch}, {args.calls} calls")
+    print()
+    print(f"{'path':<20}{'mean (ms)':>12}{'median (ms)':>14}{'speedup':>10}")
+    print("-" * 56)
+
+    baseline = None
+    for name, func in paths.items():
+        times = time_calls(func, inputs, args.calls) * 1e3
+        baseline = baseline or times.mean()
+        print(f"{name:<20}{times.mean():>12.3f}{np.median(times):>14.3f}{baseline / times.mean():>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: process-pool indicator evaluation vs the single-process batch path.
+
+Usage:
+    python python/bench_parallel_indicators.py [--symbols 2000] [--length 2000]
+                                               [--workers 1 2 4 8] [--chunk-size 64] [--repeat 3]
+
+Generates synthetic OHLCV series, times TechnicalIndicators.calculate_batch_indicators
+in this process, then ParallelIndicatorEngine.calculate for every worker count (pool
+started and warmed before timing) and prints the wall time, the speedup over one
+worker and the parallel efficiency.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from indicator_parallel import ParallelIndicatorEngine
+from technical_indicators import TechnicalIndicators
+
+
+def synthetic_universe(n_symbols: int, length: int, seed: int = 7):
+    """Random-walk OHLCV series of slightly different lengths (lists, like the JSON input)."""
+    rng = np.random.default_rng(seed)
+    symbols = {}
+    for i in range(n_symbols):
+        n = int(length * rng.uniform(0.8, 1.0))
+        closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        spread = np.abs(rng.normal(0, 0.005, n)) * closes
+        symbols[f"SYM{i:05d}"] = {
+            'prices': closes.tolist(),
+            'volumes': rng.lognormal(10, 1, n).tolist(),
+            'highs': (closes + spread).tolist(),
+            'lows': (closes - spread).tolist()
+        }
+    return symbols
+
+
+def best_time(func, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    cpu_count = os.cpu_count() or 1
+    default_workers = sorted({1, 2, 4, 8, cpu_count} & set(range(1, cpu_count + 1)))
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--symbols', type=int, default=2000)
+    parser.add_argument('--length', type=int, default=2000)
+    parser.add_argument('--workers', type=int, nargs='+', default=default_workers)
+    parser.add_argument('--chunk-size', type=int, default=64)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    symbols = synthetic_universe(args.symbols, args.length)
+    print(f"{args.symbols} symbols x ~{args.length} candles, chunk size {args.chunk_size}, {cpu_count} CPUs")
+
+    serial = best_time(lambda: TechnicalIndicators.calculate_batch_indicators(symbols), args.repeat)
+    print(f"single process batch: {serial:.3f}s")
+    print()
+    print(f"{'workers':>8}{'time (s)':>12}{'speedup':>10}{'efficiency':>12}")
+    print("-" * 42)
+
+    # Speedup is measured against one worker (or the single process path if 1 is not in --workers)
+    baseline = serial
+    for workers in sorted(args.workers):
+        with ParallelIndicatorEngine(workers=workers, chunk_size=args.chunk_size) as engine:
+            # Start every process before timing
+            engine.calculate(dict(list(symbols.items())[:workers * args.chunk_size]))
+            elapsed = best_time(lambda: engine.calculate(symbols), args.repeat)
+
+        if workers == 1:
+            baseline = elapsed
+        speedup = baseline / elapsed
+        print(f"{workers:>8}{elapsed:>12.3f}{speedup:>9.2f}x{speedup / workers * 100:>11.0f}%")
+
+
+if __name__ == "__main__":
+    main()
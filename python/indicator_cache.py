@@ -0,0 +1,214 @@
+"""
+Content-addressed result cache for TechnicalIndicators.calculate_multiple_indicators.
+
+Entries are keyed by a hash of the price/volume/high/low buffers plus the
+requested indicators, kept in LRU order and expired after a TTL.
+
+When a request misses but its series extends a cached series by at most
+`max_tail` candles (the usual case for a live feed polled every few seconds),
+the cached entry's IndicatorSet state is advanced over the new candles only
+instead of recomputing the whole history. The first extension of an entry
+seeds that state from the cached series with the vectorized kernels; later
+extensions are O(new candles). Incremental results agree with a full
+recompute to floating-point precision, so a value lying exactly on a
+rounding boundary may differ in its last displayed digit.
+"""
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from indicator_state import IndicatorSet
+from technical_indicators import TechnicalIndicators, _has_values
+
+
+class _Entry:
+    __slots__ = ('result', 'expires_at', 'state', 'series')
+
+    def __init__(self, result: Dict[str, Any], expires_at: float,
+                 state: Optional[IndicatorSet], series: Optional[Tuple]):
+        self.result = result
+        self.expires_at = expires_at
+        self.state = state      # IndicatorSet after the cached series (moved on to extensions)
+        self.series = series    # (prices, volumes, highs, lows) to seed the state lazily
+
+
+class IndicatorCache:
+    """
+    LRU + TTL cache in front of calculate_multiple_indicators.
+
+    Args:
+        maxsize: Maximum number of cached results.
+        ttl: Seconds an entry stays valid.
+        max_tail: Longest extension (in candles) that is computed incrementally.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60.0, max_tail: int = 32):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_tail = max_tail
+        self._entries: 'OrderedDict[bytes, _Entry]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.tail_updates = 0
+
+    def calculate_multiple_indicators(self, prices: List[float], volumes: Optional[List[float]] = None,
+                                      highs: Optional[List[float]] = None, lows: Optional[List[float]] = None,
+                                      indicators: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Same arguments and result as TechnicalIndicators.calculate_multiple_indicators."""
+        try:
+            series, descriptor, rows = _normalize(prices, volumes, highs, lows, indicators)
+        except ValueError:
+            # Mismatched lengths etc.: let TechnicalIndicators report the error, uncached
+            return TechnicalIndicators.calculate_multiple_indicators(prices, volumes, highs, lows, indicators)
+
+        keys = self._prefix_keys(descriptor, rows)
+        key = keys[-1]
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._get(key, now)
+            if entry is not None:
+                self.hits += 1
+                return copy.deepcopy(entry.result)
+            self.misses += 1
+
+            # Longest cached prefix of this series that still has (or can seed) a state
+            base, base_length = None, 0
+            for length, prefix_key in zip(range(len(rows) - len(keys) + 1, len(rows)), keys[:-1]):
+                candidate = self._get(prefix_key, now)
+                if candidate is not None and (candidate.state is not None or candidate.series is not None):
+                    base, base_length = candidate, length
+
+            state = None
+            if base is not None:
+                state = base.state
+                base.state = None
+                if state is None:
+                    state = IndicatorSet.from_series(*base.series, indicators=indicators)
+                base.series = None
+
+        if state is not None:
+            # Slices of the caller's own lists so the result keeps the same Python types
+            state.extend(
+                prices[base_length:],
+                volumes[base_length:] if series[1] is not None else None,
+                _tail(highs, base_length),
+                _tail(lows, base_length)
+            )
+            result = state.result()
+            new_entry = _Entry(result, now + self.ttl, state, None)
+        else:
+            result = TechnicalIndicators.calculate_multiple_indicators(prices, volumes, highs, lows, indicators)
+            new_entry = _Entry(result, now + self.ttl, None, series)
+
+        with self._lock:
+            if state is not None:
+                self.tail_updates += 1
+            self._entries[key] = new_entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return copy.deepcopy(result)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "tail_updates": self.tail_updates
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _get(self, key: bytes, now: float) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _prefix_keys(self, descriptor: bytes, rows: np.ndarray) -> List[bytes]:
+        """
+        Keys of the series truncated to the last max_tail + 1 lengths (the full series last),
+        from a single pass over the buffer.
+        """
+        n = len(rows)
+        start = max(n - self.max_tail, 1)
+        hasher = hashlib.blake2b(descriptor, digest_size=16)
+        hasher.update(rows[:start - 1])
+
+        keys = []
+        for length in range(start, n + 1):
+            hasher.update(rows[length - 1])
+            keys.append(hasher.copy().digest())
+        return keys or [hasher.digest()]
+
+
+def _normalize(prices, volumes, highs, lows, indicators):
+    """
+    Returns (series, descriptor, rows):
+      series      - (prices, volumes, highs, lows) as float64 arrays (highs/lows may stay scalar/None)
+      descriptor  - bytes describing the layout and parameters, hashed before the rows
+      rows        - C-contiguous (n, columns) array of all per-candle values
+    """
+    closes = np.asarray(prices, dtype=np.float64)
+    if closes.ndim != 1:
+        raise ValueError("prices must be one-dimensional")
+
+    columns = [closes]
+    layout = {"indicators": [name.lower() for name in indicators] if indicators is not None else None}
+
+    volume_values = None
+    if _has_values(volumes):
+        volume_values = np.asarray(volumes, dtype=np.float64)
+        columns.append(volume_values)
+    layout["volumes"] = volume_values is not None
+
+    high_low = []
+    for name, values in (('highs', highs), ('lows', lows)):
+        if values is None or np.size(values) == 0 or (np.isscalar(values) and not values):
+            layout[name] = None
+            high_low.append(None)
+        elif np.isscalar(values):
+            layout[name] = float(values)
+            high_low.append(float(values))
+        else:
+            array = np.asarray(values, dtype=np.float64)
+            layout[name] = "column"
+            columns.append(array)
+            high_low.append(array)
+
+    if any(len(column) != len(closes) for column in columns):
+        raise ValueError("series lengths differ")
+
+    rows = np.ascontiguousarray(np.column_stack(columns)) if len(closes) else np.empty((0, len(columns)))
+    descriptor = json.dumps(layout, sort_keys=True).encode('utf-8')
+    return (closes, volume_values, high_low[0], high_low[1]), descriptor, rows
+
+
+def _tail(values, start: int):
+    """Per-candle values after `start` (None, empty and scalars apply to every candle)."""
+    if values is None or np.isscalar(values) or np.size(values) == 0:
+        return values
+    return values[start:]
@@ -0,0 +1,398 @@
+"""
+NumPy kernels for technical indicators.
+
+Every kernel works along the last axis, so the same code handles a single
+series of shape (T,) and a batch of series of shape (n_symbols, T). Missing
+values are NaN; batches of ragged series are right-aligned and left-padded
+with NaN (see pad_series) so the latest candle of every symbol sits in the
+last column.
+
+The kernels reproduce the pandas semantics used by TechnicalIndicators:
+ewm(...).mean() with adjust=True/False and min_periods, rolling(...).mean(),
+rolling(...).std() (ddof=1), rolling(...).min() / max(). For adjust=False
+only leading NaN padding is supported, not gaps inside a series.
+"""
+
+import numpy as np
+from typing import Optional, Sequence, Union
+
+ArrayLike = Union[np.ndarray, Sequence[float]]
+
+# Largest growth factor allowed inside one block of the EMA scan (about 1e100)
+_MAX_LOG_GROWTH = 230.0
+
+
+def pad_series(series: Sequence[Optional[ArrayLike]], length: Optional[int] = None) -> np.ndarray:
+    """
+    Stack ragged series into a right-aligned, NaN left-padded 2-D array.
+
+    Args:
+        series: Sequence of 1-D price/volume lists (None rows become all NaN)
+        length: Output width, defaults to the longest series
+
+    Returns:
+        Array of shape (len(series), length)
+    """
+    rows = [np.asarray(s, dtype=np.float64).ravel() if s is not None else np.empty(0)
+            for s in series]
+    if length is None:
+        length = max((len(r) for r in rows), default=0)
+
+    out = np.full((len(rows), length), np.nan)
+    for i, row in enumerate(rows):
+        row = row[-length:] if length else row[:0]
+        if len(row):
+            out[i, length - len(row):] = row
+    return out
+
+
+def linear_recurrence(x: np.ndarray, decay: Union[float, np.ndarray],
+                      initial: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Solve y[t] = decay * y[t-1] + x[t] along the last axis.
+
+    The scan runs block by block in closed form (y = decay^j * (decay * carry +
+    cumsum(x * decay^-j))) so a 50k-point series costs a handful of vectorized
+    NumPy calls instead of a Python loop per element. Block length is chosen so
+    that decay^-j never overflows.
+
+    Args:
+        x: Input array (..., T)
+        decay: Scalar or array broadcastable to (..., 1), values in [0, 1]
+        initial: Optional y[-1] (...,), defaults to 0
+
+    Returns:
+        Array with the same shape as x
+    """
+    x = np.asarray(x, dtype=np.float64)
+    decay = np.asarray(decay, dtype=np.float64)
+    if decay.ndim:
+        decay = decay.reshape(decay.shape + (1,) * (x.ndim - decay.ndim))[..., :1]
+    else:
+        decay = decay.reshape((1,) * x.ndim)
+
+    length = x.shape[-1]
+    out = np.empty(np.broadcast_shapes(x.shape, decay.shape[:-1] + (length,)))
+    carry = np.zeros(out.shape[:-1] + (1,))
+    if initial is not None:
+        carry = carry + np.asarray(initial, dtype=np.float64)[..., None]
+
+    if length == 0:
+        return out
+
+    if np.all(decay == 0):
+        out[...] = x
+        return out
+
+    # Pure zeros in decay would make log() blow up; they are handled by the mask below
+    zero_decay = decay == 0
+    has_zero = bool(np.any(zero_decay))
+    safe_decay = np.where(zero_decay, 1.0, decay)
+    log_decay = np.log(safe_decay)
+    max_log = float(np.max(-log_decay))
+    block = length if max_log == 0 else max(1, min(length, int(_MAX_LOG_GROWTH / max_log)))
+
+    steps = np.arange(block, dtype=np.float64)
+    power = np.exp(log_decay * steps)       # decay^j
+    inverse = np.exp(-log_decay * steps)    # decay^-j
+    for start in range(0, length, block):
+        seg = x[..., start:start + block]
+        n = seg.shape[-1]
+        block_out = power[..., :n] * (safe_decay * carry + np.cumsum(seg * inverse[..., :n], axis=-1))
+        if has_zero:
+            # decay == 0 rows: y[t] = x[t]
+            block_out = np.where(zero_decay, seg, block_out)
+        out[..., start:start + n] = block_out
+        carry = block_out[..., -1:]
+
+    return out
+
+
+def ewm_mean(x: ArrayLike, alpha: Union[float, np.ndarray], adjust: bool = True,
+             min_periods: int = 0) -> np.ndarray:
+    """
+    Exponentially weighted mean, equivalent to pandas Series.ewm(alpha=...).mean().
+
+    Both adjust modes are written as a weighted average num / den of two linear
+    recurrences, which also handles NaN padding: missing values add no weight
+    but the existing weights keep decaying (pandas ignore_na=False).
+
+    Args:
+        x: Input array (..., T)
+        alpha: Smoothing factor, scalar or one per row
+        adjust: pandas adjust flag
+        min_periods: Minimum number of observations before a value is emitted
+
+    Returns:
+        EMA array with the same shape as x
+    """
+    x = np.asarray(x, dtype=np.float64)
+    alpha = np.asarray(alpha, dtype=np.float64)
+    if alpha.ndim:
+        alpha = alpha.reshape(alpha.shape + (1,) * (x.ndim - alpha.ndim))[..., :1]
+
+    if x.shape[-1] == 0:
+        return x.copy()
+
+    decay = 1.0 - alpha
+    min_periods = max(min_periods, 1)
+    valid = ~np.isnan(x)
+    # The mean is shift-invariant: centering on the first value keeps a constant
+    # series exactly constant (the closed-form scan is off by ~1 ulp otherwise)
+    ref = _row_reference(x, valid)
+    x = x - ref
+
+    if valid.all():
+        # Fast path without gaps: the denominator has a closed form
+        if adjust:
+            num = linear_recurrence(x, decay)
+            den = _geometric_sums(decay, x.shape[-1])
+        else:
+            # y0 = x0, y[t] = (1 - alpha) * y[t-1] + alpha * x[t]
+            num = linear_recurrence(alpha * x, decay, initial=x[..., 0])
+            den = 1.0
+        out = num / den + ref
+        out[..., :min_periods - 1] = np.nan
+        return out
+
+    values = np.where(valid, x, 0.0)
+    if adjust:
+        weights = valid.astype(np.float64)
+    else:
+        first = valid & (np.cumsum(valid, axis=-1) == 1)
+        weights = np.where(first, 1.0, np.where(valid, alpha, 0.0))
+
+    num = linear_recurrence(weights * values, decay)
+    den = linear_recurrence(weights, decay)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out = num / den + ref
+
+    count = np.cumsum(valid, axis=-1)
+    out[np.broadcast_to(count < min_periods, out.shape)] = np.nan
+    return out
+
+
+def _geometric_sums(decay: np.ndarray, length: int) -> np.ndarray:
+    """
+    sum(decay^j, j = 0..t) for t < length, i.e. the ewm denominator without gaps.
+
+    decay^t drops below float64 resolution after a few hundred steps, so only that
+    head is evaluated; the tail is the limit 1 / (1 - decay).
+    """
+    decay = np.asarray(decay, dtype=np.float64)
+    limit = 1.0 / (1.0 - decay)
+    log_decay = np.log(np.where(decay > 0, decay, np.finfo(np.float64).tiny))
+    head = min(length, int(np.ceil(40.0 / np.min(-log_decay))) + 1)
+
+    shape = decay.shape[:-1] + (length,) if decay.ndim else (length,)
+    out = np.empty(shape)
+    out[...] = limit
+    out[..., :head] = (1.0 - np.exp(log_decay * np.arange(1, head + 1))) * limit
+    return out
+
+
+def ema(x: ArrayLike, span: Union[float, np.ndarray], adjust: bool = True,
+        min_periods: int = 0) -> np.ndarray:
+    """Span-based EMA, alpha = 2 / (span + 1)."""
+    return ewm_mean(x, 2.0 / (np.asarray(span, dtype=np.float64) + 1.0),
+                    adjust=adjust, min_periods=min_periods)
+
+
+def wilder(x: ArrayLike, period: Union[int, np.ndarray], min_periods: Optional[int] = None) -> np.ndarray:
+    """Wilder smoothing as used by RSI, alpha = 1 / period."""
+    period_arr = np.asarray(period, dtype=np.float64)
+    if min_periods is None:
+        min_periods = int(np.max(period_arr))
+    return ewm_mean(x, 1.0 / period_arr, adjust=True, min_periods=min_periods)
+
+
+def diff(x: ArrayLike) -> np.ndarray:
+    """First difference along the last axis, NaN in the first column."""
+    x = np.asarray(x, dtype=np.float64)
+    out = np.full(x.shape, np.nan)
+    out[..., 1:] = x[..., 1:] - x[..., :-1]
+    return out
+
+
+def _row_reference(x: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """First valid value of each row, used to center data before cumulative sums."""
+    first_idx = np.argmax(valid, axis=-1)[..., None]
+    ref = np.take_along_axis(np.where(valid, x, 0.0), first_idx, axis=-1)
+    return ref
+
+
+def rolling_mean(x: ArrayLike, window: int) -> np.ndarray:
+    """
+    Rolling mean over full windows, equivalent to pandas rolling(window).mean().
+
+    One cumulative sum of the row-centered values gives every window sum;
+    windows holding a missing value are NaN.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    length = x.shape[-1]
+    out = np.full(x.shape, np.nan)
+    if length < window:
+        return out
+
+    valid = ~np.isnan(x)
+    has_gaps = not valid.all()
+    ref = _row_reference(x, valid)
+    centered = np.where(valid, x - ref, 0.0) if has_gaps else x - ref
+
+    zero = np.zeros(x.shape[:-1] + (1,))
+    csum = np.concatenate([zero, np.cumsum(centered, axis=-1)], axis=-1)
+    out[..., window - 1:] = (csum[..., window:] - csum[..., :-window]) / window + ref
+
+    if has_gaps:
+        ccount = np.concatenate([zero, np.cumsum(valid, axis=-1, dtype=np.float64)], axis=-1)
+        counts = ccount[..., window:] - ccount[..., :-window]
+        out[..., window - 1:][counts < window] = np.nan
+    return out
+
+
+def _left_pad(values: np.ndarray, length: int) -> np.ndarray:
+    """Prepend NaN columns so a windowed result lines up with its input."""
+    out = np.full(values.shape[:-1] + (length,), np.nan)
+    if values.shape[-1]:
+        out[..., length - values.shape[-1]:] = values
+    return out
+
+
+def _block_scan(x: np.ndarray, window: int, pad_value: float, op) -> tuple:
+    """
+    Prefix and suffix scans of a ufunc inside consecutive blocks of `window` columns.
+
+    Any window [i, i + window - 1] covers the tail of the block holding i and the
+    head of the next block, so window results combine suffix[i] and
+    prefix[i + window - 1] (van Herk / Gil-Werman).
+    """
+    length = x.shape[-1]
+    n_blocks = -(-length // window)
+    padded = np.full(x.shape[:-1] + (n_blocks * window,), pad_value)
+    padded[..., :length] = x
+    blocks = padded.reshape(x.shape[:-1] + (n_blocks, window))
+    prefix = op.accumulate(blocks, axis=-1).reshape(padded.shape)
+    suffix = op.accumulate(blocks[..., ::-1], axis=-1)[..., ::-1].reshape(padded.shape)
+    return prefix, suffix
+
+
+def _rolling_extreme(x: ArrayLike, window: int, op, pad_value: float) -> np.ndarray:
+    """Sliding-window min/max in O(T) with block prefix/suffix scans."""
+    x = np.asarray(x, dtype=np.float64)
+    length = x.shape[-1]
+    if length < window:
+        return np.full(x.shape, np.nan)
+    prefix, suffix = _block_scan(x, window, pad_value, op)
+    values = op(suffix[..., :length - window + 1], prefix[..., window - 1:length])
+    return _left_pad(values, length)
+
+
+def rolling_min(x: ArrayLike, window: int) -> np.ndarray:
+    """Rolling minimum, NaN when the window holds a missing value."""
+    return _rolling_extreme(x, window, np.minimum, np.inf)
+
+
+def rolling_max(x: ArrayLike, window: int) -> np.ndarray:
+    """Rolling maximum, NaN when the window holds a missing value."""
+    return _rolling_extreme(x, window, np.maximum, -np.inf)
+
+
+def rolling_std(x: ArrayLike, window: int, ddof: int = 1) -> np.ndarray:
+    """
+    Rolling standard deviation, equivalent to pandas rolling(window).std().
+
+    Window sums of x and x^2 come from block prefix/suffix sums (see _block_scan)
+    rather than one cumulative sum over the whole series: each block is centered
+    on its own mean, so the sums stay small and the variance keeps its precision
+    on long series that drift far from their start (BTC from 0.05 to 1e5).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    length = x.shape[-1]
+    if length < window:
+        return np.full(x.shape, np.nan)
+
+    n_blocks = -(-length // window)
+    padded = np.zeros(x.shape[:-1] + (n_blocks * window,))
+    padded[..., :length] = x
+    blocks = padded.reshape(x.shape[:-1] + (n_blocks, window))
+
+    # Block centers (mean of valid values; padding never reaches a complete window)
+    valid = ~np.isnan(blocks)
+    counts = valid.sum(axis=-1, keepdims=True)
+    center = np.where(valid, blocks, 0.0).sum(axis=-1, keepdims=True) / np.maximum(counts, 1)
+    deviation = blocks - center
+
+    deviation = deviation.reshape(padded.shape)
+    prefix1, suffix1 = _block_scan(deviation, window, 0.0, np.add)
+    prefix2, suffix2 = _block_scan(deviation * deviation, window, 0.0, np.add)
+    center = np.broadcast_to(center, blocks.shape).reshape(padded.shape)
+
+    n_windows = length - window + 1
+    starts = slice(0, n_windows)
+    ends = slice(window - 1, length)
+    aligned = (np.arange(n_windows) % window) == 0
+    head_count = (np.arange(window - 1, length) % window) + 1
+
+    # Shift the head part (next block) onto the center of the block holding the start
+    shift = center[..., ends] - center[..., starts]
+    head1 = prefix1[..., ends] + head_count * shift
+    head2 = prefix2[..., ends] + 2 * shift * prefix1[..., ends] + head_count * shift * shift
+
+    sum1 = suffix1[..., starts] + np.where(aligned, 0.0, head1)
+    sum2 = suffix2[..., starts] + np.where(aligned, 0.0, head2)
+
+    variance = np.maximum(sum2 - sum1 * sum1 / window, 0.0) / (window - ddof)
+    return _left_pad(np.sqrt(variance), length)
+
+
+# =============================================================================
+# Indicator series
+# =============================================================================
+
+def rsi_series(prices: ArrayLike, period: int = 14) -> np.ndarray:
+    """RSI with Wilder smoothing (matches TechnicalIndicators.calculate_rsi)."""
+    prices = np.asarray(prices, dtype=np.float64)
+    delta = diff(prices)
+    # pandas where(delta > 0, 0) turns the leading NaN diff into a 0 observation
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    missing = np.isnan(prices)
+    gain[missing] = np.nan
+    loss[missing] = np.nan
+
+    avg_gain = wilder(gain, period)
+    avg_loss = wilder(loss, period)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+
+def macd_series(prices: ArrayLike, fast_period: int = 12, slow_period: int = 26,
+                signal_period: int = 9):
+    """MACD line, signal line and histogram."""
+    prices = np.asarray(prices, dtype=np.float64)
+    macd_line = ema(prices, fast_period) - ema(prices, slow_period)
+    signal_line = ema(macd_line, signal_period)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def bollinger_series(prices: ArrayLike, period: int = 20, std_dev: float = 2):
+    """Upper band, middle band (SMA) and lower band."""
+    prices = np.asarray(prices, dtype=np.float64)
+    sma = rolling_mean(prices, period)
+    std = rolling_std(prices, period)
+    return sma + std * std_dev, sma, sma - std * std_dev
+
+
+def stochastic_series(closes: ArrayLike, highs: ArrayLike, lows: ArrayLike,
+                      k_period: int = 14, d_period: int = 3):
+    """Stochastic %K and %D."""
+    closes = np.asarray(closes, dtype=np.float64)
+    lowest_low = rolling_min(lows, k_period)
+    highest_high = rolling_max(highs, k_period)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        k_percent = (closes - lowest_low) / (highest_high - lowest_low) * 100
+    d_percent = rolling_mean(k_percent, d_period)
+    return k_percent, d_percent
+
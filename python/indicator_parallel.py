@@ -0,0 +1,157 @@
+"""
+Process-pool execution of calculate_batch_indicators for large symbol universes.
+
+The parent packs every series into one shared-memory block of shape
+(4, n_symbols, T) - prices, volumes, highs, lows, right-aligned and NaN
+left-padded like indicator_kernels.pad_series - and workers attach to it by
+name, so only symbol names, lengths and row ranges are pickled. Each worker
+evaluates its chunk of rows with the vectorized batch path; results are the
+same dicts as TechnicalIndicators.calculate_batch_indicators.
+
+Example:
+    with ParallelIndicatorEngine(workers=8, chunk_size=64) as engine:
+        results = engine.calculate(symbols)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+import indicator_kernels as kernels
+from technical_indicators import TechnicalIndicators, _has_values
+
+_COLUMNS = ('prices', 'volumes', 'highs', 'lows')
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Open the parent's block; the parent owns it and unlinks it after the call."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: attaching registers the name again with the resource tracker
+        # shared with the parent, which is harmless (it keeps a set of names)
+        return shared_memory.SharedMemory(name=name)
+
+
+def _evaluate_chunk(block_name: str, shape: tuple, names: List[str], lengths: List[List[int]],
+                    extras: Dict[str, Dict[str, Any]], indicators: Optional[List[str]],
+                    start: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Worker: calculate_batch_indicators for rows start .. start + len(names) of the block.
+
+    lengths[i] holds the (prices, volumes, highs, lows) length of each symbol, 0 for a
+    missing column; extras carries the highs/lows that are not per-candle arrays.
+    """
+    block = _attach(block_name)
+    try:
+        data = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+        symbols = {}
+        for offset, name in enumerate(names):
+            row = start + offset
+            symbol = {}
+            for column, (key, length) in enumerate(zip(_COLUMNS, lengths[offset])):
+                symbol[key] = data[column, row, shape[-1] - length:].copy() if length else None
+            symbol.update(extras.get(name, {}))
+            symbols[name] = symbol
+        return TechnicalIndicators.calculate_batch_indicators(symbols, indicators)
+    finally:
+        block.close()
+
+
+class ParallelIndicatorEngine:
+    """
+    Keeps a process pool warm and shards symbols across it.
+
+    Args:
+        workers: Number of processes (defaults to os.cpu_count()).
+        chunk_size: Symbols per task; larger chunks vectorize better, smaller ones balance load.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = 64):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+
+    def __enter__(self) -> 'ParallelIndicatorEngine':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._pool.shutdown()
+
+    def calculate(self, symbols: Dict[str, Dict[str, Any]],
+                  indicators: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Same input and output as TechnicalIndicators.calculate_batch_indicators."""
+        names = list(symbols.keys())
+        if not names:
+            return {}
+
+        columns, lengths, extras = _pack_columns(symbols, names)
+        width = max((max(row) for row in lengths), default=0)
+        shape = (len(_COLUMNS), len(names), width)
+
+        block = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * 8))
+        data = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+        try:
+            for column, series in enumerate(columns):
+                data[column] = kernels.pad_series(series, width)
+
+            futures = [
+                self._pool.submit(
+                    _evaluate_chunk, block.name, shape,
+                    names[start:start + self.chunk_size],
+                    lengths[start:start + self.chunk_size],
+                    {name: extras[name] for name in names[start:start + self.chunk_size] if name in extras},
+                    indicators, start
+                )
+                for start in range(0, len(names), self.chunk_size)
+            ]
+
+            results = {}
+            for future in futures:
+                results.update(future.result())
+            return {name: results[name] for name in names}
+        finally:
+            del data
+            block.close()
+            block.unlink()
+
+
+def _pack_columns(symbols: Dict[str, Dict[str, Any]], names: List[str]):
+    """
+    Split the input into per-candle arrays (go through shared memory) and everything
+    else - scalar highs/lows or arrays of a different length (pickled as extras, so
+    calculate_batch_indicators reports them exactly as in the serial path).
+    """
+    columns = [[] for _ in _COLUMNS]
+    lengths, extras = [], {}
+
+    for name in names:
+        symbol = symbols[name]
+        prices = np.asarray(symbol['prices'], dtype=np.float64)
+        row_lengths = []
+        for column, key in enumerate(_COLUMNS):
+            values = prices if key == 'prices' else symbol.get(key)
+            if key != 'prices' and not _has_values(values):
+                values = None
+            elif key != 'prices' and (np.ndim(values) != 1 or (key != 'volumes' and len(values) != len(prices))):
+                extras.setdefault(name, {})[key] = values
+                values = None
+            array = None if values is None else np.asarray(values, dtype=np.float64)
+            columns[column].append(array)
+            row_lengths.append(0 if array is None else len(array))
+        lengths.append(row_lengths)
+
+    return columns, lengths, extras
+
+
+def calculate_parallel(symbols: Dict[str, Dict[str, Any]], indicators: Optional[List[str]] = None,
+                       workers: Optional[int] = None, chunk_size: int = 64) -> Dict[str, Dict[str, Any]]:
+    """One-off parallel evaluation (starts and stops a pool; keep an engine for repeated calls)."""
+    with ParallelIndicatorEngine(workers, chunk_size) as engine:
+        return engine.calculate(symbols, indicators)
@@ -0,0 +1,685 @@
+"""
+Incremental (streaming) indicator state for live ticks.
+
+Each state object keeps only what the next value depends on - Wilder/EMA
+numerators and denominators, rolling sums over a fixed window, monotonic
+deques for rolling high/low - so update(price) is O(1) instead of a full
+recompute over the price history.
+
+The definitions follow TechnicalIndicators exactly (pandas-style ewm with
+adjust=True, rolling windows that need a full window, NaN on 0/0), and
+result() returns the same dict as the matching calculate_* method, built
+from a short buffer of recent values.
+
+States serialize to strict-JSON dicts (NaN / inf tagged) with to_dict() and come back
+with StreamingState.from_dict(), so a worker restart can resume without
+replaying the history. IndicatorSet.from_series() builds the state for an
+existing series with the vectorized kernels instead of one update per candle.
+"""
+
+import math
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+import indicator_kernels as kernels
+from technical_indicators import (
+    DEFAULT_INDICATORS,
+    INSUFFICIENT_DATA_ERRORS,
+    TechnicalIndicators,
+)
+
+# Recent values kept per output: 10 for "history" plus the previous value for
+# slope / crossover checks
+HISTORY_SIZE = 11
+
+
+def _divide(numerator: float, denominator: float) -> float:
+    """Float division with NumPy semantics (x/0 -> +-inf, 0/0 -> NaN) instead of raising."""
+    if denominator == 0:
+        if numerator == 0 or math.isnan(numerator):
+            return math.nan
+        return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+    return numerator / denominator
+
+
+def _encode(value: Any) -> Any:
+    """Convert state attributes into JSON-compatible values."""
+    if isinstance(value, StreamingState):
+        return value.to_dict()
+    if isinstance(value, deque):
+        return {'__deque__': [_encode(v) for v in value], 'maxlen': value.maxlen}
+    if isinstance(value, dict):
+        return {key: _encode(v) for key, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        # Strict JSON has no NaN / inf; a tag instead of null, because None is a real state value
+        return {'__float__': repr(value)}
+    return value
+
+
+def _decode(value: Any) -> Any:
+    """Inverse of _encode."""
+    if isinstance(value, dict):
+        if '__float__' in value:
+            return float(value['__float__'])
+        if '__deque__' in value:
+            return deque((_decode(v) for v in value['__deque__']), maxlen=value['maxlen'])
+        if 'type' in value and 'state' in value:
+            return StreamingState.from_dict(value)
+        return {key: _decode(v) for key, v in value.items()}
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
+
+
+class StreamingState:
+    """
+    Base class: generic to_dict / from_dict over the instance attributes.
+    """
+
+    _registry: Dict[str, type] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        StreamingState._registry[cls.__name__] = cls
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'type': type(self).__name__, 'state': _encode(self.__dict__)}
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> 'StreamingState':
+        cls = StreamingState._registry.get(data.get('type'))
+        if cls is None:
+            raise ValueError(f"Unknown indicator state type: {data.get('type')}")
+        state = cls.__new__(cls)
+        state.__dict__.update(_decode(data['state']))
+        return state
+
+
+# =============================================================================
+# Building blocks
+# =============================================================================
+
+class EWMState(StreamingState):
+    """
+    Exponentially weighted mean with pandas adjust=True weights:
+    value = sum((1-alpha)^i * x[t-i]) / sum((1-alpha)^i), kept as num / den.
+    """
+
+    def __init__(self, alpha: float, min_periods: int = 0):
+        self.decay = 1.0 - alpha
+        self.min_periods = max(min_periods, 1)
+        self.num = 0.0
+        self.den = 0.0
+        self.count = 0
+
+    def update(self, x: float) -> float:
+        self.num *= self.decay
+        self.den *= self.decay
+        if not math.isnan(x):
+            self.num += x
+            self.den += 1.0
+            self.count += 1
+        return self.value
+
+    def seed(self, value: float, count: int) -> None:
+        """Set the state after `count` gap-free observations whose weighted mean is `value`."""
+        self.count = count
+        self.den = (1.0 - self.decay ** count) / (1.0 - self.decay)
+        self.num = float(value) * self.den
+
+    @property
+    def value(self) -> float:
+        if self.count < self.min_periods:
+            return math.nan
+        return _divide(self.num, self.den)
+
+
+class RollingWindow(StreamingState):
+    """
+    Fixed-size window with running sums of (x - anchor) and (x - anchor)^2.
+
+    The anchor moves to the window mean and the sums are rebuilt once every
+    `size` updates, which keeps the sums small (and the variance precise) at an
+    amortized O(1) cost.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = deque(maxlen=size)
+        self.nan_count = 0
+        self.anchor = 0.0
+        self.sum1 = 0.0
+        self.sum2 = 0.0
+        self.since_anchor = 0
+
+    def push(self, x: float) -> None:
+        if len(self.values) == self.size:
+            old = self.values[0]
+            if math.isnan(old):
+                self.nan_count -= 1
+            else:
+                self.sum1 -= old - self.anchor
+                self.sum2 -= (old - self.anchor) ** 2
+
+        self.values.append(x)
+        if math.isnan(x):
+            self.nan_count += 1
+        else:
+            self.sum1 += x - self.anchor
+            self.sum2 += (x - self.anchor) ** 2
+
+        self.since_anchor += 1
+        if self.since_anchor >= self.size:
+            self._reanchor()
+
+    def seed(self, values: Sequence[float]) -> None:
+        """Fill the window with the last `size` values of a series."""
+        self.values = deque((float(v) for v in values[-self.size:]), maxlen=self.size)
+        self.nan_count = sum(math.isnan(v) for v in self.values)
+        self._reanchor()
+
+    def _reanchor(self) -> None:
+        valid = [v for v in self.values if not math.isnan(v)]
+        self.anchor = sum(valid) / len(valid) if valid else 0.0
+        self.sum1 = sum(v - self.anchor for v in valid)
+        self.sum2 = sum((v - self.anchor) ** 2 for v in valid)
+        self.since_anchor = 0
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.size and self.nan_count == 0
+
+    def mean(self) -> float:
+        if not self.full:
+            return math.nan
+        return self.anchor + self.sum1 / self.size
+
+    def std(self, ddof: int = 1) -> float:
+        if not self.full or self.size <= ddof:
+            return math.nan
+        variance = (self.sum2 - self.sum1 * self.sum1 / self.size) / (self.size - ddof)
+        return math.sqrt(max(variance, 0.0))
+
+
+class MonotonicExtreme(StreamingState):
+    """
+    Rolling max (or min) over the last `size` values with a monotonic deque.
+    A missing value makes the result NaN until it leaves the window.
+    """
+
+    def __init__(self, size: int, maximum: bool = True):
+        self.size = size
+        self.maximum = maximum
+        self.candidates = deque()  # (index, value), values monotonic from the front
+        self.index = -1
+        self.last_nan = -size - 1
+
+    def push(self, x: float) -> float:
+        self.index += 1
+        if math.isnan(x):
+            self.last_nan = self.index
+        else:
+            while self.candidates and (
+                self.candidates[-1][1] <= x if self.maximum else self.candidates[-1][1] >= x
+            ):
+                self.candidates.pop()
+            self.candidates.append((self.index, x))
+
+        while self.candidates and self.candidates[0][0] <= self.index - self.size:
+            self.candidates.popleft()
+        return self.value
+
+    def seed(self, values: Sequence[float], count: int) -> None:
+        """Replay only the last `size` values of a series of length `count`."""
+        tail = values[-self.size:]
+        self.candidates = deque()
+        self.index = count - len(tail) - 1
+        self.last_nan = -self.size - 1
+        for x in tail:
+            self.push(float(x))
+
+    @property
+    def value(self) -> float:
+        if self.index + 1 < self.size or self.last_nan > self.index - self.size or not self.candidates:
+            return math.nan
+        return self.candidates[0][1]
+
+
+# =============================================================================
+# Indicator states
+# =============================================================================
+
+class RSIState(StreamingState):
+    """RSI with Wilder smoothing, as TechnicalIndicators.calculate_rsi."""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.avg_gain = EWMState(1 / period, min_periods=period)
+        self.avg_loss = EWMState(1 / period, min_periods=period)
+        self.last_price = None
+        self.count = 0
+        self.history = deque(maxlen=HISTORY_SIZE)
+
+    def update(self, price: float) -> float:
+        # The first diff is NaN, which the pandas version turns into a 0 gain / 0 loss
+        delta = price - self.last_price if self.last_price is not None else 0.0
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        self.avg_gain.update(gain)
+        self.avg_loss.update(loss)
+        self.last_price = price
+        self.count += 1
+
+        rs = _divide(self.avg_gain.value, self.avg_loss.value)
+        rsi = 100 - _divide(100, 1 + rs)
+        self.history.append(rsi)
+        return rsi
+
+    @classmethod
+    def from_series(cls, prices: np.ndarray, period: int = 14) -> 'RSIState':
+        state = cls(period)
+        n = len(prices)
+        if n:
+            delta = kernels.diff(prices)
+            avg_gain = kernels.wilder(np.where(delta > 0, delta, 0.0), period, min_periods=0)
+            avg_loss = kernels.wilder(np.where(delta < 0, -delta, 0.0), period, min_periods=0)
+            state.avg_gain.seed(avg_gain[-1], n)
+            state.avg_loss.seed(avg_loss[-1], n)
+            for i in range(max(n - HISTORY_SIZE, 0), n):
+                rs = _divide(float(avg_gain[i]), float(avg_loss[i]))
+                state.history.append(100 - _divide(100, 1 + rs) if i + 1 >= period else math.nan)
+            state.last_price = float(prices[-1])
+            state.count = n
+        return state
+
+    def result(self) -> Dict[str, Any]:
+        if self.count < self.period + 1:
+            return {"error": INSUFFICIENT_DATA_ERRORS['rsi']}
+        return TechnicalIndicators._rsi_result(np.array(self.history), self.period)
+
+
+class EMAState(StreamingState):
+    """Span-based EMA, as TechnicalIndicators.calculate_ema."""
+
+    def __init__(self, period: int = 21):
+        self.period = period
+        self.ema = EWMState(2 / (period + 1))
+        self.last_price = None
+        self.count = 0
+        self.history = deque(maxlen=HISTORY_SIZE)
+
+    def update(self, price: float) -> float:
+        value = self.ema.update(price)
+        self.last_price = price
+        self.count += 1
+        self.history.append(value)
+        return value
+
+    @classmethod
+    def from_series(cls, prices: np.ndarray, period: int = 21) -> 'EMAState':
+        state = cls(period)
+        if len(prices):
+            ema = kernels.ema(prices, period)
+            state.ema.seed(ema[-1], len(prices))
+            state.history.extend(ema[-HISTORY_SIZE:].tolist())
+            state.last_price = float(prices[-1])
+            state.count = len(prices)
+        return state
+
+    def result(self) -> Dict[str, Any]:
+        if self.count < self.period:
+            return {"error": INSUFFICIENT_DATA_ERRORS['ema']}
+        return TechnicalIndicators._ema_result(self.last_price, np.array(self.history), self.period)
+
+
+class SMAState(StreamingState):
+    """Simple moving average, as TechnicalIndicators.calculate_sma."""
+
+    def __init__(self, period: int = 20):
+        self.period = period
+        self.window = RollingWindow(period)
+        self.last_price = None
+        self.count = 0
+        self.history = deque(maxlen=HISTORY_SIZE)
+
+    def update(self, price: float) -> float:
+        self.window.push(price)
+        value = self.window.mean()
+        self.last_price = price
+        self.count += 1
+        self.history.append(value)
+        return value
+
+    @classmethod
+    def from_series(cls, prices: np.ndarray, period: int = 20) -> 'SMAState':
+        state = cls(period)
+        if len(prices):
+            state.window.seed(prices)
+            state.history.extend(_rolling_mean_tail(prices, period))
+            state.last_price = float(prices[-1])
+            state.count = len(prices)
+        return state
+
+    def result(self) -> Dict[str, Any]:
+        if self.count < self.period:
+            return {"error": INSUFFICIENT_DATA_ERRORS['sma']}
+        return TechnicalIndicators._sma_result(self.last_price, np.array(self.history), self.period)
+
+
+class MACDState(StreamingState):
+    """MACD line, signal line and histogram, as TechnicalIndicators.calculate_macd."""
+
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        self.slow_period = slow_period
+        self.signal_period = signal_period
+        self.fast = EWMState(2 / (fast_period + 1))
+        self.slow = EWMState(2 / (slow_period + 1))
+        self.signal = EWMState(2 / (signal_period + 1))
+        self.count = 0
+        self.history = {
+            'macd': deque(maxlen=HISTORY_SIZE),
+            'signal': deque(maxlen=HISTORY_SIZE),
+            'histogram': deque(maxlen=HISTORY_SIZE)
+        }
+
+    def update(self, price: float) -> float:
+        macd_line = self.fast.update(price) - self.slow.update(price)
+        signal_line = self.signal.update(macd_line)
+        self.count += 1
+        self.history['macd'].append(macd_line)
+        self.history['signal'].append(signal_line)
+        self.history['histogram'].append(macd_line - signal_line)
+        return macd_line
+
+    @classmethod
+    def from_series(cls, prices: np.ndarray, fast_period: int = 12, slow_period: int = 26,
+                    signal_period: int = 9) -> 'MACDState':
+        state = cls(fast_period, slow_period, signal_period)
+        n = len(prices)
+        if n:
+            fast = kernels.ema(prices, fast_period)
+            slow = kernels.ema(prices, slow_period)
+            macd_line = fast - slow
+            signal_line = kernels.ema(macd_line, signal_period)
+            state.fast.seed(fast[-1], n)
+            state.slow.seed(slow[-1], n)
+            state.signal.seed(signal_line[-1], n)
+            state.history['macd'].extend(macd_line[-HISTORY_SIZE:].tolist())
+            state.history['signal'].extend(signal_line[-HISTORY_SIZE:].tolist())
+            state.history['histogram'].extend((macd_line - signal_line)[-HISTORY_SIZE:].tolist())
+            state.count = n
+        return state
+
+    def result(self) -> Dict[str, Any]:
+        if self.count < self.slow_period + self.signal_period:
+            return {"error": INSUFFICIENT_DATA_ERRORS['macd']}
+        return TechnicalIndicators._macd_result(
+            np.array(self.history['macd']),
+            np.array(self.history['signal']),
+            np.array(self.history['histogram'])
+        )
+
+
+class BollingerState(StreamingState):
+    """Bollinger Bands, as TechnicalIndicators.calculate_bollinger_bands."""
+
+    def __init__(self, period: int = 20, std_dev: float = 2):
+        self.period = period
+        self.std_dev = std_dev
+        self.window = RollingWindow(period)
+        self.last_price = None
+        self.count = 0
+
+    def update(self, price: float) -> float:
+        self.window.push(price)
+        self.last_price = price
+        self.count += 1
+        return self.window.mean()
+
+    @classmethod
+    def from_series(cls, prices: np.ndarray, period: int = 20, std_dev: float = 2) -> 'BollingerState':
+        state = cls(period, std_dev)
+        if len(prices):
+            state.window.seed(prices)
+            state.last_price = float(prices[-1])
+            state.count = len(prices)
+        return state
+
+    def bands(self):
+        middle = self.window.mean()
+        std = self.window.std()
+        return middle + std * self.std_dev, middle, middle - std * self.std_dev
+
+    def result(self) -> Dict[str, Any]:
+        if self.count < self.period:
+            return {"error": INSUFFICIENT_DATA_ERRORS['bollinger']}
+        upper, middle, lower = (np.float64(v) for v in self.bands())
+        return TechnicalIndicators._bollinger_result(self.last_price, upper, middle, lower)
+
+
+class StochasticState(StreamingState):
+    """Stochastic %K / %D, as TechnicalIndicators.calculate_stochastic."""
+
+    def __init__(self, k_period: int = 14, d_period: int = 3):
+        self.k_period = k_period
+        self.d_period = d_period
+        self.highest = MonotonicExtreme(k_period, maximum=True)
+        self.lowest = MonotonicExtreme(k_period, maximum=False)
+        self.k_window = RollingWindow(d_period)
+        self.count = 0
+        self.history = {
+            'k_percent': deque(maxlen=HISTORY_SIZE),
+            'd_percent': deque(maxlen=HISTORY_SIZE)
+        }
+
+    def update(self, close: float, high: Optional[float] = None, low: Optional[float] = None) -> float:
+        highest_high = self.highest.push(close if high is None else high)
+        lowest_low = self.lowest.push(close if low is None else low)
+        k_percent = _divide(close - lowest_low, highest_high - lowest_low) * 100
+        self.k_window.push(k_percent)
+        self.count += 1
+        self.history['k_percent'].append(k_percent)
+        self.history['d_percent'].append(self.k_window.mean())
+        return k_percent
+
+    @classmethod
+    def from_series(cls, closes: np.ndarray, highs: np.ndarray, lows: np.ndarray,
+                    k_period: int = 14, d_period: int = 3) -> 'StochasticState':
+        state = cls(k_period, d_period)
+        n = len(closes)
+        if n:
+            # Only the candles that the last HISTORY_SIZE values of %D depend on
+            tail = k_period + d_period + HISTORY_SIZE
+            k_percent, d_percent = kernels.stochastic_series(
+                closes[-tail:], highs[-tail:], lows[-tail:], k_period, d_period
+            )
+            state.highest.seed(highs, n)
+            state.lowest.seed(lows, n)
+            state.k_window.seed(k_percent)
+            state.history['k_percent'].extend(k_percent[-HISTORY_SIZE:].tolist())
+            state.history['d_percent'].extend(d_percent[-HISTORY_SIZE:].tolist())
+            state.count = n
+        return state
+
+    def result(self) -> Dict[str, Any]:
+        if self.count < self.k_period + self.d_period:
+            return {"error": INSUFFICIENT_DATA_ERRORS['stochastic']}
+        return TechnicalIndicators._stochastic_result(
+            np.array(self.history['k_percent']),
+            np.array(self.history['d_percent']),
+            self.k_period,
+            self.d_period
+        )
+
+
+class VolumeState(StreamingState):
+    """Volume SMA and rate of change, as TechnicalIndicators.calculate_volume."""
+
+    def __init__(self, period: int = 20):
+        self.period = period
+        self.window = RollingWindow(period)
+        self.prices = deque(maxlen=2)
+        self.volumes = deque(maxlen=2)
+        self.count = 0
+        self.history = deque(maxlen=HISTORY_SIZE)
+
+    def update(self, price: float, volume: float) -> float:
+        self.window.push(volume)
+        self.prices.append(price)
+        self.volumes.append(volume)
+        self.count += 1
+        value = self.window.mean()
+        self.history.append(value)
+        return value
+
+    @classmethod
+    def from_series(cls, prices: np.ndarray, volumes: np.ndarray, period: int = 20) -> 'VolumeState':
+        state = cls(period)
+        if len(volumes):
+            state.window.seed(volumes)
+            state.prices.extend(prices[-2:].tolist())
+            state.volumes.extend(volumes[-2:].tolist())
+            state.history.extend(_rolling_mean_tail(volumes, period))
+            state.count = len(volumes)
+        return state
+
+    def result(self) -> Dict[str, Any]:
+        if self.count < self.period:
+            return {"error": INSUFFICIENT_DATA_ERRORS['volume']}
+        return TechnicalIndicators._volume_result(
+            list(self.prices), list(self.volumes), np.array(self.history), self.period
+        )
+
+
+# Indicator name in TechnicalIndicators -> state class
+STATE_TYPES = {
+    'rsi': RSIState,
+    'macd': MACDState,
+    'bollinger': BollingerState,
+    'ema': EMAState,
+    'sma': SMAState,
+    'stochastic': StochasticState,
+    'volume': VolumeState
+}
+
+
+class IndicatorSet(StreamingState):
+    """
+    All indicators of calculate_multiple_indicators for one symbol, updated per candle.
+
+    result() returns the same dict (including 'summary') as
+    TechnicalIndicators.calculate_multiple_indicators over every candle seen so far.
+    """
+
+    def __init__(self, indicators: Optional[List[str]] = None):
+        self.indicators = [name.lower() for name in indicators] if indicators is not None else None
+        wanted = self.indicators if self.indicators is not None else DEFAULT_INDICATORS + ['volume']
+
+        self.states = {name: state_type() for name, state_type in STATE_TYPES.items() if name in wanted}
+        self.has_volume = False
+        self.count = 0
+
+    @classmethod
+    def from_series(cls, prices: Sequence[float], volumes: Optional[Sequence[float]] = None,
+                    highs: Optional[Union[Sequence[float], float]] = None,
+                    lows: Optional[Union[Sequence[float], float]] = None,
+                    indicators: Optional[List[str]] = None) -> 'IndicatorSet':
+        """
+        State after feeding a whole series, computed with the vectorized kernels.
+
+        Series with missing values fall back to feeding the candles one by one.
+        """
+        closes = np.asarray(prices, dtype=np.float64)
+        high_values = TechnicalIndicators._high_low(highs, closes)
+        low_values = TechnicalIndicators._high_low(lows, closes)
+        has_volume = volumes is not None and np.size(volumes) > 0
+        volume_values = np.asarray(volumes, dtype=np.float64) if has_volume else None
+
+        columns = [closes, high_values, low_values] + ([volume_values] if has_volume else [])
+        if (has_volume and len(volume_values) != len(closes)) or \
+                not all(np.isfinite(column).all() for column in columns):
+            state = cls(indicators)
+            state.extend(prices, volumes, highs, lows)
+            return state
+
+        state = cls.__new__(cls)
+        state.indicators = [name.lower() for name in indicators] if indicators is not None else None
+        wanted = state.indicators if state.indicators is not None else DEFAULT_INDICATORS + ['volume']
+        builders = {
+            'rsi': lambda: RSIState.from_series(closes),
+            'macd': lambda: MACDState.from_series(closes),
+            'bollinger': lambda: BollingerState.from_series(closes),
+            'ema': lambda: EMAState.from_series(closes),
+            'sma': lambda: SMAState.from_series(closes),
+            'stochastic': lambda: StochasticState.from_series(closes, high_values, low_values),
+            'volume': lambda: VolumeState.from_series(closes, volume_values) if has_volume else VolumeState()
+        }
+        state.states = {name: builders[name]() for name in STATE_TYPES if name in wanted}
+        state.has_volume = has_volume
+        state.count = len(closes)
+        return state
+
+    def update(self, price: float, volume: Optional[float] = None,
+               high: Optional[float] = None, low: Optional[float] = None) -> None:
+        for name, state in self.states.items():
+            if name == 'stochastic':
+                state.update(price, high, low)
+            elif name == 'volume':
+                if volume is not None:
+                    state.update(price, volume)
+            else:
+                state.update(price)
+
+        if volume is not None:
+            self.has_volume = True
+        self.count += 1
+
+    def extend(self, prices: Sequence[float], volumes: Optional[Sequence[float]] = None,
+               highs: Optional[Union[Sequence[float], float]] = None,
+               lows: Optional[Union[Sequence[float], float]] = None) -> None:
+        """Feed several candles; a single number for highs/lows applies to every candle."""
+        n = len(prices)
+        volumes = _per_candle(volumes, n)
+        highs = _per_candle(highs, n)
+        lows = _per_candle(lows, n)
+        for i, price in enumerate(prices):
+            self.update(price, volumes[i], highs[i], lows[i])
+
+    def result(self) -> Dict[str, Any]:
+        if self.indicators is None:
+            names = list(DEFAULT_INDICATORS) + (['volume'] if self.has_volume else [])
+        else:
+            names = self.indicators
+
+        results = {}
+        for name in names:
+            if name in self.states and (name != 'volume' or self.has_volume):
+                try:
+                    results[name] = self.states[name].result()
+                except Exception as e:
+                    results[name] = {"error": f"Lỗi tính {name}: {str(e)}"}
+
+        results['summary'] = TechnicalIndicators._summarize(results)
+        return results
+
+
+def _rolling_mean_tail(values: np.ndarray, window: int) -> List[float]:
+    """Last HISTORY_SIZE values of the rolling mean, computed from the candles they need only."""
+    return kernels.rolling_mean(values[-(window + HISTORY_SIZE - 1):], window)[-HISTORY_SIZE:].tolist()
+
+
+def _per_candle(values: Optional[Union[Sequence[float], float]], n: int) -> List[Optional[float]]:
+    """Expand an optional per-candle input to a list of length n (None when missing)."""
+    if values is None or (not np.isscalar(values) and len(values) == 0) or (np.isscalar(values) and not values):
+        return [None] * n
+    if np.isscalar(values):
+        return [float(values)] * n
+    if len(values) != n:
+        raise ValueError(f"Expected {n} values, got {len(values)}")
+    return [float(v) for v in values]
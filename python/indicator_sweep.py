@@ -0,0 +1,178 @@
+"""
+Parameter sweeps: one indicator over a grid of parameters in one vectorized pass.
+
+Every sweep returns a dict with a "params" array (one row per variant, one
+column per parameter) and one 2-D array per output line of shape
+(n_variants, T), row i belonging to params[i]. Values follow the matching
+TechnicalIndicators definitions:
+
+    sma_sweep(prices, windows=range(5, 201))         one cumulative sum for all windows
+    ema_sweep(prices, spans=[...])                   one 2-D recurrence, alpha per row
+    rsi_sweep(prices, periods=[...])                 Wilder smoothing with alpha per row
+    macd_sweep(prices, fast, slow, signal)           EMAs shared between variants
+    bollinger_sweep(prices, periods, std_devs)       bands for every (period, std_dev)
+
+Pass dtype=np.float32 to halve the size of large grids (computation stays float64).
+"""
+
+import itertools
+from typing import Dict, Sequence
+
+import numpy as np
+
+import indicator_kernels as kernels
+
+ArrayLike = kernels.ArrayLike
+
+
+def _as_series(prices: ArrayLike) -> np.ndarray:
+    prices = np.asarray(prices, dtype=np.float64)
+    if prices.ndim != 1:
+        raise ValueError("Sweeps take a single 1-D series")
+    return prices
+
+
+def _as_params(values: Sequence, name: str) -> np.ndarray:
+    values = np.asarray(list(values), dtype=np.float64).ravel()
+    if values.size == 0:
+        raise ValueError(f"{name} must not be empty")
+    if np.any(values <= 0):
+        raise ValueError(f"{name} must be positive")
+    return values
+
+
+def _window_sums(x: np.ndarray, windows: np.ndarray) -> tuple:
+    """
+    Sum and count of valid values over every window ending at every bar, all from one
+    cumulative sum of the centered series. Returns (sums, counts, ref) with sums and
+    counts of shape (k, T), NaN / 0 where a window would start before the series.
+    """
+    length = len(x)
+    valid = ~np.isnan(x)
+    ref = x[valid][0] if valid.any() else 0.0
+    csum = np.concatenate([[0.0], np.cumsum(np.where(valid, x - ref, 0.0))])
+    ccount = np.concatenate([[0.0], np.cumsum(valid, dtype=np.float64)])
+
+    sums = np.full((len(windows), length), np.nan)
+    counts = np.zeros((len(windows), length))
+    for row, window in enumerate(windows):
+        if window <= length:
+            sums[row, window - 1:] = csum[window:] - csum[:-window]
+            counts[row, window - 1:] = ccount[window:] - ccount[:-window]
+    return sums, counts, ref
+
+
+def sma_sweep(prices: ArrayLike, windows: Sequence[int] = range(5, 201),
+              dtype=np.float64) -> Dict[str, np.ndarray]:
+    """Rolling means for every window (rows of 'sma' follow `windows`)."""
+    x = _as_series(prices)
+    windows = _as_params(windows, 'windows').astype(np.int64)
+    sums, counts, ref = _window_sums(x, windows)
+    full = counts == windows[:, None]
+    sma = np.where(full, sums / windows[:, None] + ref, np.nan)
+    return {"params": windows[:, None], "sma": sma.astype(dtype, copy=False)}
+
+
+def ema_sweep(prices: ArrayLike, spans: Sequence[float], dtype=np.float64) -> Dict[str, np.ndarray]:
+    """Span-based EMAs (adjust=True) for every span as one (k, T) recurrence."""
+    x = _as_series(prices)
+    spans = _as_params(spans, 'spans')
+    ema = kernels.ema(x[None, :], spans)
+    return {"params": spans[:, None], "ema": ema.astype(dtype, copy=False)}
+
+
+def rsi_sweep(prices: ArrayLike, periods: Sequence[int], dtype=np.float64) -> Dict[str, np.ndarray]:
+    """RSI for every period; gains/losses are computed once and smoothed with one alpha per row."""
+    x = _as_series(prices)
+    periods = _as_params(periods, 'periods')
+
+    delta = kernels.diff(x)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    missing = np.isnan(x)
+    gain[missing] = np.nan
+    loss[missing] = np.nan
+
+    alpha = 1.0 / periods
+    avg_gain = kernels.ewm_mean(gain[None, :], alpha)
+    avg_loss = kernels.ewm_mean(loss[None, :], alpha)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+
+    # min_periods = period for each row
+    observations = np.cumsum(~missing)
+    rsi[observations[None, :] < periods[:, None]] = np.nan
+    return {"params": periods[:, None], "rsi": rsi.astype(dtype, copy=False)}
+
+
+def macd_sweep(prices: ArrayLike, fast_periods: Sequence[int], slow_periods: Sequence[int],
+               signal_periods: Sequence[int], dtype=np.float64) -> Dict[str, np.ndarray]:
+    """
+    MACD for every (fast, slow, signal) with fast < slow.
+
+    Each distinct span is smoothed once; the signal lines of all variants are one
+    recurrence over the stacked MACD lines with one alpha per row.
+    """
+    x = _as_series(prices)
+    fast_periods = _as_params(fast_periods, 'fast_periods')
+    slow_periods = _as_params(slow_periods, 'slow_periods')
+    signal_periods = _as_params(signal_periods, 'signal_periods')
+
+    params = np.array([combo for combo in itertools.product(fast_periods, slow_periods, signal_periods)
+                       if combo[0] < combo[1]], dtype=np.float64).reshape(-1, 3)
+    if len(params) == 0:
+        raise ValueError("No (fast, slow) pair with fast < slow")
+
+    spans, span_index = np.unique(params[:, :2], return_inverse=True)
+    span_index = span_index.reshape(-1, 2)
+    emas = kernels.ema(x[None, :], spans)
+
+    pairs, pair_index = np.unique(span_index, axis=0, return_inverse=True)
+    lines = emas[pairs[:, 0]] - emas[pairs[:, 1]]
+    macd_line = lines[pair_index.ravel()]
+    signal_line = kernels.ema(macd_line, params[:, 2])
+
+    return {
+        "params": params,
+        "macd": macd_line.astype(dtype, copy=False),
+        "signal": signal_line.astype(dtype, copy=False),
+        "histogram": (macd_line - signal_line).astype(dtype, copy=False)
+    }
+
+
+def bollinger_sweep(prices: ArrayLike, periods: Sequence[int], std_devs: Sequence[float] = (2,),
+                    dtype=np.float64) -> Dict[str, np.ndarray]:
+    """
+    Bollinger Bands for every (period, std_dev).
+
+    The middle bands come from one cumulative sum; the standard deviation uses the
+    block kernel once per distinct period, because a single cumulative sum of squares
+    loses precision on series that drift far from their start.
+    """
+    x = _as_series(prices)
+    periods = _as_params(periods, 'periods').astype(np.int64)
+    std_devs = _as_params(std_devs, 'std_devs')
+
+    middle = sma_sweep(x, periods)["sma"]
+    std = np.vstack([kernels.rolling_std(x, int(period)) for period in periods])
+
+    upper = middle[:, None, :] + std[:, None, :] * std_devs[None, :, None]
+    lower = middle[:, None, :] - std[:, None, :] * std_devs[None, :, None]
+    params = np.array(list(itertools.product(periods, std_devs)), dtype=np.float64)
+    shape = (len(params), len(x))
+
+    return {
+        "params": params,
+        "upper": upper.reshape(shape).astype(dtype, copy=False),
+        "middle": np.repeat(middle, len(std_devs), axis=0).astype(dtype, copy=False),
+        "lower": lower.reshape(shape).astype(dtype, copy=False)
+    }
+
+
+SWEEPS = {
+    'sma': sma_sweep,
+    'ema': ema_sweep,
+    'rsi': rsi_sweep,
+    'macd': macd_sweep,
+    'bollinger': bollinger_sweep
+}
@@ -0,0 +1,135 @@
+"""
+Batched LSTM forecasting: many input windows advanced through the rollout together.
+
+predict_lstm.predict runs one trajectory with one forward pass per step. Here
+every step is one (batch, L, 11) forward pass for all trajectories:
+
+    forecast_batch(model, scalers, histories)      several symbols through one model
+    forecast_scenarios(model, scalers, df, n)      perturbed paths of one symbol (fan chart)
+
+Each history may come with its own scaler (a list of FeatureScalers, one per
+history); scaling is applied as one (batch, 11) affine transform per step, with
+the same operations as FeatureScaler.transform / inverse_column.
+"""
+
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+import predict_lstm
+from lstm_features import FEATURES, BatchFeatureState, FeatureState
+from lstm_scaling import FeatureScaler, as_scaler
+
+# A FeatureScaler, or a legacy dict of MinMaxScalers
+Scalers = Union[FeatureScaler, Dict[str, object]]
+History = Union[pd.DataFrame, Sequence[float]]
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def _scaler_arrays(scalers: Union[Scalers, Sequence[Scalers]], batch: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(batch, n_features) scale and offset vectors of the scalers."""
+    single = isinstance(scalers, (FeatureScaler, dict))
+    per_row = [as_scaler(scalers)] * batch if single else [as_scaler(row) for row in scalers]
+    if len(per_row) != batch:
+        raise ValueError(f"Expected {batch} scalers, got {len(per_row)}")
+    scale = np.array([row.scale for row in per_row])
+    offset = np.array([row.offset for row in per_row])
+    return scale, offset
+
+
+def _closes(history: History) -> np.ndarray:
+    values = history['close'].values if isinstance(history, pd.DataFrame) else history
+    return np.asarray(values, dtype=np.float64)
+
+
+def _feature_state(closes: np.ndarray, seq_len: int, params: Optional[Dict[str, float]]) -> FeatureState:
+    return FeatureState.from_closes(closes, seq_len, params)
+
+
+def _rollout(predictor, state: BatchFeatureState, scale: np.ndarray, offset: np.ndarray,
+             steps: int, noise: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Closes for steps + 1 days per row: the next day, then `steps` days each fed
+    back into the features. noise (batch, steps + 1) multiplies every predicted
+    close before it is fed back.
+    """
+    close_column = FEATURES.index('close')
+    scaled = state.window() * scale[:, None, :] + offset[:, None, :]
+    closes = np.empty((len(state), steps + 1))
+
+    for step in range(steps + 1):
+        pred = predictor(scaled)[:, 0].astype(np.float64)
+        close = (pred - offset[:, close_column]) / scale[:, close_column]
+        if noise is not None:
+            close = close * noise[:, step]
+        closes[:, step] = close
+        if step < steps:
+            row = state.append(close)
+            scaled = np.concatenate([scaled[:, 1:], (row * scale + offset)[:, None, :]], axis=1)
+
+    return closes
+
+
+def forecast_batch(model, scalers: Union[Scalers, Sequence[Scalers]], histories: Sequence[History],
+                   steps: int = predict_lstm.FORECAST_STEPS,
+                   seq_len: Optional[int] = None,
+                   params: Optional[Dict[str, float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Forecast every history with one forward pass per step.
+
+    Args:
+        model: Keras model, CompiledPredictor or NumpyLSTMModel shared by all histories.
+        scalers: One FeatureScaler for all histories, or one per history.
+        histories: DataFrames with a 'close' column, or close sequences.
+        seq_len: Window length; defaults to the model's input length.
+        params: TECH_PARAMS the model was trained with (its config 'technical_parameters').
+
+    Returns:
+        (next_day, multi_step): (batch,) and (batch, steps) prices, the same
+        quantities as predict_lstm.predict for each history.
+    """
+    if len(histories) == 0:
+        raise ValueError("histories must not be empty")
+    seq_len = seq_len or predict_lstm.sequence_length(model)
+    state = BatchFeatureState.from_states([_feature_state(_closes(history), seq_len, params)
+                                           for history in histories])
+    scale, offset = _scaler_arrays(scalers, len(state))
+
+    closes = _rollout(predict_lstm.as_predictor(model), state, scale, offset, steps)
+    return closes[:, 0], closes[:, 1:]
+
+
+def forecast_scenarios(model, scalers: Scalers, history: History, n_scenarios: int = 100,
+                       steps: int = predict_lstm.FORECAST_STEPS, volatility: Optional[float] = None,
+                       seed: Optional[int] = None, seq_len: Optional[int] = None,
+                       params: Optional[Dict[str, float]] = None) -> Dict[str, object]:
+    """
+    Fan chart: n_scenarios rollouts of one history, each predicted close multiplied by
+    a log-normal shock before it is fed back.
+
+    Args:
+        volatility: Daily log-return standard deviation of the shocks; defaults to the
+            one of the last 90 closes of the history.
+        seq_len: Window length; defaults to the model's input length.
+        params: TECH_PARAMS the model was trained with.
+
+    Returns:
+        {"paths": (n_scenarios, steps + 1) prices, "percentiles": {p: (steps + 1,)}}
+    """
+    closes = _closes(history)
+    if volatility is None:
+        volatility = float(np.std(np.diff(np.log(closes[-91:])), ddof=1))
+
+    seq_len = seq_len or predict_lstm.sequence_length(model)
+    state = BatchFeatureState.from_states([_feature_state(closes, seq_len, params)] * n_scenarios)
+    scale, offset = _scaler_arrays(scalers, n_scenarios)
+    rng = np.random.default_rng(seed)
+    noise = np.exp(rng.normal(0.0, volatility, (n_scenarios, steps + 1)))
+
+    paths = _rollout(predict_lstm.as_predictor(model), state, scale, offset, steps, noise)
+    return {
+        "paths": paths,
+        "percentiles": {p: np.percentile(paths, p, axis=0) for p in PERCENTILES}
+    }
@@ -0,0 +1,243 @@
+"""
+On-disk cache of the LSTM training inputs, keyed by data and preprocessing.
+
+load_features returns the feature matrix, its scaled version and the fitted
+FeatureScaler of a price CSV's last `years` years. The key is a hash of the
+actual dates and closes in that range, the TECH_PARAMS, the scaling setup, the
+feature list and lstm_features.FEATURE_VERSION. On a hit everything is memory-mapped from
+python/models/cache/<key>/ and no feature engineering or scaling runs; a miss
+builds the entry once (lstm_features.feature_matrix + FeatureScaler.fit) and
+publishes it with an atomic directory rename, so concurrent trainers or search
+trials never read a partial entry. New candles or other TECH_PARAMS change
+the key and simply create another entry; prune() keeps the cache bounded.
+
+Sequences are not stored separately. CachedFeatures.sequences returns the
+windows as zero-copy strided views of the mapped scaled.npy (lstm_sequences),
+which hold exactly what an (n, L, 11) X.npy would, without L times the disk
+space and read traffic.
+
+Example:
+    cached = load_features("python/data/BTC.csv", TECH_PARAMS)
+    X, y = cached.sequences(30)          # views of the mapped scaled matrix
+    cached.scaler.inverse_column(y[:5])
+
+Usage:
+    python python/lstm_cache.py build BTC ETH
+    python python/lstm_cache.py list
+    python python/lstm_cache.py prune --keep 8
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from lstm_features import FEATURE_VERSION, FEATURES, TECH_DEFAULTS, feature_matrix
+from lstm_scaling import FeatureScaler
+from lstm_sequences import sliding_windows
+from market_data import open_store, symbol_path
+from model_registry import MODELS_DIR
+
+CACHE_DIR = os.path.join(MODELS_DIR, "cache")
+
+_META = "meta.json"
+_FORMAT_VERSION = 1
+# Scaling that the cached scaled.npy was produced with (part of the key)
+_SCALING = {"method": "minmax", "feature_range": [0, 1], "dtype": "float32"}
+
+
+def data_fingerprint(dates: np.ndarray, closes: np.ndarray) -> str:
+    """Hash of the date and close values (not of file names or modification times)."""
+    digest = hashlib.sha1()
+    for values in (dates, closes):
+        digest.update(str(values.dtype).encode())
+        digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
+
+
+def cache_key(fingerprint: str, tech: Dict[str, Any], years: Optional[float]) -> str:
+    description = {
+        "format": _FORMAT_VERSION,
+        "feature_version": FEATURE_VERSION,
+        "data": fingerprint,
+        "years": years,
+        "tech": tech,
+        "scaling": _SCALING,
+        "features": FEATURES
+    }
+    return hashlib.sha1(json.dumps(description, sort_keys=True).encode()).hexdigest()[:20]
+
+
+class CachedFeatures:
+    """
+    A cache entry: memory-mapped arrays plus the scaler.
+
+    Args:
+        directory: Entry directory written by load_features.
+        hit: Whether the entry existed before this load_features call.
+    """
+
+    def __init__(self, directory: str, hit: bool = True):
+        self.directory = directory
+        self.hit = hit
+        with open(os.path.join(directory, _META)) as f:
+            self.meta = json.load(f)
+        self.key = self.meta['key']
+        self.features = np.load(os.path.join(directory, "features.npy"), mmap_mode='r')
+        self.scaled = np.load(os.path.join(directory, "scaled.npy"), mmap_mode='r')
+        self.dates = np.load(os.path.join(directory, "dates.npy"), mmap_mode='r')
+        self.scaler = FeatureScaler.load(os.path.join(directory, "scaler.json"))
+
+    @property
+    def scaled_path(self) -> str:
+        return os.path.join(self.directory, "scaled.npy")
+
+    def sequences(self, sequence_length: int, target_column: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """(X, y) windows of the scaled matrix as read-only views (see lstm_sequences.sliding_windows)."""
+        return sliding_windows(self.scaled, sequence_length, target_column)
+
+
+def _build(directory: str, key: str, dates: np.ndarray, closes: np.ndarray, tech: Dict[str, Any],
+           source: Dict[str, Any]) -> None:
+    """Write a complete entry to a temporary directory and rename it into place."""
+    rows, kept = feature_matrix(closes, params=tech)
+    scaler = FeatureScaler.fit(rows)
+
+    tmp = f"{directory}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    np.save(os.path.join(tmp, "features.npy"), rows)
+    np.save(os.path.join(tmp, "scaled.npy"), scaler.transform(rows))
+    np.save(os.path.join(tmp, "dates.npy"), dates[kept])
+    scaler.save(os.path.join(tmp, "scaler.json"))
+    with open(os.path.join(tmp, _META), 'w') as f:
+        json.dump({
+            "key": key,
+            "format": _FORMAT_VERSION,
+            "feature_version": FEATURE_VERSION,
+            "source": source,
+            "tech": tech,
+            "scaling": _SCALING,
+            "features": FEATURES,
+            "rows": len(rows),
+            "built_at": time.strftime('%Y-%m-%dT%H:%M:%S')
+        }, f, indent=2)
+    try:
+        os.rename(tmp, directory)
+    except OSError:
+        # Another process published the same entry first; the contents are identical
+        shutil.rmtree(tmp, ignore_errors=True)
+        if not os.path.exists(os.path.join(directory, _META)):
+            raise
+
+
+def load_features(csv_file: str, tech: Optional[Dict[str, Any]] = None, years: Optional[float] = 10,
+                  cache_dir: str = CACHE_DIR, refresh: bool = False) -> CachedFeatures:
+    """
+    Cached features of the last `years` years of `csv_file` (as load_and_prepare_data),
+    built on a miss.
+
+    Args:
+        csv_file: Price CSV with 'date' and 'close' (read through its market_data store).
+        tech: TECH_PARAMS (lstm_features.TECH_DEFAULTS by default).
+        years: Years of history, counted back from the last date; None for all rows.
+        cache_dir: Cache root directory.
+        refresh: Rebuild the entry even if it exists.
+    """
+    tech = {**TECH_DEFAULTS, **(tech or {})}
+    data = open_store(csv_file)
+    if 'close' not in data.columns:
+        raise ValueError("Missing required columns: ['close']")
+    rows = data.index(start=data.start_of_last(years)) if years is not None and len(data) else slice(None)
+    dates, closes = data.dates[rows], data.columns['close'][rows]
+
+    key = cache_key(data_fingerprint(dates, closes), tech, years)
+    directory = os.path.join(cache_dir, key)
+    meta_path = os.path.join(directory, _META)
+    hit = os.path.exists(meta_path) and not refresh
+    if not hit:
+        os.makedirs(cache_dir, exist_ok=True)
+        if os.path.isdir(directory) and not os.path.exists(meta_path):
+            # Never a published entry (those always have meta.json): left over from outside interference
+            shutil.rmtree(directory, ignore_errors=True)
+        elif refresh and os.path.isdir(directory):
+            # Move the old entry aside first, so the rename in _build can publish the new one;
+            # readers that already mapped the old files keep them until they close them
+            retired = f"{directory}.{os.getpid()}.old.tmp"
+            try:
+                os.rename(directory, retired)
+            except OSError:
+                # Another refresh moved it already
+                pass
+            shutil.rmtree(retired, ignore_errors=True)
+        source = {"csv": os.path.abspath(csv_file), "rows": len(closes),
+                  "first": str(dates[0]) if len(dates) else None, "last": str(dates[-1]) if len(dates) else None}
+        _build(directory, key, np.asarray(dates), np.asarray(closes, dtype=np.float64), tech, source)
+    else:
+        # Recency for prune()
+        os.utime(meta_path)
+    return CachedFeatures(directory, hit)
+
+
+def entries(cache_dir: str = CACHE_DIR) -> List[Dict[str, Any]]:
+    """Metadata of every cache entry, most recently used first."""
+    found = []
+    for name in os.listdir(cache_dir) if os.path.isdir(cache_dir) else []:
+        meta_path = os.path.join(cache_dir, name, _META)
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            size = sum(entry.stat().st_size for entry in os.scandir(os.path.join(cache_dir, name)))
+            found.append({**meta, "directory": os.path.join(cache_dir, name), "bytes": size,
+                          "used": os.path.getmtime(meta_path)})
+    return sorted(found, key=lambda entry: entry["used"], reverse=True)
+
+
+def prune(cache_dir: str = CACHE_DIR, keep: int = 16) -> int:
+    """Delete all but the `keep` most recently used entries (and stale temporaries); returns the entry count."""
+    removed = 0
+    for entry in entries(cache_dir)[keep:]:
+        shutil.rmtree(entry["directory"], ignore_errors=True)
+        removed += 1
+    for name in os.listdir(cache_dir) if os.path.isdir(cache_dir) else []:
+        path = os.path.join(cache_dir, name)
+        # Left by interrupted builds (an hour is far longer than any build takes)
+        if name.endswith('.tmp') and time.time() - os.path.getmtime(path) > 3600:
+            shutil.rmtree(path, ignore_errors=True)
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LSTM feature-matrix cache")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help="build (or check) the default entries of symbols")
+    build.add_argument('symbols', nargs='+')
+    build.add_argument('--refresh', action='store_true')
+    subparsers.add_parser('list', help="show the cache entries")
+    prune_parser = subparsers.add_parser('prune', help="keep only the most recently used entries")
+    prune_parser.add_argument('--keep', type=int, default=16)
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        for symbol in args.symbols:
+            started = time.perf_counter()
+            cached = load_features(symbol_path(symbol), cache_dir=args.cache_dir, refresh=args.refresh)
+            print(f"{symbol.upper()}: {'hit' if cached.hit else 'built'} {cached.key} "
+                  f"{cached.features.shape} in {time.perf_counter() - started:.3f}s")
+    elif args.command == 'list':
+        for entry in entries(args.cache_dir):
+            print(f"{entry['key']}  {os.path.basename(entry['source']['csv']):<10} {entry['rows']:>9} rows "
+                  f"{entry['bytes'] / 2**20:>8.1f} MB  {entry['source']['first']} .. {entry['source']['last']}  "
+                  f"tech {entry['tech']}")
+    else:
+        print(f"Removed {prune(args.cache_dir, args.keep)} entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""
+The 11 LSTM features, shared by training, streaming and serving.
+
+feature_matrix builds the whole (n, 11) feature matrix in one pass over the
+closes: per cache-sized block it computes the rolling statistics with the O(n)
+indicator_kernels and writes all 11 columns straight into a preallocated
+(float32 by default) output. Rows with a NaN feature are left out, as
+engineer_features' dropna did. The derived columns (RSI, bands, ratios) come
+from _write_rows, which the incremental feature_rows below also uses, so
+training and serving features cannot drift apart.
+
+During a rollout only one close is appended per step, so FeatureState keeps
+the last max_window(params) closes and the EMA and builds the new row's 11 features
+from those alone - O(window) per step, independent of the history length.
+
+Definitions: rolling-mean RSI(14), EMA(30) with adjust=False (same update as
+pandas), SMA(10), SMA(50) and Bollinger(20, 2) with sample standard deviation.
+Those are TECH_DEFAULTS; a model trained with other TECH_PARAMS must be served
+with the same `params` (its config's 'technical_parameters').
+
+Example:
+    rows, kept = feature_matrix(closes)                    # (n, 11) float32
+    state = FeatureState.from_closes(closes, seq_len=30)
+    row = state.append(next_close)       # (11,) features of the new day
+    window = state.window()              # (30, 11), oldest first
+
+BatchFeatureState does the same for a batch of series with one close per
+series per step (several symbols, or scenarios of one symbol).
+"""
+
+from collections import deque
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+import indicator_kernels as kernels
+
+FEATURES = [
+    'close', 'rsi_14', 'ema_30', 'sma_10', 'sma_50',
+    'bb_upper', 'bb_lower', 'bb_width', 'bb_position',
+    'price_sma10_ratio', 'price_sma50_ratio'
+]
+
+# Bump whenever feature_matrix / _write_rows compute different values for the same
+# inputs, so cached matrices (lstm_cache) built by older code are not reused
+FEATURE_VERSION = 1
+
+RSI_WINDOW = 14
+EMA_WINDOW = 30
+SMA_SHORT_WINDOW = 10
+SMA_LONG_WINDOW = 50
+BOLLINGER_WINDOW = 20
+BOLLINGER_STD = 2
+
+# The windows above by lstm_train.TECH_PARAMS key. Every builder below takes `params`
+# overrides of these (a model's config 'technical_parameters', hyperparameter search)
+TECH_DEFAULTS = {
+    'rsi_window': RSI_WINDOW,
+    'ema_window': EMA_WINDOW,
+    'sma_10_window': SMA_SHORT_WINDOW,
+    'sma_50_window': SMA_LONG_WINDOW,
+    'bollinger_window': BOLLINGER_WINDOW,
+    'bollinger_std': BOLLINGER_STD
+}
+
+
+def technical_parameters(params: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    """TECH_DEFAULTS with `params` overrides applied."""
+    return {**TECH_DEFAULTS, **(params or {})}
+
+
+def max_window(params: Optional[Dict[str, float]] = None) -> int:
+    """Closes needed for one feature row with the given TECH_PARAMS."""
+    tech = technical_parameters(params)
+    # RSI needs rsi_window differences, i.e. one more close
+    return max(tech['rsi_window'] + 1, tech['sma_10_window'], tech['sma_50_window'], tech['bollinger_window'])
+
+
+MAX_WINDOW = max_window()
+
+# Rows built per block in feature_matrix (bounds the float64 temporaries)
+_BLOCK = 65536
+
+
+class FeatureState:
+    """
+    Rolling feature state of one series.
+
+    Args:
+        closes: At least max_window(params) most recent closes (only the tail is kept).
+        ema: EMA(30) at the last close.
+        rows: Most recent feature rows (columns in FEATURES order); the last
+            `seq_len` of them form the model input window.
+        params: TECH_PARAMS the rows were computed with (TECH_DEFAULTS by default).
+    """
+
+    def __init__(self, closes: Sequence[float], ema: float, rows: np.ndarray,
+                 params: Optional[Dict[str, float]] = None):
+        self.params = technical_parameters(params)
+        window = max_window(self.params)
+        closes = np.asarray(closes, dtype=np.float64)
+        if len(closes) < window:
+            raise ValueError(f"Need at least {window} closes, got {len(closes)}")
+        rows = np.asarray(rows, dtype=np.float64)
+        if rows.ndim != 2 or rows.shape[1] != len(FEATURES) or len(rows) == 0:
+            raise ValueError(f"rows must have shape (seq_len, {len(FEATURES)})")
+
+        self.closes = deque(closes[-window:].tolist(), maxlen=window)
+        self.ema = float(ema)
+        self.rows = deque(rows, maxlen=len(rows))
+        self._alpha = 2.0 / (self.params['ema_window'] + 1)
+
+    @classmethod
+    def from_features(cls, df_feat: pd.DataFrame, closes: Sequence[float], seq_len: int,
+                      params: Optional[Dict[str, float]] = None) -> 'FeatureState':
+        """
+        Seed from engineer_features output and the raw closes it was computed from
+        (the last feature row must belong to the last close).
+        """
+        closes = np.asarray(closes, dtype=np.float64)
+        if len(df_feat) < seq_len:
+            raise ValueError(f"Need at least {seq_len} feature rows, got {len(df_feat)}")
+        if df_feat['close'].iloc[-1] != closes[-1]:
+            raise ValueError("The last feature row does not match the last close")
+        return cls(closes, df_feat['ema_30'].iloc[-1], df_feat[FEATURES].values[-seq_len:], params)
+
+    @classmethod
+    def from_closes(cls, closes: Sequence[float], seq_len: int,
+                    params: Optional[Dict[str, float]] = None) -> 'FeatureState':
+        """Seed from raw closes (float64 features of the whole history)."""
+        closes = np.asarray(closes, dtype=np.float64)
+        rows, kept = feature_matrix(closes, dtype=np.float64, params=params)
+        if len(rows) < seq_len:
+            raise ValueError(f"Need at least {seq_len} feature rows, got {len(rows)}")
+        if not kept[-1]:
+            raise ValueError("The last close has no valid feature row")
+        return cls(closes, rows[-1, FEATURES.index('ema_30')], rows[-seq_len:], params)
+
+    def append(self, close: float) -> np.ndarray:
+        """Add one close and return its feature row."""
+        close = float(close)
+        self.closes.append(close)
+
+        # Same update as pandas ewm(adjust=False): the weights are renormalized every step
+        old_weight = 1.0 - self._alpha
+        if self.ema != close:
+            self.ema = (old_weight * self.ema + self._alpha * close) / (old_weight + self._alpha)
+
+        row = feature_rows(np.fromiter(self.closes, dtype=np.float64, count=len(self.closes)), self.ema,
+                           params=self.params)
+        self.rows.append(row)
+        return row
+
+    def extend(self, closes: Sequence[float]) -> np.ndarray:
+        """Append several closes; returns their feature rows."""
+        return np.array([self.append(close) for close in closes]).reshape(-1, len(FEATURES))
+
+    def window(self) -> np.ndarray:
+        """The latest feature rows, oldest first."""
+        return np.array(self.rows)
+
+
+class BatchFeatureState:
+    """
+    FeatureState for many independent series advanced together (one close per
+    series per step), e.g. several symbols or scenarios of one symbol.
+
+    Args:
+        closes: (batch, >= max_window(params)) most recent closes.
+        ema: (batch,) EMA(30) at the last close.
+        rows: (batch, seq_len, n_features) latest feature rows.
+        params: TECH_PARAMS shared by all series (TECH_DEFAULTS by default).
+    """
+
+    def __init__(self, closes: np.ndarray, ema: np.ndarray, rows: np.ndarray,
+                 params: Optional[Dict[str, float]] = None):
+        self.params = technical_parameters(params)
+        window = max_window(self.params)
+        closes = np.asarray(closes, dtype=np.float64)
+        rows = np.asarray(rows, dtype=np.float64)
+        if closes.ndim != 2 or closes.shape[1] < window:
+            raise ValueError(f"closes must have shape (batch, >= {window})")
+        if rows.ndim != 3 or rows.shape[0] != closes.shape[0] or rows.shape[2] != len(FEATURES):
+            raise ValueError(f"rows must have shape (batch, seq_len, {len(FEATURES)})")
+
+        self.closes = closes[:, -window:].copy()
+        self.ema = np.asarray(ema, dtype=np.float64).reshape(len(closes)).copy()
+        self.rows = rows.copy()
+        self._alpha = 2.0 / (self.params['ema_window'] + 1)
+
+    @classmethod
+    def from_states(cls, states: Sequence[FeatureState]) -> 'BatchFeatureState':
+        """Stack single-series states (all with the same window length and TECH_PARAMS)."""
+        if any(state.params != states[0].params for state in states):
+            raise ValueError("All states must use the same TECH_PARAMS")
+        return cls(
+            np.array([list(state.closes) for state in states]),
+            np.array([state.ema for state in states]),
+            np.array([state.window() for state in states]),
+            states[0].params
+        )
+
+    def __len__(self) -> int:
+        return len(self.closes)
+
+    def append(self, closes: Sequence[float]) -> np.ndarray:
+        """Add one close per series; returns the (batch, n_features) new rows."""
+        closes = np.asarray(closes, dtype=np.float64).reshape(len(self))
+        self.closes = np.concatenate([self.closes[:, 1:], closes[:, None]], axis=1)
+
+        old_weight = 1.0 - self._alpha
+        updated = (old_weight * self.ema + self._alpha * closes) / (old_weight + self._alpha)
+        self.ema = np.where(self.ema != closes, updated, self.ema)
+
+        row = feature_rows(self.closes, self.ema, params=self.params)
+        self.rows = np.concatenate([self.rows[:, 1:], row[:, None, :]], axis=1)
+        return row
+
+    def window(self) -> np.ndarray:
+        """(batch, seq_len, n_features) latest feature rows, oldest first."""
+        return self.rows
+
+
+def ema_series(closes: np.ndarray, ema: Optional[float] = None, window: int = EMA_WINDOW) -> np.ndarray:
+    """
+    EMA(30) (adjust=False) at every close, continued from `ema` at the close
+    before the first one, or started at the first close when ema is None.
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    if ema is None:
+        return kernels.ema(closes, window, adjust=False)
+    return kernels.ema(np.concatenate([[ema], closes]), window, adjust=False)[1:]
+
+
+def feature_matrix(closes: Sequence[float], ema: Optional[np.ndarray] = None, history: int = 0,
+                   dtype=np.float32, params: Optional[Dict[str, float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Feature rows of closes[history:]; the first `history` closes only provide
+    window context (the tail of an earlier chunk).
+
+    Args:
+        closes: 1-D closes, oldest first.
+        ema: EMA(30) at each of closes[history:]; ema_series of them by default.
+        history: Leading closes without rows of their own.
+        dtype: Output dtype (float32 for training, float64 to seed rollouts).
+        params: TECH_DEFAULTS overrides (window sizes, Bollinger width); the
+            columns keep their FEATURES names.
+
+    Returns:
+        (rows, kept): the (n, 11) rows of the closes with complete, NaN-free
+        features, and a bool mask over closes[history:] telling which those are.
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    tech = technical_parameters(params)
+    window = max_window(tech)
+    count = len(closes) - history
+    ema = ema_series(closes[history:], window=tech['ema_window']) if ema is None else np.asarray(ema, dtype=np.float64)
+    # First close (relative to history) with `window` closes up to and including it
+    first = min(max(window - 1 - history, 0), count)
+
+    out = np.empty((count - first, len(FEATURES)), dtype=dtype)
+    for start in range(first, count, _BLOCK):
+        stop = min(start + _BLOCK, count)
+        context = closes[history + start - (window - 1):history + stop]
+        _block_rows(context, ema[start:stop], out[start - first:stop - first], tech)
+
+    kept = np.zeros(count, dtype=bool)
+    kept[first:] = ~np.isnan(out).any(axis=1)
+    return (out if kept[first:].all() else out[kept[first:]]), kept
+
+
+def _block_rows(closes: np.ndarray, ema: np.ndarray, out: np.ndarray, tech: Dict[str, float]) -> None:
+    """Rows of closes[max_window(tech) - 1:] into `out`; the earlier closes are window context."""
+    rows = slice(max_window(tech) - 1, None)
+    delta = kernels.diff(closes)
+    _write_rows(
+        out, closes[rows], ema,
+        gain=kernels.rolling_mean(np.where(delta > 0, delta, 0.0), tech['rsi_window'])[rows],
+        loss=kernels.rolling_mean(np.where(delta < 0, -delta, 0.0), tech['rsi_window'])[rows],
+        middle=kernels.rolling_mean(closes, tech['bollinger_window'])[rows],
+        std=kernels.rolling_std(closes, tech['bollinger_window'])[rows],
+        sma_short=kernels.rolling_mean(closes, tech['sma_10_window'])[rows],
+        sma_long=kernels.rolling_mean(closes, tech['sma_50_window'])[rows],
+        bollinger_std=tech['bollinger_std']
+    )
+
+
+def feature_rows(closes: np.ndarray, ema, out: Optional[np.ndarray] = None,
+                 params: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """
+    Feature row(s) of the last close: closes has shape (..., >= max_window(params)), ema
+    the matching (...) EMA(30) values; returns (..., n_features), written into `out`
+    when given.
+    """
+    tech = technical_parameters(params)
+    closes = np.asarray(closes, dtype=np.float64)
+    close = closes[..., -1]
+    if out is None:
+        out = np.empty(close.shape + (len(FEATURES),))
+
+    delta = np.diff(closes[..., -(tech['rsi_window'] + 1):], axis=-1)
+    gain = np.where(delta > 0, delta, 0.0).mean(axis=-1)
+    loss = np.where(delta < 0, -delta, 0.0).mean(axis=-1)
+
+    band = closes[..., -tech['bollinger_window']:]
+    _write_rows(
+        out, close, np.broadcast_to(ema, close.shape), gain, loss,
+        middle=band.mean(axis=-1),
+        std=band.std(axis=-1, ddof=1),
+        sma_short=closes[..., -tech['sma_10_window']:].mean(axis=-1),
+        sma_long=closes[..., -tech['sma_50_window']:].mean(axis=-1),
+        bollinger_std=tech['bollinger_std']
+    )
+    return out
+
+
+def _write_rows(out: np.ndarray, close: np.ndarray, ema: np.ndarray, gain: np.ndarray, loss: np.ndarray,
+                middle: np.ndarray, std: np.ndarray, sma_short: np.ndarray, sma_long: np.ndarray,
+                bollinger_std: float = BOLLINGER_STD) -> None:
+    """The 11 feature columns from the rolling statistics, written into out[..., i] in FEATURES order."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        upper = middle + std * bollinger_std
+        lower = middle - std * bollinger_std
+        width = upper - lower
+        columns = {
+            'close': close,
+            'rsi_14': 100 - (100 / (1 + np.divide(gain, loss))),
+            'ema_30': ema,
+            'sma_10': sma_short,
+            'sma_50': sma_long,
+            'bb_upper': upper,
+            'bb_lower': lower,
+            'bb_width': width,
+            'bb_position': np.divide(close - lower, width),
+            'price_sma10_ratio': np.divide(close, sma_short),
+            'price_sma50_ratio': np.divide(close, sma_long)
+        }
+    for index, name in enumerate(FEATURES):
+        out[..., index] = columns[name]
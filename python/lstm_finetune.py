@@ -0,0 +1,212 @@
+"""
+Warm-start retraining: fine-tune the production LSTM on recent candles.
+
+Instead of training a new model from random weights on 10 years of data,
+finetune_model loads the symbol's saved model (lstm_model.keras / lstm_<sym>_model.keras)
+and its scaler, and trains for a few epochs at a low learning rate on
+
+    - the most recent `recent_days` windows (the last tenth of them as the
+      validation set for early stopping), plus
+    - a replay sample of `replay` x as many windows drawn from older history,
+      so the model does not forget earlier regimes.
+
+The newest `holdout_days` windows are never trained on. They form the gate:
+the production model and the fine-tuned candidate are both scored there, and
+the candidate replaces the production artifacts (model, .npz export if one
+exists, scaled data, config) only if its `gate_metric` is no worse than the
+production model's by more than `tolerance`. The scaler stays fixed, so the
+features mean the same as when the model was trained; closes far outside the
+fitted range (reported as out_of_range) call for a full lstm_train run instead.
+
+Example:
+    report = finetune_model('BTC', recent_days=365, epochs=10)
+    report['accepted'], report['holdout']['candidate']['mae']
+
+Usage:
+    python python/lstm_finetune.py [SYMBOL] [--recent-days 365] [--holdout-days 60] [--dry-run]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict
+
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras.callbacks import EarlyStopping
+from tensorflow.keras.losses import Huber
+
+from lstm_cache import load_features
+from lstm_numpy import export_npz
+from lstm_scaling import load_scaler
+from lstm_sequences import sliding_windows, window_dataset
+from lstm_train import HYPERPARAMS, TECH_PARAMS, calculate_metrics
+from model_registry import artifact_paths, scaler_path
+
+# Metrics where lower is better; any of them can gate the replacement
+GATE_METRICS = ('mae', 'rmse', 'mse', 'mape')
+
+
+def _replace(write, path: str) -> None:
+    """Write through `write(tmp_path)` next to `path`, then swap it in, so readers never see half a file."""
+    root, ext = os.path.splitext(path)
+    tmp = f"{root}.{os.getpid()}.tmp{ext}"
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def _dump_json(value: Dict[str, Any], path: str) -> None:
+    with open(path, 'w') as f:
+        json.dump(value, f, indent=2)
+
+
+def finetune_model(symbol: str = 'BTC', recent_days: int = 365, holdout_days: int = 60,
+                   replay: float = 1.0, epochs: int = 10, learning_rate: float = 1e-4,
+                   tolerance: float = 0.0, gate_metric: str = 'mae', seed: int = 42,
+                   dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Fine-tune the saved model of `symbol` and replace it if it passes the holdout gate.
+
+    Args:
+        symbol: Symbol whose artifacts are loaded and replaced (model_registry names).
+        recent_days: Most recent windows (before the holdout) to fine-tune on.
+        holdout_days: Newest windows kept out of training and used for the gate.
+        replay: Older windows sampled per recent window.
+        epochs: Maximum fine-tuning epochs (early stopping on the recent validation tail).
+        learning_rate: Adam learning rate for fine-tuning.
+        tolerance: Allowed relative worsening of gate_metric (0.0: must not be worse).
+        gate_metric: One of GATE_METRICS, computed on prices.
+        seed: Seed of the replay sample, the shuffling and TensorFlow.
+        dry_run: Run and score the candidate but never write artifacts.
+
+    Returns:
+        Report with the window counts, holdout metrics of both models and whether
+        the candidate was accepted (and written).
+    """
+    if gate_metric not in GATE_METRICS:
+        raise ValueError(f"gate_metric must be one of {GATE_METRICS}")
+    started = time.time()
+    artifacts = artifact_paths(symbol)
+    for path in (artifacts.model, artifacts.data):
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+
+    config = {}
+    if os.path.exists(artifacts.config):
+        with open(artifacts.config) as f:
+            config = json.load(f)
+    # Windowing of the saved model, which may predate the current HYPERPARAMS
+    hyperparams = {**HYPERPARAMS, **config.get('hyperparameters', {})}
+    sequence_length = hyperparams['sequence_length']
+
+    np.random.seed(seed)
+    tf.random.set_seed(seed)
+    model = tf.keras.models.load_model(artifacts.model)
+    scaler = load_scaler(scaler_path(artifacts))
+
+    # Same data and features as a full training run (from the feature cache), scaled with the production scaler
+    cached = load_features(artifacts.data, config.get('technical_parameters', TECH_PARAMS), years=10)
+    feature_data, feature_names = cached.features, list(cached.meta['features'])
+    if feature_names != scaler.features:
+        raise ValueError(f"{symbol}: scaler features {scaler.features} do not match {feature_names}")
+    scaled_data = scaler.transform(feature_data)
+    close_column = feature_names.index('close')
+    X, y = sliding_windows(scaled_data, sequence_length, close_column)
+
+    n = len(X)
+    holdout_start = n - holdout_days
+    recent_start = max(0, holdout_start - recent_days)
+    n_val = max(1, int(np.ceil((holdout_start - recent_start) * hyperparams['validation_split'])))
+    fit_stop = holdout_start - n_val
+    if holdout_days < 2 or fit_stop - recent_start < hyperparams['batch_size']:
+        raise ValueError(f"{symbol}: {n} windows are too few for recent_days={recent_days}, "
+                         f"holdout_days={holdout_days}")
+
+    rng = np.random.default_rng(seed)
+    n_replay = min(recent_start, int(round((holdout_start - recent_start) * replay)))
+    replay_idx = np.sort(rng.choice(recent_start, size=n_replay, replace=False))
+    train_idx = np.concatenate([replay_idx, np.arange(recent_start, fit_stop)])
+
+    X_holdout = np.ascontiguousarray(X[holdout_start:], dtype=np.float32)
+    y_holdout = scaler.inverse_column(y[holdout_start:])
+    baseline = calculate_metrics(y_holdout, scaler.inverse_column(model.predict(X_holdout, verbose=0)[:, 0]))
+
+    # New optimizer state at a low learning rate, same loss as build_enhanced_lstm_model
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate), loss=Huber(), metrics=['mae'])
+    batch_size = hyperparams['batch_size']
+    history = model.fit(
+        window_dataset(X, y, batch_size, train_idx, shuffle=True, seed=seed),
+        validation_data=window_dataset(X, y, batch_size, np.arange(fit_stop, holdout_start)),
+        epochs=epochs,
+        callbacks=[EarlyStopping(monitor='val_loss', patience=max(1, epochs // 3), restore_best_weights=True)],
+        shuffle=False,
+        verbose=2
+    )
+    candidate = calculate_metrics(y_holdout, scaler.inverse_column(model.predict(X_holdout, verbose=0)[:, 0]))
+
+    accepted = candidate[gate_metric] <= baseline[gate_metric] * (1 + tolerance)
+    recent_closes = scaled_data[recent_start:, close_column]
+    report = {
+        "symbol": symbol.upper(),
+        "finished": datetime.now().isoformat(timespec='seconds'),
+        "seconds": round(time.time() - started, 2),
+        "windows": {"replay": int(n_replay), "recent": int(fit_stop - recent_start),
+                    "validation": int(n_val), "holdout": int(n - holdout_start)},
+        "epochs": len(history.history['loss']),
+        "learning_rate": learning_rate,
+        "gate": {"metric": gate_metric, "tolerance": tolerance},
+        "holdout": {"baseline": baseline, "candidate": candidate},
+        # Share of recent closes outside the scaler's fitted range
+        "out_of_range": float(np.mean((recent_closes < 0) | (recent_closes > 1))),
+        "accepted": bool(accepted),
+        "written": False
+    }
+
+    if accepted and not dry_run:
+        _replace(model.save, artifacts.model)
+        if os.path.exists(artifacts.numpy_model):
+            _replace(lambda path: export_npz(model, path, source=artifacts.model), artifacts.numpy_model)
+        _replace(lambda path: np.save(path, scaled_data), artifacts.scaled_data)
+        report["written"] = True
+        _replace(lambda path: _dump_json({**config, 'last_finetune': report}, path), artifacts.config)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fine-tune the saved LSTM of a symbol on recent data")
+    parser.add_argument('symbol', nargs='?', default='BTC')
+    parser.add_argument('--recent-days', type=int, default=365)
+    parser.add_argument('--holdout-days', type=int, default=60)
+    parser.add_argument('--replay', type=float, default=1.0, help="older windows sampled per recent window")
+    parser.add_argument('--epochs', type=int, default=10)
+    parser.add_argument('--learning-rate', type=float, default=1e-4)
+    parser.add_argument('--tolerance', type=float, default=0.0, help="allowed relative worsening of the gate metric")
+    parser.add_argument('--gate-metric', choices=GATE_METRICS, default='mae')
+    parser.add_argument('--dry-run', action='store_true', help="score the candidate without replacing artifacts")
+    args = parser.parse_args()
+
+    report = finetune_model(args.symbol, args.recent_days, args.holdout_days, args.replay, args.epochs,
+                            args.learning_rate, args.tolerance, args.gate_metric, dry_run=args.dry_run)
+
+    baseline, candidate = report['holdout']['baseline'], report['holdout']['candidate']
+    print(f"\n{report['symbol']}: fine-tuned {report['epochs']} epochs on {report['windows']['recent']} recent + "
+          f"{report['windows']['replay']} replay windows in {report['seconds']:.1f}s")
+    for metric in ('mae', 'rmse', 'mape', 'directional_accuracy'):
+        print(f"{metric.upper():<22} production {baseline[metric]:>12.4f}   candidate {candidate[metric]:>12.4f}")
+    if report['out_of_range'] > 0:
+        print(f"Warning: {report['out_of_range']:.1%} of recent closes are outside the scaler range; "
+              f"consider a full retrain")
+    if report['written']:
+        print("Accepted: production artifacts replaced")
+    else:
+        print("Accepted (dry run): artifacts unchanged" if report['accepted'] else
+              f"Rejected by the {report['gate']['metric']} gate: production artifacts unchanged")
+    if not report['accepted']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Graph-compiled inference for the LSTM forecasters.
+
+Keras model.predict builds a data adapter and runs the callback loop on every
+call, which for a batch of one costs more than the LSTM itself. CompiledPredictor
+wraps model(x, training=False) in a tf.function with a fixed
+(batch, sequence_length, n_features) float32 signature, so it is traced once and
+every later call runs the graph directly.
+
+Example:
+    predictor = compiled_predictor(model)      # cached on the model
+    value = predictor.predict_one(window)      # window: (sequence_length, n_features)
+    values = predictor(batch)                  # batch: (n, sequence_length, n_features) -> (n, 1)
+"""
+
+import numpy as np
+import tensorflow as tf
+
+
+class CompiledPredictor:
+    """tf.function around a Keras model's forward pass with a fixed input signature."""
+
+    def __init__(self, model: tf.keras.Model):
+        _, sequence_length, n_features = model.input_shape
+        self.model = model
+        self.sequence_length = sequence_length
+        self.n_features = n_features
+        self._forward = tf.function(
+            lambda x: model(x, training=False),
+            input_signature=[tf.TensorSpec((None, sequence_length, n_features), tf.float32)]
+        )
+
+    def __call__(self, inputs: np.ndarray) -> np.ndarray:
+        """Predictions for a batch of shape (n, sequence_length, n_features)."""
+        inputs = np.asarray(inputs, dtype=np.float32)
+        return self._forward(tf.constant(inputs)).numpy()
+
+    def predict_one(self, sequence: np.ndarray) -> float:
+        """Prediction for one (sequence_length, n_features) window."""
+        sequence = np.asarray(sequence, dtype=np.float32)
+        return float(self(sequence.reshape(1, self.sequence_length, self.n_features))[0, 0])
+
+
+def compiled_predictor(model) -> CompiledPredictor:
+    """
+    The CompiledPredictor for `model`, created and traced once per model. It is
+    kept on the model itself, so it is freed together with the model (a cache
+    keyed by the model would keep every model alive through its predictor).
+    """
+    if isinstance(model, CompiledPredictor):
+        return model
+    predictor = getattr(model, '_compiled_predictor', None)
+    if predictor is None:
+        predictor = CompiledPredictor(model)
+        model._compiled_predictor = predictor
+    return predictor
@@ -0,0 +1,179 @@
+"""
+Pure-NumPy inference for the LSTM forecasters (no TensorFlow at serving time).
+
+The serving models are LSTM(64, return_sequences) -> LSTM(32) -> Dense(1) over
+(30, 11) windows (Dropout is a no-op at inference). export_npz writes the
+weights of such a Sequential model to a compact .npz; NumpyLSTMModel loads it
+with NumPy alone and runs the same forward pass as Keras (gate order i, f, c, o,
+sigmoid recurrent activation, tanh activation).
+
+Exports made from a saved .keras file record its sha1 (model_fingerprint), so
+model_registry can tell whether an .npz still matches the .keras next to it
+without trusting file modification times.
+
+NumpyLSTMModel has the predictor interface of lstm_inference.CompiledPredictor
+(`model(batch)` -> (n, 1), `predict_one(window)`), so predict_lstm and lstm_batch
+accept it in place of a Keras model.
+
+Usage:
+    python python/lstm_numpy.py export python/models/lstm_model.keras [python/models/lstm_model.npz]
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+from typing import Dict, List, Optional
+
+import numpy as np
+
+_LSTM_KEYS = ('kernel', 'recurrent_kernel', 'bias')
+
+
+def model_fingerprint(path: str) -> str:
+    """sha1 of a saved model file."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def export_fingerprint(path: str) -> Optional[str]:
+    """Fingerprint of the .keras file an .npz was exported from (None for older exports)."""
+    with np.load(path) as data:
+        return str(data['source_sha1']) if 'source_sha1' in data else None
+
+
+def export_npz(model, path: str, source: Optional[str] = None) -> None:
+    """
+    Write the weights of a Keras LSTM/Dropout/Dense Sequential model to `path`;
+    `source` is the .keras file the model was saved to (its fingerprint is stored).
+    """
+    arrays = {}
+    kinds = []
+    for layer in model.layers:
+        kind = type(layer).__name__
+        config = layer.get_config()
+        if kind == 'Dropout':
+            continue
+        if kind == 'LSTM':
+            if config.get('activation') != 'tanh' or config.get('recurrent_activation') != 'sigmoid':
+                raise ValueError(f"{layer.name}: only tanh / sigmoid LSTMs are supported")
+            if config.get('go_backwards') or config.get('stateful'):
+                raise ValueError(f"{layer.name}: go_backwards / stateful LSTMs are not supported")
+            weights = dict(zip(_LSTM_KEYS, layer.get_weights()))
+            arrays[f"{len(kinds)}/return_sequences"] = np.array(bool(config['return_sequences']))
+        elif kind == 'Dense':
+            if config.get('activation') != 'linear':
+                raise ValueError(f"{layer.name}: only linear Dense layers are supported")
+            weights = dict(zip(('kernel', 'bias'), layer.get_weights()))
+        else:
+            raise ValueError(f"Unsupported layer type: {kind}")
+
+        for key, value in weights.items():
+            arrays[f"{len(kinds)}/{key}"] = value
+        kinds.append(kind)
+
+    if source is not None:
+        arrays['source_sha1'] = np.array(model_fingerprint(source))
+    _, sequence_length, n_features = model.input_shape
+    np.savez(path, layers=np.array(kinds), input_shape=np.array([sequence_length, n_features]), **arrays)
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    # Same function as 1 / (1 + exp(-x)) without overflow for large negative x
+    return 0.5 * (1.0 + np.tanh(0.5 * x))
+
+
+class NumpyLSTMModel:
+    """
+    Forward pass of an exported model.
+
+    Args:
+        path: .npz written by export_npz.
+        dtype: Computation dtype; float32 matches Keras, float64 is slightly more exact.
+    """
+
+    def __init__(self, path: str, dtype=np.float32):
+        self.dtype = np.dtype(dtype)
+        with np.load(path) as data:
+            self.sequence_length, self.n_features = (int(v) for v in data['input_shape'])
+            self.layers: List[Dict[str, object]] = []
+            for index, kind in enumerate(data['layers']):
+                layer = {'kind': str(kind)}
+                for key in (*_LSTM_KEYS, 'return_sequences'):
+                    name = f"{index}/{key}"
+                    if name in data:
+                        value = data[name]
+                        layer[key] = bool(value) if key == 'return_sequences' else value.astype(self.dtype)
+                self.layers.append(layer)
+
+    def __call__(self, inputs: np.ndarray) -> np.ndarray:
+        """Predictions for a batch of shape (n, sequence_length, n_features) -> (n, 1)."""
+        x = np.asarray(inputs, dtype=self.dtype)
+        for layer in self.layers:
+            if layer['kind'] == 'LSTM':
+                x = self._lstm(x, layer)
+            else:
+                x = x @ layer['kernel'] + layer['bias']
+        return x
+
+    def predict_one(self, sequence: np.ndarray) -> float:
+        """Prediction for one (sequence_length, n_features) window."""
+        sequence = np.asarray(sequence, dtype=self.dtype)
+        return float(self(sequence.reshape(1, self.sequence_length, self.n_features))[0, 0])
+
+    def _lstm(self, x: np.ndarray, layer: Dict[str, object]) -> np.ndarray:
+        batch, steps, _ = x.shape
+        recurrent = layer['recurrent_kernel']
+        units = recurrent.shape[0]
+
+        # Input projections of every time step in one matmul
+        projected = x @ layer['kernel'] + layer['bias']
+        h = np.zeros((batch, units), dtype=self.dtype)
+        c = np.zeros((batch, units), dtype=self.dtype)
+        outputs = np.empty((batch, steps, units), dtype=self.dtype) if layer['return_sequences'] else None
+
+        for t in range(steps):
+            z = projected[:, t] + h @ recurrent
+            i = _sigmoid(z[:, :units])
+            f = _sigmoid(z[:, units:2 * units])
+            g = np.tanh(z[:, 2 * units:3 * units])
+            o = _sigmoid(z[:, 3 * units:])
+            c = f * c + i * g
+            h = o * np.tanh(c)
+            if outputs is not None:
+                outputs[:, t] = h
+
+        return outputs if outputs is not None else h
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a Keras LSTM model for NumPy inference")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    export = subparsers.add_parser('export')
+    export.add_argument('model', help=".keras model")
+    export.add_argument('output', nargs='?', help=".npz path (defaults to the model path with .npz)")
+    export.add_argument('--check', type=int, default=256, help="random windows compared against Keras")
+    args = parser.parse_args()
+
+    os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+    from tensorflow.keras.models import load_model
+
+    output = args.output or os.path.splitext(args.model)[0] + '.npz'
+    model = load_model(args.model)
+    export_npz(model, output, source=args.model)
+
+    numpy_model = NumpyLSTMModel(output)
+    inputs = np.random.default_rng(0).random(
+        (args.check, numpy_model.sequence_length, numpy_model.n_features)).astype(np.float32)
+    error = np.max(np.abs(numpy_model(inputs) - model.predict(inputs, verbose=0)))
+    print(f"Exported {args.model} -> {output} ({os.path.getsize(output)} bytes), "
+          f"max abs difference vs Keras on {args.check} windows: {error:.2e}")
+    if error > 1e-4:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
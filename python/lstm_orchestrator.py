@@ -0,0 +1,253 @@
+"""
+Concurrent LSTM training for many symbols with per-job thread limits.
+
+Each symbol is trained by lstm_train.train_enhanced_lstm_model in its own
+freshly spawned worker process (one job per process, so every job starts
+with a clean TensorFlow runtime). Before TensorFlow is imported the worker
+pins its intra-op and inter-op thread pools, so `workers` jobs of `threads`
+threads each share the machine instead of every job grabbing all cores.
+Symbols beyond the worker count wait in the pool's queue.
+
+Every job writes the usual per-symbol artifacts (model_registry names), its
+training output to logs/<SYMBOL>.log next to the models, and one entry of
+training_report.json: status, queue and run time, peak memory and the test
+metrics. With finetune=True the jobs warm-start the saved models through
+lstm_finetune instead of training from scratch.
+
+Example:
+    report = train_symbols(['BTC', 'ETH', 'SOL'], workers=2, threads=2)
+
+    python python/lstm_orchestrator.py BTC ETH --workers 2 --threads 2
+    python python/lstm_orchestrator.py --stream          # every CSV in python/data
+    python python/lstm_orchestrator.py --finetune        # nightly warm-start retrain
+"""
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from model_registry import DATA_DIR, MODELS_DIR, artifact_paths
+
+LOG_DIR = os.path.join(MODELS_DIR, "logs")
+REPORT_PATH = os.path.join(MODELS_DIR, "training_report.json")
+
+
+def data_symbols(data_dir: str = DATA_DIR) -> List[str]:
+    """Symbols with a price CSV in data_dir (BTC.csv -> BTC)."""
+    names = os.listdir(data_dir) if os.path.isdir(data_dir) else []
+    return sorted(os.path.splitext(name)[0].upper() for name in names if name.endswith('.csv'))
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    scale = 2**20 if sys.platform == 'darwin' else 2**10
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1)
+
+
+def pin_threads(intra_threads: int, inter_threads: int):
+    """
+    Limit this (worker) process to the given TensorFlow / OpenMP thread counts.
+    Must run before TensorFlow is first imported; returns the tensorflow module.
+    """
+    # Read by TensorFlow and the BLAS / OpenMP runtimes when they start, so set before importing them
+    os.environ['TF_NUM_INTRAOP_THREADS'] = str(intra_threads)
+    os.environ['TF_NUM_INTEROP_THREADS'] = str(inter_threads)
+    os.environ['OMP_NUM_THREADS'] = str(intra_threads)
+    os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(intra_threads)
+    tf.config.threading.set_inter_op_parallelism_threads(inter_threads)
+    return tf
+
+
+@contextlib.contextmanager
+def _redirect_output(log_path: str, mode: str = 'w'):
+    """Send this process's stdout and stderr, TensorFlow's native logging included, to log_path."""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved = os.dup(1), os.dup(2)
+    with open(log_path, mode) as log:
+        os.dup2(log.fileno(), 1)
+        os.dup2(log.fileno(), 2)
+        try:
+            yield
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(saved[0], 1)
+            os.dup2(saved[1], 2)
+            os.close(saved[0])
+            os.close(saved[1])
+
+
+def _train_job(symbol: str, intra_threads: int, inter_threads: int, options: Dict[str, Any],
+               log_path: str) -> Dict[str, Any]:
+    """Worker: pin the thread pools, then train one symbol with its output in log_path."""
+    started = time.time()
+    with _redirect_output(log_path):
+        try:
+            tf = pin_threads(intra_threads, inter_threads)
+            import numpy as np
+            import lstm_train
+            if options.get('epochs'):
+                lstm_train.HYPERPARAMS['epochs'] = options['epochs']
+            # Same seeds as lstm_train.main
+            np.random.seed(42)
+            tf.random.set_seed(42)
+
+            artifacts = artifact_paths(symbol)
+            finetune = None
+            if options.get('finetune'):
+                import lstm_finetune
+                finetune = lstm_finetune.finetune_model(symbol, epochs=options.get('epochs') or 10)
+            else:
+                lstm_train.train_enhanced_lstm_model(artifacts.data, symbol, lazy=options.get('lazy', False),
+                                                     stream=options.get('stream', False))
+        except BaseException:
+            traceback.print_exc()
+            raise
+
+    metrics = None
+    if finetune is not None:
+        metrics = finetune['holdout']['candidate']
+    elif os.path.exists(artifacts.config):
+        with open(artifacts.config) as f:
+            metrics = json.load(f).get('metrics')
+    return {
+        "started_at": started,
+        "seconds": round(time.time() - started, 2),
+        "max_rss_mb": _peak_rss_mb(),
+        "metrics": metrics,
+        "finetune": finetune
+    }
+
+
+def _pool(workers: int) -> ProcessPoolExecutor:
+    # spawn: TensorFlow must not be forked; one task per child: every job gets its own thread settings
+    context = multiprocessing.get_context('spawn')
+    try:
+        return ProcessPoolExecutor(max_workers=workers, mp_context=context, max_tasks_per_child=1)
+    except TypeError:
+        # Python < 3.11: workers are reused, the thread limits are the same for every job anyway
+        return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+
+def train_symbols(symbols: List[str], workers: Optional[int] = None, threads: Optional[int] = None,
+                  inter_threads: int = 1, lazy: bool = False, stream: bool = False,
+                  epochs: Optional[int] = None, finetune: bool = False, log_dir: str = LOG_DIR,
+                  report_path: Optional[str] = REPORT_PATH) -> Dict[str, Any]:
+    """
+    Train `symbols` concurrently and return (and write) the timing report.
+
+    Args:
+        symbols: Symbols with a CSV in the data directory.
+        workers: Concurrent jobs; defaults to as many as fit `threads` per job on the CPUs.
+        threads: Intra-op threads per job; defaults to an even share of the CPUs.
+        inter_threads: Inter-op threads per job.
+        lazy, stream: Input pipeline of train_enhanced_lstm_model.
+        epochs: Overrides HYPERPARAMS['epochs'] (e.g. for quick runs), or the fine-tuning epochs.
+        finetune: Warm-start the saved models with lstm_finetune.finetune_model instead of
+            training new ones; a candidate that fails the holdout gate is reported as 'rejected'.
+        log_dir: Directory of the per-symbol training logs.
+        report_path: Where the JSON report is written (None: not written).
+    """
+    symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+    if not symbols:
+        raise ValueError("No symbols to train")
+    missing = [symbol for symbol in symbols if not os.path.exists(artifact_paths(symbol).data)]
+    if missing:
+        raise ValueError(f"No price data for: {', '.join(missing)}")
+
+    cpus = os.cpu_count() or 1
+    if workers is None:
+        workers = min(len(symbols), max(1, cpus // threads) if threads else cpus)
+    workers = max(1, min(workers, len(symbols)))
+    threads = threads or max(1, cpus // workers)
+
+    os.makedirs(log_dir, exist_ok=True)
+    options = {'lazy': lazy, 'stream': stream, 'epochs': epochs, 'finetune': finetune}
+    started = time.time()
+    jobs = {}
+    with _pool(workers) as pool:
+        submitted = {}
+        for symbol in symbols:
+            log_path = os.path.join(log_dir, f"{symbol}.log")
+            future = pool.submit(_train_job, symbol, threads, inter_threads, options, log_path)
+            submitted[future] = (symbol, log_path, time.time())
+
+        for future in as_completed(submitted):
+            symbol, log_path, submitted_at = submitted[future]
+            job = {"symbol": symbol, "log": log_path}
+            try:
+                result = future.result()
+            except Exception as e:
+                job.update(status="failed", error=f"{type(e).__name__}: {e}")
+            else:
+                rejected = result["finetune"] is not None and not result["finetune"]["accepted"]
+                job.update(status="rejected" if rejected else "ok",
+                           queue_seconds=round(result.pop("started_at") - submitted_at, 2), **result)
+            jobs[symbol] = job
+            print(f"{symbol}: {job['status']}" + (f" in {job['seconds']:.1f}s" if 'seconds' in job else
+                                                  f" ({job['error']})"), flush=True)
+
+    report = {
+        "started": datetime.fromtimestamp(started).isoformat(timespec='seconds'),
+        "wall_seconds": round(time.time() - started, 2),
+        "cpus": cpus,
+        "workers": workers,
+        "threads_per_job": threads,
+        "inter_threads_per_job": inter_threads,
+        "options": options,
+        "jobs": [jobs[symbol] for symbol in symbols]
+    }
+    if report_path:
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train LSTM models for several symbols concurrently")
+    parser.add_argument('symbols', nargs='*', help="symbols to train (default: every CSV in the data directory)")
+    parser.add_argument('--workers', type=int, default=None, help="concurrent training jobs")
+    parser.add_argument('--threads', type=int, default=None, help="intra-op threads per job")
+    parser.add_argument('--inter-threads', type=int, default=1, help="inter-op threads per job")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--lazy', action='store_true')
+    mode.add_argument('--stream', action='store_true')
+    mode.add_argument('--finetune', action='store_true', help="warm-start the saved models (lstm_finetune)")
+    parser.add_argument('--epochs', type=int, default=None, help="override the training epochs")
+    parser.add_argument('--report', default=REPORT_PATH)
+    args = parser.parse_args()
+
+    report = train_symbols(args.symbols or data_symbols(), args.workers, args.threads, args.inter_threads,
+                           args.lazy, args.stream, args.epochs, args.finetune, report_path=args.report)
+
+    print(f"\n{'Symbol':<8} {'Status':<8} {'Queue s':>8} {'Train s':>8} {'Peak MB':>8} {'MAPE %':>8}")
+    for job in report['jobs']:
+        metrics = job.get('metrics') or {}
+        cells = [job.get('queue_seconds'), job.get('seconds'), job.get('max_rss_mb'), metrics.get('mape')]
+        print(f"{job['symbol']:<8} {job['status']:<8} " +
+              " ".join(f"{value:>8.1f}" if value is not None else f"{'-':>8}" for value in cells))
+    print(f"\n{len(report['jobs'])} jobs on {report['workers']} workers x {report['threads_per_job']} threads "
+          f"in {report['wall_seconds']:.1f}s; report: {args.report}")
+    if any(job['status'] == 'failed' for job in report['jobs']):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
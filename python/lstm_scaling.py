@@ -0,0 +1,160 @@
+"""
+Packed MinMax scaling of the 11 LSTM features: one (scale, offset) vector pair.
+
+FeatureScaler replaces the dict of per-feature sklearn MinMaxScalers. Every
+feature is mapped to [0, 1] with the same arithmetic as
+MinMaxScaler(feature_range=(0, 1)), x * scale + offset, but as a single
+broadcasted operation over the last (feature) axis of any (..., 11) array.
+The scaler is saved as a few lines of JSON (scaler.json) instead of a joblib
+pickle, so serving needs neither sklearn nor unpickling. Legacy scalers.joblib
+dicts still load (that path needs joblib and sklearn) and convert exactly.
+
+Example:
+    scaler = FeatureScaler.fit(feature_data)
+    scaled = scaler.transform(feature_data)          # (n, 11)
+    price = scaler.inverse_column(prediction)        # 'close' column by default
+    scaler.save("python/models/scaler.json")
+    scaler = load_scaler("python/models/scalers.joblib")   # legacy artifact
+
+Usage:
+    python python/lstm_scaling.py convert python/models/scalers.joblib [python/models/scaler.json]
+"""
+
+import argparse
+import json
+import os
+from typing import Any, Dict, Sequence, Union
+
+import numpy as np
+
+from lstm_features import FEATURES
+
+
+class FeatureScaler:
+    """
+    Per-feature MinMax scaling to [0, 1].
+
+    Args:
+        scale: (n_features,) multipliers (MinMaxScaler.scale_).
+        offset: (n_features,) offsets (MinMaxScaler.min_).
+        data_min: (n_features,) minimum seen per feature.
+        data_max: (n_features,) maximum seen per feature.
+        features: Feature names, in column order.
+    """
+
+    def __init__(self, scale: Sequence[float], offset: Sequence[float], data_min: Sequence[float],
+                 data_max: Sequence[float], features: Sequence[str] = FEATURES):
+        self.features = list(features)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.offset = np.asarray(offset, dtype=np.float64)
+        self.data_min = np.asarray(data_min, dtype=np.float64)
+        self.data_max = np.asarray(data_max, dtype=np.float64)
+        shape = (len(self.features),)
+        if any(values.shape != shape for values in (self.scale, self.offset, self.data_min, self.data_max)):
+            raise ValueError(f"scaler vectors must have shape {shape}")
+
+    @classmethod
+    def from_range(cls, data_min: Sequence[float], data_max: Sequence[float],
+                   features: Sequence[str] = FEATURES) -> 'FeatureScaler':
+        """Scaler for the given per-feature range (near-constant features get scale 1, as in sklearn)."""
+        data_min = np.asarray(data_min, dtype=np.float64)
+        data_max = np.asarray(data_max, dtype=np.float64)
+        data_range = data_max - data_min
+        data_range = np.where(data_range < 10 * np.finfo(np.float64).eps, 1.0, data_range)
+        scale = 1.0 / data_range
+        return cls(scale, 0.0 - data_min * scale, data_min, data_max, features)
+
+    @classmethod
+    def fit(cls, data: np.ndarray, features: Sequence[str] = FEATURES) -> 'FeatureScaler':
+        """Fit on (n, n_features) rows (NaN ignored)."""
+        data = np.asarray(data)
+        return cls.from_range(np.nanmin(data, axis=0), np.nanmax(data, axis=0), features)
+
+    def partial_fit(self, data: np.ndarray) -> 'FeatureScaler':
+        """Scaler whose range also covers `data` (for fitting chunk by chunk)."""
+        data = np.asarray(data)
+        if len(data) == 0:
+            return self
+        return self.from_range(np.fmin(self.data_min, np.nanmin(data, axis=0)),
+                               np.fmax(self.data_max, np.nanmax(data, axis=0)), self.features)
+
+    @classmethod
+    def empty(cls, features: Sequence[str] = FEATURES) -> 'FeatureScaler':
+        """Scaler that has seen no data yet, the start of a partial_fit sequence."""
+        nan = np.full(len(features), np.nan)
+        return cls(np.ones(len(features)), np.zeros(len(features)), nan, nan, features)
+
+    @classmethod
+    def from_sklearn(cls, scalers: Dict[str, Any], features: Sequence[str] = FEATURES) -> 'FeatureScaler':
+        """Pack a dict of fitted single-column MinMaxScalers (the legacy scalers.joblib)."""
+        def vector(attribute):
+            return [float(getattr(scalers[name], attribute)[0]) for name in features]
+        return cls(vector('scale_'), vector('min_'), vector('data_min_'), vector('data_max_'), features)
+
+    def transform(self, data: np.ndarray) -> np.ndarray:
+        """Scale (..., n_features) rows; float32 input stays float32."""
+        data = np.asarray(data)
+        dtype = np.result_type(data.dtype, np.float32)
+        return data * self.scale.astype(dtype) + self.offset.astype(dtype)
+
+    def inverse_transform(self, data: np.ndarray) -> np.ndarray:
+        """Unscale (..., n_features) rows (float64)."""
+        return (np.asarray(data, dtype=np.float64) - self.offset) / self.scale
+
+    def inverse_column(self, values: Union[float, np.ndarray], name: str = 'close') -> Union[float, np.ndarray]:
+        """Unscale values of one feature, e.g. model outputs of the scaled close."""
+        index = self.features.index(name)
+        unscaled = (np.asarray(values, dtype=np.float64) - self.offset[index]) / self.scale[index]
+        return float(unscaled) if unscaled.ndim == 0 else unscaled
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "features": self.features,
+            "scale": self.scale.tolist(),
+            "offset": self.offset.tolist(),
+            "data_min": self.data_min.tolist(),
+            "data_max": self.data_max.tolist()
+        }
+
+    def save(self, path: str) -> None:
+        # repr-precision floats, so the vectors load back bit for bit
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> 'FeatureScaler':
+        with open(path) as f:
+            values = json.load(f)
+        return cls(values['scale'], values['offset'], values['data_min'], values['data_max'], values['features'])
+
+
+def as_scaler(scalers: Union[FeatureScaler, Dict[str, Any]]) -> FeatureScaler:
+    """A FeatureScaler as is, or a legacy dict of MinMaxScalers packed into one."""
+    return scalers if isinstance(scalers, FeatureScaler) else FeatureScaler.from_sklearn(scalers)
+
+
+def load_scaler(path: str) -> FeatureScaler:
+    """Load scaler.json, or convert a legacy scalers.joblib (needs joblib and sklearn)."""
+    if path.endswith('.joblib'):
+        import joblib
+        return FeatureScaler.from_sklearn(joblib.load(path))
+    return FeatureScaler.load(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Packed LSTM feature scaler")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    convert = subparsers.add_parser('convert', help="write scalers.joblib as a packed JSON scaler")
+    convert.add_argument('scalers', help="legacy .joblib dict of MinMaxScalers")
+    convert.add_argument('output', nargs='?', help="JSON path (defaults to scaler*.json next to the input)")
+    args = parser.parse_args()
+
+    directory, name = os.path.split(args.scalers)
+    output = args.output or os.path.join(directory, os.path.splitext(name)[0].replace('scalers', 'scaler', 1) + '.json')
+    scaler = load_scaler(args.scalers)
+    scaler.save(output)
+    print(f"Converted {args.scalers} -> {output} ({os.path.getsize(output)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
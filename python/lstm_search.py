@@ -0,0 +1,338 @@
+"""
+Hyperparameter search over HYPERPARAMS and TECH_PARAMS with ASHA pruning.
+
+Trials are random draws from SEARCH_SPACE: the model keys (sequence_length,
+LSTM units, dropout, batch size) and the TECH_PARAMS keys (indicator windows).
+The TECH_PARAMS part comes from a small pool of `feature_sets` draws, so many
+trials share the same features; each distinct feature set is built and scaled
+once through lstm_cache (which also serves lstm_train and later searches), and
+every trial memory-maps it instead of repeating the preprocessing.
+
+Trials run in spawned worker processes with pinned thread pools (as in
+lstm_orchestrator) under an asynchronous successive-halving (ASHA) scheduler:
+every trial first trains for min_epochs; whenever a worker is free, a trial in
+the top 1/eta of a rung (by val_loss at that rung) is promoted and resumed
+from its checkpoint up to the next rung (min_epochs * eta^k ... max_epochs),
+otherwise a new trial starts. Bad configurations therefore stop after a few
+epochs and most of the budget goes to the promising ones. Validation and test
+rows are split as in train_enhanced_lstm_model; the test rows are never used.
+
+Every finished rung is appended to trials.jsonl as it arrives and the summary,
+with the best configuration split into HYPERPARAMS and TECH_PARAMS, is written
+to results.json (both under python/models/search/<SYMBOL>/). A model trained
+with the best TECH_PARAMS records them in its config as 'technical_parameters',
+and prediction, serving and fine-tuning build their features from those.
+
+Example:
+    results = run_search('BTC', n_trials=32, workers=4, max_epochs=27)
+    lstm_train.HYPERPARAMS.update(results['best']['hyperparams'])
+    lstm_train.TECH_PARAMS.update(results['best']['tech_params'])
+    lstm_train.train_enhanced_lstm_model(...)
+
+Usage:
+    python python/lstm_search.py BTC --trials 32 --workers 4 --min-epochs 3 --max-epochs 27 --eta 3
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+import traceback
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from lstm_cache import load_features
+from lstm_features import TECH_DEFAULTS
+from lstm_orchestrator import _pool, _redirect_output, pin_threads
+from model_registry import MODELS_DIR, artifact_paths
+
+SEARCH_DIR = os.path.join(MODELS_DIR, "search")
+
+# Candidate values per key; TECH_PARAMS keys (lstm_features.TECH_DEFAULTS) shape the features,
+# the others override lstm_train.HYPERPARAMS
+SEARCH_SPACE = {
+    'sequence_length': [20, 30, 45, 60],
+    'lstm_units_1': [32, 64, 128],
+    'lstm_units_2': [16, 32, 64],
+    'dropout_rate': [0.1, 0.2, 0.3],
+    'batch_size': [32, 64],
+    'rsi_window': [7, 14, 21],
+    'ema_window': [20, 30, 50],
+    'sma_10_window': [5, 10, 20],
+    'sma_50_window': [50, 100],
+    'bollinger_window': [20, 30],
+    'bollinger_std': [2, 2.5]
+}
+
+
+def split_params(params: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """(HYPERPARAMS overrides, TECH_PARAMS) of a trial configuration."""
+    hyperparams = {key: value for key, value in params.items() if key not in TECH_DEFAULTS}
+    tech = {**TECH_DEFAULTS, **{key: value for key, value in params.items() if key in TECH_DEFAULTS}}
+    return hyperparams, tech
+
+
+def sample_trials(space: Dict[str, List[Any]], n_trials: int, feature_sets: int,
+                  seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    n_trials random configurations whose TECH_PARAMS values come from
+    `feature_sets` shared draws (so their feature arrays can be reused).
+    """
+    rng = random.Random(seed)
+    tech_keys = [key for key in space if key in TECH_DEFAULTS]
+    tech_pool = [{key: rng.choice(space[key]) for key in tech_keys} for _ in range(max(1, feature_sets))]
+    return [{**{key: rng.choice(values) for key, values in space.items() if key not in TECH_DEFAULTS},
+             **rng.choice(tech_pool)} for _ in range(n_trials)]
+
+
+class ASHAScheduler:
+    """
+    Asynchronous successive halving: rung k trains to rungs[k] epochs, and a
+    trial is promoted from rung k once it ranks in the top 1/eta of the trials
+    reported there so far.
+
+    Args:
+        min_epochs: Epochs of the first rung.
+        max_epochs: Epochs of the last rung.
+        eta: Reduction factor between rungs.
+    """
+
+    def __init__(self, min_epochs: int = 3, max_epochs: int = 27, eta: int = 3):
+        if min_epochs < 1 or max_epochs < min_epochs or eta < 2:
+            raise ValueError("need 1 <= min_epochs <= max_epochs and eta >= 2")
+        self.eta = eta
+        self.rungs = []
+        epochs = min_epochs
+        while epochs < max_epochs:
+            self.rungs.append(epochs)
+            epochs *= eta
+        self.rungs.append(max_epochs)
+        self.results: List[Dict[int, float]] = [{} for _ in self.rungs]
+        self._promoted: List[set] = [set() for _ in self.rungs]
+
+    def report(self, trial: int, rung: int, loss: float) -> None:
+        self.results[rung][trial] = loss
+
+    def next_promotion(self) -> Optional[Tuple[int, int]]:
+        """(trial, rung to train it to) of the best promotable trial, highest rung first."""
+        for rung in reversed(range(len(self.rungs) - 1)):
+            scores = self.results[rung]
+            ranked = sorted(scores, key=scores.get)[:len(scores) // self.eta]
+            for trial in ranked:
+                if trial not in self._promoted[rung] and np.isfinite(scores[trial]):
+                    self._promoted[rung].add(trial)
+                    return trial, rung + 1
+        return None
+
+
+def _run_rung(trial: int, params: Dict[str, Any], features_path: str, start_epoch: int, stop_epoch: int,
+              checkpoint: str, threads: int, inter_threads: int, seed: int, log_path: str) -> Dict[str, Any]:
+    """Worker: train trial `trial` from start_epoch (its checkpoint) to stop_epoch."""
+    started = time.time()
+    with _redirect_output(log_path, mode='a'):
+        try:
+            history = _fit_rung(trial, params, features_path, start_epoch, stop_epoch, checkpoint,
+                                threads, inter_threads, seed)
+        except BaseException:
+            traceback.print_exc()
+            raise
+    return {"val_loss": [float(loss) for loss in history.history['val_loss']],
+            "seconds": round(time.time() - started, 2)}
+
+
+def _fit_rung(trial: int, params: Dict[str, Any], features_path: str, start_epoch: int, stop_epoch: int,
+              checkpoint: str, threads: int, inter_threads: int, seed: int):
+    """Fit epochs start_epoch .. stop_epoch - 1 and save the checkpoint; returns the Keras History."""
+    tf = pin_threads(threads, inter_threads)
+    import lstm_train
+    from lstm_sequences import sliding_windows, window_dataset
+
+    print(f"Trial {trial}: epochs {start_epoch} -> {stop_epoch}, {params}")
+    hyperparams, _ = split_params(params)
+    lstm_train.HYPERPARAMS.update(hyperparams)
+    settings = lstm_train.HYPERPARAMS
+    np.random.seed(seed + trial)
+    tf.random.set_seed(seed + trial)
+
+    data = np.load(features_path, mmap_mode='r')
+    X, y = sliding_windows(data, settings['sequence_length'])
+    # Same split as train_enhanced_lstm_model's lazy mode; the test rows stay unused
+    train_size = int(len(X) * (1 - settings['test_split']))
+    fit_size = int(train_size * (1 - settings['validation_split']))
+
+    if start_epoch:
+        model = tf.keras.models.load_model(checkpoint)
+    else:
+        model = lstm_train.build_enhanced_lstm_model((settings['sequence_length'], data.shape[1]))
+    history = model.fit(
+        window_dataset(X, y, settings['batch_size'], np.arange(fit_size), shuffle=True,
+                       seed=seed + trial * 1000 + start_epoch),
+        validation_data=window_dataset(X, y, settings['batch_size'], np.arange(fit_size, train_size)),
+        initial_epoch=start_epoch,
+        epochs=stop_epoch,
+        shuffle=False,
+        verbose=2
+    )
+    model.save(checkpoint)
+    return history
+
+def run_search(symbol: str = 'BTC', n_trials: int = 32, workers: Optional[int] = None,
+               threads: Optional[int] = None, inter_threads: int = 1, min_epochs: int = 3,
+               max_epochs: int = 27, eta: int = 3, feature_sets: Optional[int] = None,
+               space: Optional[Dict[str, List[Any]]] = None, seed: int = 42,
+               search_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run an ASHA search for `symbol` and return (and write) the results.
+
+    Args:
+        symbol: Symbol whose price CSV is searched on.
+        n_trials: Number of sampled configurations.
+        workers: Concurrent trials; defaults to the CPU count.
+        threads: Intra-op threads per trial; defaults to an even share of the CPUs.
+        inter_threads: Inter-op threads per trial.
+        min_epochs, max_epochs, eta: ASHAScheduler rungs.
+        feature_sets: Distinct TECH_PARAMS draws shared by the trials (default n_trials // 8).
+        space: Candidate values per key (default SEARCH_SPACE).
+        seed: Seed of the sampling and the training.
+        search_dir: Output directory (default python/models/search/<SYMBOL>).
+    """
+    symbol = symbol.upper()
+    csv_file = artifact_paths(symbol).data
+    search_dir = search_dir or os.path.join(SEARCH_DIR, symbol)
+    log_dir = os.path.join(search_dir, "logs")
+    os.makedirs(log_dir, exist_ok=True)
+
+    cpus = os.cpu_count() or 1
+    workers = max(1, min(workers or cpus, n_trials))
+    threads = threads or max(1, cpus // workers)
+    scheduler = ASHAScheduler(min_epochs, max_epochs, eta)
+    space = space or SEARCH_SPACE
+    params = sample_trials(space, n_trials, feature_sets or max(1, n_trials // 8), seed)
+
+    # One feature build per distinct TECH_PARAMS, shared by all trials using it
+    features = [load_features(csv_file, split_params(trial_params)[1]).scaled_path for trial_params in params]
+    print(f"{n_trials} trials over {len(set(features))} feature sets, rungs {scheduler.rungs} epochs, "
+          f"{workers} workers x {threads} threads")
+
+    trials = [{"trial": trial, "params": trial_params, "status": "pending", "rung": None, "epochs": 0,
+               "val_loss": [], "seconds": 0.0, "checkpoint": os.path.join(search_dir, f"trial_{trial:03d}.keras")}
+              for trial, trial_params in enumerate(params)]
+    unstarted = deque(range(n_trials))
+    log_file = os.path.join(search_dir, "trials.jsonl")
+    started = time.time()
+
+    with _pool(workers) as pool, open(log_file, 'a') as log:
+        running = {}
+
+        def fill():
+            while len(running) < workers:
+                job = scheduler.next_promotion()
+                if job is None and unstarted:
+                    job = unstarted.popleft(), 0
+                if job is None:
+                    return
+                trial, rung = job
+                record = trials[trial]
+                record["status"] = "running"
+                future = pool.submit(_run_rung, trial, record["params"], features[trial], record["epochs"],
+                                     scheduler.rungs[rung], record["checkpoint"], threads, inter_threads, seed,
+                                     os.path.join(log_dir, f"trial_{trial:03d}.log"))
+                running[future] = trial, rung
+
+        fill()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                trial, rung = running.pop(future)
+                record = trials[trial]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    record.update(status="failed", error=f"{type(e).__name__}: {e}")
+                    loss = float('inf')
+                else:
+                    record["val_loss"].extend(result["val_loss"])
+                    record["seconds"] += result["seconds"]
+                    record.update(status="paused", rung=rung, epochs=scheduler.rungs[rung])
+                    loss = result["val_loss"][-1]
+                scheduler.report(trial, rung, loss)
+                log.write(json.dumps({"trial": trial, "rung": rung, "epochs": scheduler.rungs[rung], "val_loss": loss,
+                                      "status": record["status"], "params": record["params"]}) + "\n")
+                log.flush()
+                print(f"trial {trial:3d} rung {rung} ({scheduler.rungs[rung]:3d} epochs): "
+                      f"val_loss {loss:.6f}", flush=True)
+            fill()
+
+    # Trials that were not promoted were pruned at their last rung
+    for record in trials:
+        if record["status"] == "paused":
+            record["status"] = "completed" if record["rung"] == len(scheduler.rungs) - 1 else "pruned"
+    # A failed promotion keeps the rung and val_loss of its last good run, but its checkpoint
+    # may be half-trained: never report it as the best
+    finished = [record for record in trials if record["rung"] is not None and record["status"] != "failed"]
+    best = min(finished, key=lambda record: (-record["rung"], record["val_loss"][-1]), default=None)
+    results = {
+        "symbol": symbol,
+        "finished": datetime.now().isoformat(timespec='seconds'),
+        "wall_seconds": round(time.time() - started, 2),
+        "rungs": scheduler.rungs,
+        "eta": eta,
+        "workers": workers,
+        "threads_per_trial": threads,
+        "feature_sets": len(set(features)),
+        "epochs_trained": sum(record["epochs"] for record in trials),
+        "space": space,
+        "trials": trials,
+        "best": None if best is None else {
+            "trial": best["trial"],
+            "val_loss": best["val_loss"][-1],
+            "epochs": best["epochs"],
+            "hyperparams": split_params(best["params"])[0],
+            "tech_params": split_params(best["params"])[1],
+            "checkpoint": best["checkpoint"]
+        }
+    }
+    with open(os.path.join(search_dir, "results.json"), 'w') as f:
+        json.dump(results, f, indent=2)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ASHA hyperparameter search for the LSTM")
+    parser.add_argument('symbol', nargs='?', default='BTC')
+    parser.add_argument('--trials', type=int, default=32)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--threads', type=int, default=None, help="intra-op threads per trial")
+    parser.add_argument('--inter-threads', type=int, default=1)
+    parser.add_argument('--min-epochs', type=int, default=3)
+    parser.add_argument('--max-epochs', type=int, default=27)
+    parser.add_argument('--eta', type=int, default=3)
+    parser.add_argument('--feature-sets', type=int, default=None, help="distinct TECH_PARAMS draws")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    results = run_search(args.symbol, args.trials, args.workers, args.threads, args.inter_threads,
+                         args.min_epochs, args.max_epochs, args.eta, args.feature_sets, seed=args.seed)
+
+    ranked = sorted((record for record in results['trials']
+                     if record['rung'] is not None and record['status'] != 'failed'),
+                    key=lambda record: (-record['rung'], record['val_loss'][-1]))
+    print(f"\n{'Trial':>5} {'Status':<10} {'Epochs':>6} {'val_loss':>10}  Params")
+    for record in ranked[:10]:
+        print(f"{record['trial']:>5} {record['status']:<10} {record['epochs']:>6} "
+              f"{record['val_loss'][-1]:>10.6f}  {record['params']}")
+    full_budget = len(results['trials']) * results['rungs'][-1]
+    print(f"\n{results['epochs_trained']} epochs trained (no pruning: {full_budget}) "
+          f"in {results['wall_seconds']:.1f}s")
+    if results['best']:
+        print(f"Best HYPERPARAMS overrides: {results['best']['hyperparams']}")
+        print(f"Best TECH_PARAMS: {results['best']['tech_params']}")
+
+
+if __name__ == "__main__":
+    main()
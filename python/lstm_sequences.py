@@ -0,0 +1,80 @@
+"""
+Zero-copy sliding windows for LSTM training.
+
+sliding_windows returns X as a strided view of the (T, n_features) data, so
+the (T - L, L, n_features) windows cost no memory beyond the data itself.
+Batches are materialized only when consumed:
+
+    X, y = sliding_windows(scaled_data, 30)            # views, no copy
+    for xb, yb in batch_generator(X, y, 32, shuffle=True):
+        ...
+    dataset = window_dataset(X, y, 32, indices=train_idx, shuffle=True)   # tf.data for model.fit
+
+Only one batch of windows (batch_size x L x n_features) exists at a time, so
+training memory scales with the raw data instead of L times it.
+"""
+
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def sliding_windows(data: np.ndarray, sequence_length: int,
+                    target_column: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Read-only views X[i] = data[i:i + L] and y[i] = data[i + L, target_column]
+    (same windows and order as the loop in lstm_train.create_sequences).
+    """
+    data = np.asarray(data)
+    if data.ndim != 2:
+        raise ValueError("data must have shape (time_steps, n_features)")
+    if len(data) <= sequence_length:
+        empty = np.empty((0, sequence_length, data.shape[1]), dtype=data.dtype)
+        return empty, np.empty(0, dtype=data.dtype)
+
+    # (T - L, n_features, L) -> (T - L, L, n_features), still a view
+    X = sliding_window_view(data[:-1], sequence_length, axis=0).transpose(0, 2, 1)
+    y = data[sequence_length:, target_column]
+    return X, y
+
+
+def batch_generator(X: np.ndarray, y: np.ndarray, batch_size: int,
+                    indices: Optional[np.ndarray] = None, shuffle: bool = False,
+                    seed: Optional[int] = None, dtype=np.float32) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Yield (X_batch, y_batch) copies of the windows at `indices` (all by default),
+    shuffled on every pass when shuffle=True.
+    """
+    indices = np.arange(len(X)) if indices is None else np.asarray(indices)
+    if shuffle:
+        indices = np.random.default_rng(seed).permutation(indices)
+    for start in range(0, len(indices), batch_size):
+        batch = indices[start:start + batch_size]
+        yield X[batch].astype(dtype), y[batch].astype(dtype)
+
+
+def window_dataset(X: np.ndarray, y: np.ndarray, batch_size: int,
+                   indices: Optional[np.ndarray] = None, shuffle: bool = False,
+                   seed: Optional[int] = None):
+    """
+    tf.data.Dataset of float32 batches from batch_generator; a new permutation is
+    drawn on every epoch when shuffle=True.
+    """
+    import tensorflow as tf
+
+    _, sequence_length, n_features = X.shape
+    n_batches = -(-(len(X) if indices is None else len(indices)) // batch_size)
+    rng = np.random.default_rng(seed)
+
+    def generate():
+        epoch_seed = int(rng.integers(2**31)) if shuffle else None
+        return batch_generator(X, y, batch_size, indices, shuffle, epoch_seed)
+
+    return tf.data.Dataset.from_generator(
+        generate,
+        output_signature=(
+            tf.TensorSpec((None, sequence_length, n_features), tf.float32),
+            tf.TensorSpec((None,), tf.float32)
+        )
+    ).apply(tf.data.experimental.assert_cardinality(n_batches)).prefetch(tf.data.AUTOTUNE)
@@ -0,0 +1,267 @@
+"""
+Resident LSTM forecast server.
+
+Loads models once through model_registry (BTC and ETH at startup, any other
+trained symbol on its first request, least recently used ones dropped over the
+memory budget), runs one warm-up forecast per preloaded model (so TensorFlow
+builds its predict graph before the first real request), then answers
+JSON-lines requests on stdin or a Unix socket:
+
+    python python/lstm_server.py --serve                  # stdin / stdout
+    python python/lstm_server.py --socket /tmp/lstm.sock  # one thread per connection
+
+Request:  {"id": 1, "symbol": "BTC", "steps": 7}
+          {"id": 2, "symbol": "ETH", "closes": [...], "dates": [...]}   # own history
+          {"id": 3, "op": "scenarios", "symbol": "BTC", "steps": 30, "n_scenarios": 500}
+          {"id": 4, "op": "status"} | {"id": 5, "op": "reload", "symbol": "BTC"}
+Response: {"id": 1, "result": {"symbol": "BTC", "next_day": ..., "multi_step": [...]}}
+          {"id": 3, "result": {"symbol": "BTC", "percentiles": {"5": [...], ..., "95": [...]}}}
+          {"id": 1, "error": "..."}
+
+Without "closes" the forecast uses the symbol's history from the market_data
+store, re-read only when the CSV changes or candles are appended. Paths are relative to the repository root, like predict_lstm.py.
+"""
+
+import os
+os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+
+import argparse
+import json
+import socketserver
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+import lstm_batch
+import predict_lstm
+from lstm_features import max_window
+from market_data import open_store
+from model_registry import LoadedModel, ModelRegistry
+
+MAX_STEPS = 365
+MAX_SCENARIOS = 10000
+
+
+def _min_history(entry: LoadedModel) -> int:
+    """Closes needed for one input window: the model's window length plus its longest rolling window."""
+    return predict_lstm.sequence_length(entry.model) + max_window(entry.technical_parameters) - 1
+
+
+class Forecaster:
+    """Forecasts of one symbol: the model comes from the registry, the price history is cached here."""
+
+    def __init__(self, symbol: str, registry: ModelRegistry):
+        self.symbol = symbol
+        self.registry = registry
+        self.data_path = registry.artifacts(symbol).data
+        self._history = None
+        self._history_version = None
+        # Keras models are not guaranteed to be safe for concurrent predict calls
+        self._lock = threading.Lock()
+
+    def history(self) -> pd.DataFrame:
+        """The symbol's price history, re-read when its store changes (CSV rewrite or appended candles)."""
+        version = open_store(self.data_path).version
+        if self._history is None or version != self._history_version:
+            self._history = predict_lstm.load_data(self.data_path)
+            self._history_version = version
+        return self._history
+
+    def warm_up(self) -> float:
+        """Run one forecast so the first request does not pay for graph construction."""
+        start = time.perf_counter()
+        self.forecast(steps=1)
+        return time.perf_counter() - start
+
+    def forecast(self, closes: Optional[List[float]] = None, dates: Optional[List[str]] = None,
+                 steps: int = predict_lstm.FORECAST_STEPS) -> Dict[str, Any]:
+        if not 1 <= steps <= MAX_STEPS:
+            raise ValueError(f"steps must be between 1 and {MAX_STEPS}")
+        with self._lock:
+            entry = self.registry.get(self.symbol)
+            df = self.history() if closes is None else _frame(closes, dates, _min_history(entry))
+            next_day, multi_step = predict_lstm.predict(entry.model, entry.scalers, df, steps=steps,
+                                                        params=entry.technical_parameters)
+
+        return {
+            "symbol": self.symbol,
+            "next_day": float(next_day),
+            "multi_step": multi_step
+        }
+
+    def scenarios(self, closes: Optional[List[float]] = None, dates: Optional[List[str]] = None,
+                  steps: int = predict_lstm.FORECAST_STEPS, n_scenarios: int = 100,
+                  volatility: Optional[float] = None, seed: Optional[int] = None) -> Dict[str, Any]:
+        """Fan chart percentiles from n_scenarios perturbed rollouts (one batched pass per step)."""
+        if not 1 <= steps <= MAX_STEPS:
+            raise ValueError(f"steps must be between 1 and {MAX_STEPS}")
+        if not 1 <= n_scenarios <= MAX_SCENARIOS:
+            raise ValueError(f"n_scenarios must be between 1 and {MAX_SCENARIOS}")
+        with self._lock:
+            entry = self.registry.get(self.symbol)
+            df = self.history() if closes is None else _frame(closes, dates, _min_history(entry))
+            fan = lstm_batch.forecast_scenarios(entry.model, entry.scalers, df, n_scenarios, steps,
+                                                volatility=volatility, seed=seed,
+                                                params=entry.technical_parameters)
+
+        return {
+            "symbol": self.symbol,
+            "percentiles": {str(p): values.tolist() for p, values in fan["percentiles"].items()}
+        }
+
+
+def _frame(closes: List[float], dates: Optional[List[str]], min_history: int) -> pd.DataFrame:
+    """Caller-supplied history as the (date, close) frame predict_lstm expects."""
+    if len(closes) < min_history:
+        raise ValueError(f"Need at least {min_history} closes, got {len(closes)}")
+    if dates is None:
+        # Only the last date matters (it seeds the forecast dates); assume daily candles up to today
+        dates = pd.date_range(end=pd.Timestamp.today().normalize(), periods=len(closes), freq='D')
+    elif len(dates) != len(closes):
+        raise ValueError("dates and closes must have the same length")
+    return pd.DataFrame({'date': pd.to_datetime(dates), 'close': pd.to_numeric(closes, errors='raise')})
+
+
+class ForecastServer:
+    """Forecasters by symbol (created on first request) plus the request dispatcher."""
+
+    def __init__(self, registry: Optional[ModelRegistry] = None, preload: Optional[List[str]] = None,
+                 warm_up: bool = True):
+        self.registry = registry or ModelRegistry()
+        self.forecasters = {}
+        self._lock = threading.Lock()
+        for symbol in preload or []:
+            self.load(symbol, warm_up)
+
+    def forecaster(self, symbol: str) -> Forecaster:
+        symbol = symbol.upper()
+        with self._lock:
+            forecaster = self.forecasters.get(symbol)
+            if forecaster is None:
+                if symbol not in self.registry.symbols():
+                    raise ValueError(f"Unknown symbol: {symbol}. Available: {', '.join(self.registry.symbols())}")
+                forecaster = self.forecasters[symbol] = Forecaster(symbol, self.registry)
+            return forecaster
+
+    def load(self, symbol: str, warm_up: bool = True) -> Dict[str, Any]:
+        """(Re)load the model of `symbol` and optionally warm it up."""
+        forecaster = self.forecaster(symbol)
+        self.registry.evict(forecaster.symbol)
+        start = time.perf_counter()
+        self.registry.get(forecaster.symbol)
+        status = {"symbol": forecaster.symbol, "load_seconds": round(time.perf_counter() - start, 3)}
+        if warm_up:
+            status["warm_up_seconds"] = round(forecaster.warm_up(), 3)
+        return status
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        request_id = request.get('id')
+        try:
+            op = request.get('op', 'forecast')
+
+            if op == 'status':
+                return {"id": request_id, "result": {"symbols": self.registry.symbols(), **self.registry.stats()}}
+
+            symbol = str(request.get('symbol', 'BTC')).upper()
+
+            if op == 'reload':
+                return {"id": request_id, "result": self.load(symbol)}
+
+            if op not in ('forecast', 'scenarios'):
+                return {"id": request_id, "error": f"Unknown op: {op}"}
+
+            forecaster = self.forecaster(symbol)
+
+            closes, dates = request.get('closes'), request.get('dates')
+            steps = int(request.get('steps', predict_lstm.FORECAST_STEPS))
+            if op == 'scenarios':
+                result = forecaster.scenarios(closes, dates, steps, int(request.get('n_scenarios', 100)),
+                                              request.get('volatility'), request.get('seed'))
+            else:
+                result = forecaster.forecast(closes, dates, steps)
+            return {"id": request_id, "result": result}
+        except Exception as e:
+            return {"id": request_id, "error": str(e)}
+
+    def serve_lines(self, reader, writer) -> None:
+        """One JSON request per line in, one JSON response per line out (matched by id)."""
+        for line in reader:
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                response = {"id": None, "error": f"Invalid JSON: {e}"}
+            else:
+                response = self.handle_request(request) if isinstance(request, dict) else \
+                    {"id": None, "error": "Request must be a JSON object"}
+
+            writer.write(json.dumps(response) + "\n")
+            writer.flush()
+
+    def serve_socket(self, socket_path: str) -> None:
+        server = self
+
+        class ForecastRequestHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                reader = (line.decode('utf-8') for line in self.rfile)
+                server.serve_lines(reader, _SocketWriter(self.wfile))
+
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+        with socketserver.ThreadingUnixStreamServer(socket_path, ForecastRequestHandler) as unix_server:
+            unix_server.daemon_threads = True
+            try:
+                unix_server.serve_forever()
+            finally:
+                os.unlink(socket_path)
+
+
+class _SocketWriter:
+    """Wraps wfile (bytes) so serve_lines can write str."""
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, text: str) -> None:
+        self.wfile.write(text.encode('utf-8'))
+
+    def flush(self) -> None:
+        self.wfile.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resident LSTM forecast server")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--serve', action='store_true', help="JSON lines on stdin/stdout")
+    mode.add_argument('--socket', metavar='PATH', help="JSON lines on a Unix socket")
+    parser.add_argument('--symbols', nargs='*', default=['BTC', 'ETH'],
+                        help="models loaded and warmed at startup (others load on first request)")
+    parser.add_argument('--max-mb', type=float, default=256, help="memory budget for loaded model weights")
+    parser.add_argument('--max-models', type=int, default=None)
+    parser.add_argument('--numpy', action='store_true', help="serve the .npz exports without TensorFlow")
+    parser.add_argument('--no-warm-up', action='store_true')
+    args = parser.parse_args()
+
+    registry = ModelRegistry(max_bytes=int(args.max_mb * 2**20), max_models=args.max_models,
+                             prefer_numpy=args.numpy)
+    preload = [symbol.upper() for symbol in args.symbols if symbol.upper() in registry.symbols()]
+    server = ForecastServer(registry, preload, warm_up=not args.no_warm_up)
+    # Ready line goes to stderr so stdout only carries responses
+    print(f"LSTM server ready: {', '.join(registry.symbols())} (loaded: {', '.join(preload) or 'none'})",
+          file=sys.stderr, flush=True)
+
+    if args.socket:
+        server.serve_socket(args.socket)
+    else:
+        server.serve_lines(sys.stdin, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
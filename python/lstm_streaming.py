@@ -0,0 +1,186 @@
+"""
+Out-of-core training input for the LSTM: chunked reading, carried feature
+state, streamed scaling and windows generated on the fly.
+
+StreamingWindows reads a CSV in chunks sliced from its memory-mapped
+market_data store (or a chronologically sorted Parquet file, with pyarrow)
+and computes the 11 features per chunk with lstm_features.feature_matrix (float32,
+as in-memory training). The last max_window(params) closes and the EMA are carried
+across chunks, so every row matches a whole-history computation. One pass fits
+the packed MinMax scaler (lstm_scaling.FeatureScaler.partial_fit) and counts the rows. Later passes scale each chunk
+with those statistics and yield windows. Memory is bounded by the chunk size,
+not the history length.
+
+    windows = StreamingWindows("python/data/BTC.csv", sequence_length=30, chunksize=100_000)
+    train = windows.dataset(32, 0, split, shuffle=True, seed=42)      # tf.data, prefetched
+    test_targets = windows.targets(split, windows.n_windows)
+
+Window j covers feature rows j .. j + L - 1 and targets the close of row j + L,
+the same indexing as lstm_sequences.sliding_windows on the full scaled array.
+"""
+
+import os
+from datetime import timedelta
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from lstm_features import FEATURES, ema_series, feature_matrix, max_window, technical_parameters
+from lstm_scaling import FeatureScaler
+from lstm_sequences import sliding_windows
+from market_data import open_store
+
+# Windows copied per generator step (one block of batch-size-independent work)
+_BLOCK = 1024
+
+
+def read_chunks(path: str, chunksize: int, columns=('date', 'close')) -> Iterator[pd.DataFrame]:
+    """
+    DataFrame chunks of a CSV (sliced from its memory-mapped market_data store)
+    or Parquet file (Parquet needs pyarrow).
+    """
+    if path.endswith('.csv'):
+        data = open_store(path)
+        for start in range(0, len(data), chunksize):
+            yield pd.DataFrame({name: np.array(data.columns[name][start:start + chunksize]) for name in columns})
+    elif path.endswith('.parquet'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Reading Parquet needs pyarrow (pip install pyarrow)") from e
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=list(columns)):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=list(columns), chunksize=chunksize)
+
+
+def _chunk_features(closes: np.ndarray, tail: np.ndarray, ema: Optional[float],
+                    params: Optional[Dict[str, float]] = None) -> Tuple[np.ndarray, float]:
+    """
+    Feature rows of `closes` given the preceding `tail` closes and the EMA at the
+    last of them (None at the start of the series). Rows with NaN are dropped,
+    like engineer_features. Returns (rows, ema at the last close).
+    """
+    tech = technical_parameters(params)
+    ema_values = ema_series(closes, ema, window=tech['ema_window'])
+    rows, _ = feature_matrix(np.concatenate([tail, closes]), ema_values, history=len(tail), params=tech)
+    return rows, float(ema_values[-1]) if len(ema_values) else ema
+
+
+class StreamingWindows:
+    """
+    Streamed, scaled training windows of one price file.
+
+    Args:
+        path: CSV / Parquet with 'date' and 'close', sorted by date.
+        sequence_length: Window length L.
+        chunksize: Rows read per chunk.
+        years: Keep only the last `years` years (like load_and_prepare_data); needs
+            one extra pass over the date column.
+        scaler: Fitted FeatureScaler; fitted from the data when omitted.
+        params: TECH_PARAMS of the features (lstm_features.TECH_DEFAULTS by default).
+    """
+
+    def __init__(self, path: str, sequence_length: int = 30, chunksize: int = 100_000,
+                 years: Optional[float] = None, scaler: Optional[FeatureScaler] = None,
+                 params: Optional[Dict[str, float]] = None):
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        self.path = path
+        self.params = technical_parameters(params)
+        self.sequence_length = sequence_length
+        self.chunksize = chunksize
+        self.start_date = None
+        if years is not None:
+            end_date = max(pd.to_datetime(chunk['date']).max() for chunk in read_chunks(path, chunksize, ('date',)))
+            self.start_date = end_date - timedelta(days=years * 365)
+
+        fit = scaler is None
+        self.scaler = FeatureScaler.empty() if fit else scaler
+        self.n_rows = 0
+        tail = np.empty((0, len(FEATURES)), dtype=np.float32)
+        for rows in self.feature_chunks():
+            if fit:
+                self.scaler = self.scaler.partial_fit(rows)
+            self.n_rows += len(rows)
+            tail = np.concatenate([tail, rows])[-sequence_length:]
+
+        # Last L scaled rows: the input window for forecasting after training
+        self.tail = self.scaler.transform(tail)
+
+    @property
+    def n_windows(self) -> int:
+        return max(0, self.n_rows - self.sequence_length)
+
+    def feature_chunks(self) -> Iterator[np.ndarray]:
+        """Unscaled (rows, 11) feature blocks in file order."""
+        closes_tail = np.empty(0)
+        ema = None
+        last_date = None
+        for chunk in read_chunks(self.path, self.chunksize):
+            dates = pd.to_datetime(chunk['date'])
+            if (last_date is not None and len(dates) and dates.iloc[0] < last_date) or \
+                    not dates.is_monotonic_increasing:
+                raise ValueError(f"{self.path} must be sorted by date for streaming")
+            if len(dates):
+                last_date = dates.iloc[-1]
+            if self.start_date is not None:
+                chunk = chunk[(dates >= self.start_date).to_numpy()]
+
+            closes = chunk['close'].to_numpy(dtype=np.float64)
+            if len(closes) == 0:
+                continue
+            rows, ema = _chunk_features(closes, closes_tail, ema, self.params)
+            closes_tail = np.concatenate([closes_tail, closes])[-max_window(self.params):]
+            if len(rows):
+                yield rows
+
+    def scaled_chunks(self) -> Iterator[np.ndarray]:
+        for rows in self.feature_chunks():
+            yield self.scaler.transform(rows)
+
+    def windows(self, start: int = 0, stop: Optional[int] = None,
+                dtype=np.float32) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """(X_block, y_block) copies of windows start .. stop - 1, in order."""
+        stop = self.n_windows if stop is None else min(stop, self.n_windows)
+        carry = np.empty((0, len(FEATURES)))
+        first = 0  # global index of the first window of carry + chunk
+        for rows in self.scaled_chunks():
+            data = np.concatenate([carry, rows])
+            X, y = sliding_windows(data, self.sequence_length, FEATURES.index('close'))
+            lo, hi = max(start - first, 0), min(stop - first, len(X))
+            for block in range(lo, hi, _BLOCK):
+                end = min(block + _BLOCK, hi)
+                yield X[block:end].astype(dtype), y[block:end].astype(dtype)
+            first += len(X)
+            if first >= stop:
+                return
+            carry = data[-self.sequence_length:]
+
+    def targets(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Scaled targets of windows start .. stop - 1 (float64)."""
+        return np.concatenate([y for _, y in self.windows(start, stop, np.float64)] or [np.empty(0)])
+
+    def dataset(self, batch_size: int, start: int = 0, stop: Optional[int] = None,
+                shuffle: bool = False, seed: Optional[int] = None, shuffle_buffer: int = 10_000):
+        """
+        Prefetched tf.data.Dataset of float32 (X, y) batches of windows start .. stop - 1.
+        shuffle=True mixes windows through a buffer of shuffle_buffer windows.
+        """
+        import tensorflow as tf
+
+        stop = self.n_windows if stop is None else min(stop, self.n_windows)
+        count = max(0, stop - start)
+        dataset = tf.data.Dataset.from_generator(
+            lambda: self.windows(start, stop),
+            output_signature=(
+                tf.TensorSpec((None, self.sequence_length, len(FEATURES)), tf.float32),
+                tf.TensorSpec((None,), tf.float32)
+            )
+        ).unbatch()
+        if shuffle:
+            dataset = dataset.shuffle(shuffle_buffer, seed=seed, reshuffle_each_iteration=True)
+        return dataset.batch(batch_size) \
+            .apply(tf.data.experimental.assert_cardinality(-(-count // batch_size))) \
+            .prefetch(tf.data.AUTOTUNE)
@@ -1,6 +1,5 @@
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import MinMaxScaler
 import matplotlib.pyplot as plt
 import seaborn as sns
 import tensorflow as tf
@@ -8,12 +7,22 @@ from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense, Dropout
 from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau
 from tensorflow.keras.losses import Huber
-from datetime import datetime, timedelta
-import joblib
 import warnings
 import json
 import os
-from typing import Tuple, List, Dict, Any
+import sys
+from functools import partial
+from typing import Tuple, List, Dict, Any, Optional
+
+from lstm_cache import load_features
+from lstm_inference import compiled_predictor
+from lstm_numpy import export_npz
+from lstm_features import FEATURES, TECH_DEFAULTS, feature_matrix
+from lstm_scaling import FeatureScaler
+from lstm_sequences import sliding_windows, window_dataset
+from lstm_streaming import StreamingWindows
+from market_data import open_store
+from model_registry import PLOTS_DIR, artifact_paths, asset_name
 
 warnings.filterwarnings('ignore')
 
@@ -35,87 +44,13 @@ HYPERPARAMS = {
     'min_learning_rate': 1e-7
 }
 
-# Technical indicator calculation parameters
-TECH_PARAMS = {
-    'rsi_window': 14,
-    'ema_window': 30,
-    'sma_10_window': 10,
-    'sma_50_window': 50,
-    'bollinger_window': 20,
-    'bollinger_std': 2
-}
-
-
-def calculate_rsi(prices: pd.Series, window: int = 14) -> pd.Series:
-    """
-    Calculate Relative Strength Index momentum oscillator.
-    
-    Args:
-        prices: Price series
-        window: Period for RSI calculation
-        
-    Returns:
-        RSI values as pandas Series
-    """
-    delta = prices.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
-
-
-def calculate_ema(prices: pd.Series, window: int = 30) -> pd.Series:
-    """
-    Calculate Exponential Moving Average with exponentially decreasing weights.
-    
-    Args:
-        prices: Price series
-        window: Period for EMA calculation
-        
-    Returns:
-        EMA values as pandas Series
-    """
-    return prices.ewm(span=window, adjust=False).mean()
-
-
-def calculate_sma(prices: pd.Series, window: int) -> pd.Series:
-    """
-    Calculate Simple Moving Average as arithmetic mean.
-    
-    Args:
-        prices: Price series
-        window: Period for SMA calculation
-        
-    Returns:
-        SMA values as pandas Series
-    """
-    return prices.rolling(window=window).mean()
-
-
-def calculate_bollinger_bands(prices: pd.Series, window: int = 20, 
-                            num_std: int = 2) -> Tuple[pd.Series, pd.Series]:
-    """
-    Calculate Bollinger Bands volatility indicator.
-    
-    Args:
-        prices: Price series
-        window: Period for moving average calculation
-        num_std: Number of standard deviations for band width
-        
-    Returns:
-        Tuple of (upper_band, lower_band)
-    """
-    sma = prices.rolling(window=window).mean()
-    std = prices.rolling(window=window).std()
-    upper_band = sma + (std * num_std)
-    lower_band = sma - (std * num_std)
-    return upper_band, lower_band
+# Technical indicator calculation parameters (defined in lstm_features, shared with serving)
+TECH_PARAMS = dict(TECH_DEFAULTS)
 
 
 def load_and_prepare_data(csv_file: str) -> pd.DataFrame:
     """
-    Load Bitcoin price data and filter to recent years for model training.
+    Load price data and filter to recent years for model training.
     
     Args:
         csv_file: Path to CSV file containing OHLCV data
@@ -126,25 +61,17 @@ def load_and_prepare_data(csv_file: str) -> pd.DataFrame:
     Raises:
         Exception: If data validation fails or insufficient records
     """
-    # Load Bitcoin price data
-    df = pd.read_csv(csv_file)
+    # Load price data from the columnar store (parsed and sorted by date once per CSV version)
+    data = open_store(csv_file)
     
     # Check for required price columns
     required_columns = ['date', 'close']
-    missing_columns = [col for col in required_columns if col not in df.columns]
+    missing_columns = [col for col in required_columns if col not in data.columns]
     if missing_columns:
         raise ValueError(f"Missing required columns: {missing_columns}")
     
-    # Parse date column for time series analysis
-    df['date'] = pd.to_datetime(df['date'])
-    
-    # Sort chronologically for time series modeling
-    df = df.sort_values('date').reset_index(drop=True)
-    
     # Use last 10 years of data for training
-    end_date = df['date'].max()
-    start_date = end_date - timedelta(days=10*365)
-    df = df[df['date'] >= start_date].reset_index(drop=True)
+    df = data.frame(years=10)
     
     # Ensure sufficient data points for LSTM training
     if len(df) < 100:
@@ -156,80 +83,52 @@ def load_and_prepare_data(csv_file: str) -> pd.DataFrame:
     return df
 
 
-def engineer_features(df: pd.DataFrame) -> Tuple[np.ndarray, List[str]]:
+def engineer_features(df: pd.DataFrame, params: Optional[Dict[str, Any]] = None) -> Tuple[np.ndarray, List[str]]:
     """
     Calculate technical indicators and derived features for LSTM model.
     
+    All 11 features are built in one pass by lstm_features.feature_matrix, the
+    same definition serving uses. Rows with NaN values from the rolling
+    windows are left out.
+    
     Args:
         df: Input DataFrame with OHLCV price data
+        params: TECH_PARAMS overrides (lstm_features.TECH_DEFAULTS by default)
         
     Returns:
-        Tuple of (feature_array, feature_names)
+        Tuple of (float32 feature_array, feature_names)
     """
-    # Calculate momentum and trend indicators
-    df['rsi_14'] = calculate_rsi(df['close'], window=TECH_PARAMS['rsi_window'])
-    df['ema_30'] = calculate_ema(df['close'], window=TECH_PARAMS['ema_window'])
-    df['sma_10'] = calculate_sma(df['close'], window=TECH_PARAMS['sma_10_window'])
-    df['sma_50'] = calculate_sma(df['close'], window=TECH_PARAMS['sma_50_window'])
-    
-    # Calculate volatility indicators
-    bb_upper, bb_lower = calculate_bollinger_bands(
-        df['close'], 
-        window=TECH_PARAMS['bollinger_window'],
-        num_std=TECH_PARAMS['bollinger_std']
-    )
-    df['bb_upper'] = bb_upper
-    df['bb_lower'] = bb_lower
-    
-    # Create derived features for better price pattern recognition
-    df['bb_width'] = df['bb_upper'] - df['bb_lower']  # Market volatility measure
-    df['bb_position'] = (df['close'] - df['bb_lower']) / df['bb_width']  # Price position in bands
-    df['price_sma10_ratio'] = df['close'] / df['sma_10']  # Short-term trend strength
-    df['price_sma50_ratio'] = df['close'] / df['sma_50']  # Long-term trend strength
-    
-    # Select feature set for model training
-    features = [
-        'close', 'rsi_14', 'ema_30', 'sma_10', 'sma_50',
-        'bb_upper', 'bb_lower', 'bb_width', 'bb_position',
-        'price_sma10_ratio', 'price_sma50_ratio'
-    ]
-    
-    # Remove rows with NaN values from rolling calculations
-    df_features = df[features].dropna().reset_index(drop=True)
+    feature_data, _ = feature_matrix(df['close'].to_numpy(dtype=np.float64), params=params)
+    features = list(FEATURES)
     
     # Verify sufficient feature data for model training
-    if len(df_features) < 100:
-        raise Exception(f"Insufficient feature data: only {len(df_features)} records "
+    if len(feature_data) < 100:
+        raise Exception(f"Insufficient feature data: only {len(feature_data)} records "
                        f"after feature engineering. Need at least 100 records.")
     
-    print(f"Features engineered: {df_features.shape}")
+    print(f"Features engineered: {feature_data.shape}")
     print(f"Features: {features}")
     
-    return df_features.values, features
+    return feature_data, features
 
 
-def normalize_features(data: np.ndarray, feature_names: List[str]) -> Tuple[np.ndarray, Dict[str, MinMaxScaler]]:
+def normalize_features(data: np.ndarray, feature_names: List[str]) -> Tuple[np.ndarray, FeatureScaler]:
     """
-    Apply individual normalization to each feature for optimal LSTM training.
+    Apply individual MinMax normalization to each feature for optimal LSTM training.
     
     Args:
         data: Raw feature array
         feature_names: List of feature names
         
     Returns:
-        Tuple of (scaled_data, scalers_dict)
+        Tuple of (scaled_data, packed FeatureScaler of all features)
     """
-    scalers = {}
-    scaled_data = np.zeros_like(data)
-    
-    for i, feature_name in enumerate(feature_names):
-        scaler = MinMaxScaler(feature_range=(0, 1))
-        scaled_data[:, i] = scaler.fit_transform(data[:, i].reshape(-1, 1)).flatten()
-        scalers[feature_name] = scaler
+    scaler = FeatureScaler.fit(data, feature_names)
+    scaled_data = scaler.transform(data)
     
     print(f"Applied individual scaling to {len(feature_names)} features")
     
-    return scaled_data, scalers
+    return scaled_data, scaler
 
 
 def create_sequences(data: np.ndarray, sequence_length: int, 
@@ -243,16 +142,11 @@ def create_sequences(data: np.ndarray, sequence_length: int,
         target_column: Index of target column (close price)
         
     Returns:
-        Tuple of (X, y) arrays for supervised learning
+        Tuple of (X, y) arrays for supervised learning. Both are read-only
+        strided views of `data` (X[i] = data[i:i+L], y[i] = data[i+L, target]),
+        so no window is copied until a batch is taken from them.
     """
-    X, y = [], []
-    for i in range(sequence_length, len(data)):
-        # Input: historical sequence of all features
-        X.append(data[i-sequence_length:i, :])
-        # Target: next period's close price
-        y.append(data[i, target_column])
-    
-    return np.array(X), np.array(y)
+    return sliding_windows(data, sequence_length, target_column)
 
 
 def build_enhanced_lstm_model(input_shape: Tuple[int, int]) -> Sequential:
@@ -290,14 +184,16 @@ def build_enhanced_lstm_model(input_shape: Tuple[int, int]) -> Sequential:
 
 
 def plot_enhanced_results(actual: np.ndarray, predicted: np.ndarray, 
-                         save_dir: str) -> None:
+                         save_dir: str, asset: str = 'Bitcoin', suffix: str = '') -> None:
     """
     Generate comprehensive visualization of model performance.
     
     Args:
-        actual: Actual Bitcoin prices
+        actual: Actual asset prices
         predicted: Model predicted prices
         save_dir: Directory to save plot files
+        asset: Asset name used in plot titles
+        suffix: File name suffix (e.g. '_eth')
     """
     # Create output directory for plots
     os.makedirs(save_dir, exist_ok=True)
@@ -306,13 +202,13 @@ def plot_enhanced_results(actual: np.ndarray, predicted: np.ndarray,
     plt.figure(figsize=(15, 8))
     plt.plot(actual, label='Actual Prices', color='blue', linewidth=2, alpha=0.7)
     plt.plot(predicted, label='Predicted Prices', color='red', linewidth=2, alpha=0.7)
-    plt.title('Actual vs Predicted Bitcoin Prices', fontsize=16, fontweight='bold')
+    plt.title(f'Actual vs Predicted {asset} Prices', fontsize=16, fontweight='bold')
     plt.xlabel('Time Steps', fontsize=12)
-    plt.ylabel('Bitcoin Price (USD)', fontsize=12)
+    plt.ylabel(f'{asset} Price (USD)', fontsize=12)
     plt.legend(fontsize=12)
     plt.grid(True, alpha=0.3)
     plt.tight_layout()
-    plt.savefig(f"{save_dir}/price_comparison.png", dpi=300, bbox_inches='tight')
+    plt.savefig(f"{save_dir}/price_comparison{suffix}.png", dpi=300, bbox_inches='tight')
     plt.show()
     
     # Prediction accuracy scatter plot
@@ -339,18 +235,19 @@ def plot_enhanced_results(actual: np.ndarray, predicted: np.ndarray,
              bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
     
     plt.tight_layout()
-    plt.savefig(f"{save_dir}/scatter_plot.png", dpi=300, bbox_inches='tight')
+    plt.savefig(f"{save_dir}/scatter_plot{suffix}.png", dpi=300, bbox_inches='tight')
     plt.show()
 
 
 def plot_training_history(history: tf.keras.callbacks.History, 
-                         save_dir: str) -> None:
+                         save_dir: str, suffix: str = '') -> None:
     """
     Visualize LSTM model training progress and validation performance.
     
     Args:
         history: Keras training history object
         save_dir: Directory to save training plots
+        suffix: File name suffix (e.g. '_eth')
     """
     os.makedirs(save_dir, exist_ok=True)
     
@@ -377,20 +274,20 @@ def plot_training_history(history: tf.keras.callbacks.History,
     plt.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig(f"{save_dir}/training_history.png", dpi=300, bbox_inches='tight')
+    plt.savefig(f"{save_dir}/training_history{suffix}.png", dpi=300, bbox_inches='tight')
     plt.show()
 
 
 def save_training_history(history: tf.keras.callbacks.History, 
-                         save_dir: str) -> None:
+                         history_file: str) -> None:
     """
     Save training metrics and hyperparameters to JSON file.
     
     Args:
         history: Keras training history object
-        save_dir: Directory to save history file
+        history_file: Path of the JSON history file
     """
-    os.makedirs(save_dir, exist_ok=True)
+    os.makedirs(os.path.dirname(history_file) or '.', exist_ok=True)
     
     history_dict = {
         'loss': history.history['loss'],
@@ -402,10 +299,10 @@ def save_training_history(history: tf.keras.callbacks.History,
         'technical_parameters': TECH_PARAMS
     }
     
-    with open(f"{save_dir}/training_history.json", 'w') as f:
+    with open(history_file, 'w') as f:
         json.dump(history_dict, f, indent=2)
     
-    print(f"Training history saved to: {save_dir}/training_history.json")
+    print(f"Training history saved to: {history_file}")
 
 
 def calculate_metrics(actual: np.ndarray, predicted: np.ndarray) -> Dict[str, float]:
@@ -413,12 +310,16 @@ def calculate_metrics(actual: np.ndarray, predicted: np.ndarray) -> Dict[str, fl
     Calculate comprehensive evaluation metrics for price prediction model.
     
     Args:
-        actual: True Bitcoin prices
+        actual: True prices
         predicted: Model predicted prices
         
     Returns:
         Dictionary of performance metrics
     """
+    # float64 regardless of the (float32) feature pipeline, so the metrics serialize to JSON
+    actual = np.asarray(actual, dtype=np.float64)
+    predicted = np.asarray(predicted, dtype=np.float64)
+    
     mse = np.mean((actual - predicted) ** 2)
     mae = np.mean(np.abs(actual - predicted))
     rmse = np.sqrt(mse)
@@ -444,57 +345,94 @@ def calculate_metrics(actual: np.ndarray, predicted: np.ndarray) -> Dict[str, fl
     }
 
 
-def train_enhanced_lstm_model(csv_file: str) -> Tuple[Sequential, Dict[str, MinMaxScaler], 
-                                                    np.ndarray, List[str]]:
+def train_enhanced_lstm_model(csv_file: str, symbol: str = 'BTC', lazy: bool = False,
+                              stream: bool = False, chunksize: int = 100_000,
+                              cache: bool = True) -> Tuple[Sequential, FeatureScaler, np.ndarray, List[str]]:
     """
-    Complete pipeline for training LSTM Bitcoin price prediction model.
+    Complete pipeline for training LSTM price prediction model for one symbol.
     
     Args:
-        csv_file: Path to Bitcoin price CSV file
+        csv_file: Path to price CSV file
+        symbol: Symbol whose artifacts are written (see model_registry.artifact_paths)
+        lazy: Feed training / validation / test windows as tf.data batches taken from
+            the strided view instead of materializing the window arrays
+        stream: Read, featurize, scale and window the file chunk by chunk
+            (lstm_streaming.StreamingWindows); implies lazy. The returned scaled_data
+            is then only the last sequence_length rows
+        chunksize: Rows per chunk in stream mode
+        cache: Take the features, scaled data and scaler from lstm_cache (built on the
+            first run with the same data and TECH_PARAMS) instead of recomputing them
         
     Returns:
-        Tuple of (trained_model, feature_scalers, scaled_data, feature_names)
+        Tuple of (trained_model, feature_scaler, scaled_data, feature_names)
     """
     # Setup output directories
-    model_dir = "python/models"
-    plots_dir = "python/plots"
-    os.makedirs(model_dir, exist_ok=True)
+    artifacts = artifact_paths(symbol)
+    asset = asset_name(symbol)
+    plots_dir = PLOTS_DIR
+    os.makedirs(os.path.dirname(artifacts.model), exist_ok=True)
     os.makedirs(plots_dir, exist_ok=True)
     
-    print("Bitcoin Price Prediction using LSTM Neural Network")
+    print(f"{asset} Price Prediction using LSTM Neural Network")
     print("=" * 60)
     
-    # Load Bitcoin price data
-    print("Step 1: Loading and preparing Bitcoin price data...")
-    df = load_and_prepare_data(csv_file)
-    
-    # Calculate technical indicators for feature engineering
-    print("Step 2: Engineering technical analysis features...")
-    feature_data, feature_names = engineer_features(df)
-    
-    # Normalize features for optimal neural network training
-    print("Step 3: Normalizing features for neural network...")
-    scaled_data, scalers = normalize_features(feature_data, feature_names)
-    
-    # Create time series sequences for LSTM training
-    print("Step 4: Creating time series sequences...")
-    X, y = create_sequences(scaled_data, HYPERPARAMS['sequence_length'], target_column=0)
-    
-    print(f"Created {X.shape[0]} sequences with shape {X.shape}")
-    print(f"Target shape: {y.shape}")
+    if stream:
+        # Steps 1-4 in one chunked pass: features with carried state, scaler statistics
+        print(f"Steps 1-4: Streaming {asset} price data in chunks of {chunksize} rows...")
+        windows = StreamingWindows(csv_file, HYPERPARAMS['sequence_length'], chunksize=chunksize, years=10,
+                                   params=TECH_PARAMS)
+        scaler, feature_names, scaled_data = windows.scaler, list(FEATURES), windows.tail
+        n_sequences = windows.n_windows
+        make_dataset = partial(windows.dataset, HYPERPARAMS['batch_size'])
+        
+        print(f"Streaming {windows.n_rows} feature rows as {n_sequences} sequences")
+    else:
+        if cache:
+            # Steps 1-3 in one lookup: memory-mapped features, scaled data and scaler
+            print(f"Steps 1-3: Loading {asset} features from the feature cache...")
+            cached = load_features(csv_file, TECH_PARAMS, years=10)
+            feature_data, feature_names = cached.features, list(FEATURES)
+            scaled_data, scaler = cached.scaled, cached.scaler
+            if len(feature_data) < 100:
+                raise Exception(f"Insufficient feature data: only {len(feature_data)} records "
+                               f"after feature engineering. Need at least 100 records.")
+            
+            print(f"Features {'loaded from' if cached.hit else 'built into'} {cached.directory}: "
+                  f"{feature_data.shape}")
+        else:
+            # Load price data
+            print(f"Step 1: Loading and preparing {asset} price data...")
+            df = load_and_prepare_data(csv_file)
+            
+            # Calculate technical indicators for feature engineering
+            print("Step 2: Engineering technical analysis features...")
+            feature_data, feature_names = engineer_features(df, TECH_PARAMS)
+            
+            # Normalize features for optimal neural network training
+            print("Step 3: Normalizing features for neural network...")
+            scaled_data, scaler = normalize_features(feature_data, feature_names)
+        
+        # Create time series sequences for LSTM training
+        print("Step 4: Creating time series sequences...")
+        X, y = create_sequences(scaled_data, HYPERPARAMS['sequence_length'], target_column=0)
+        n_sequences = len(X)
+        
+        def make_dataset(start, stop, shuffle=False, seed=None):
+            return window_dataset(X, y, HYPERPARAMS['batch_size'], np.arange(start, stop), shuffle, seed)
+        
+        print(f"Created {X.shape[0]} sequences with shape {X.shape}")
+        print(f"Target shape: {y.shape}")
     
     # Split data into training and testing sets
     print("Step 5: Splitting data into train/test sets...")
-    train_size = int(len(X) * (1 - HYPERPARAMS['test_split']))
-    X_train, X_test = X[:train_size], X[train_size:]
-    y_train, y_test = y[:train_size], y[train_size:]
+    train_size = int(n_sequences * (1 - HYPERPARAMS['test_split']))
     
-    print(f"Training set: {X_train.shape[0]} samples")
-    print(f"Test set: {X_test.shape[0]} samples")
+    print(f"Training set: {train_size} samples")
+    print(f"Test set: {n_sequences - train_size} samples")
     
     # Build LSTM neural network architecture
     print("Step 6: Building LSTM neural network...")
-    model = build_enhanced_lstm_model((X_train.shape[1], X_train.shape[2]))
+    model = build_enhanced_lstm_model((HYPERPARAMS['sequence_length'], len(feature_names)))
     
     print("Model architecture:")
     model.summary()
@@ -515,29 +453,45 @@ def train_enhanced_lstm_model(csv_file: str) -> Tuple[Sequential, Dict[str, MinM
         verbose=1
     )
     
-    # Train LSTM model on Bitcoin price sequences
+    # Train LSTM model on price sequences
     print("Step 7: Training LSTM model...")
-    history = model.fit(
-        X_train, y_train,
-        epochs=HYPERPARAMS['epochs'],
-        batch_size=HYPERPARAMS['batch_size'],
-        validation_split=HYPERPARAMS['validation_split'],
-        callbacks=[early_stopping, reduce_lr],
-        verbose=1
-    )
+    if lazy or stream:
+        # Same validation rows as validation_split: the last fraction of the training set
+        fit_size = int(train_size * (1 - HYPERPARAMS['validation_split']))
+        history = model.fit(
+            make_dataset(0, fit_size, shuffle=True, seed=42),
+            validation_data=make_dataset(fit_size, train_size),
+            epochs=HYPERPARAMS['epochs'],
+            callbacks=[early_stopping, reduce_lr],
+            shuffle=False,  # the dataset draws its own permutation every epoch
+            verbose=1
+        )
+    else:
+        X_train, y_train = X[:train_size], y[:train_size]
+        history = model.fit(
+            X_train, y_train,
+            epochs=HYPERPARAMS['epochs'],
+            batch_size=HYPERPARAMS['batch_size'],
+            validation_split=HYPERPARAMS['validation_split'],
+            callbacks=[early_stopping, reduce_lr],
+            verbose=1
+        )
     
     # Generate training performance visualizations
-    plot_training_history(history, plots_dir)
-    save_training_history(history, model_dir)
+    plot_training_history(history, plots_dir, artifacts.suffix)
+    save_training_history(history, artifacts.training_history)
     
     # Generate predictions on test set
     print("Step 8: Generating price predictions...")
-    test_predictions = model.predict(X_test, verbose=0)
+    if lazy or stream:
+        test_predictions = model.predict(make_dataset(train_size, n_sequences), verbose=0)
+    else:
+        test_predictions = model.predict(X[train_size:], verbose=0)
+    y_test = windows.targets(train_size, n_sequences) if stream else y[train_size:]
     
     # Convert normalized predictions back to actual price scale
-    close_scaler = scalers['close']
-    test_predictions_scaled = close_scaler.inverse_transform(test_predictions).flatten()
-    y_test_actual = close_scaler.inverse_transform(y_test.reshape(-1, 1)).flatten()
+    test_predictions_scaled = scaler.inverse_column(test_predictions[:, 0])
+    y_test_actual = scaler.inverse_column(y_test)
     
     # Evaluate model performance with multiple metrics
     print("Step 9: Evaluating model performance...")
@@ -557,20 +511,22 @@ def train_enhanced_lstm_model(csv_file: str) -> Tuple[Sequential, Dict[str, MinM
     
     # Create prediction accuracy visualizations
     print("Step 10: Creating prediction visualizations...")
-    plot_enhanced_results(y_test_actual, test_predictions_scaled, plots_dir)
+    plot_enhanced_results(y_test_actual, test_predictions_scaled, plots_dir, asset, artifacts.suffix)
     
     # Save trained model and preprocessing components
-    print("Step 11: Saving trained model and scalers...")
-    model_filename = f"{model_dir}/lstm_model.keras"
-    scalers_filename = f"{model_dir}/scalers.joblib"
-    scaled_data_filename = f"{model_dir}/scaled_data.npy"
+    print("Step 11: Saving trained model and scaler...")
+    model_filename = artifacts.model
+    scaler_filename = artifacts.scaler
+    scaled_data_filename = artifacts.scaled_data
     
     model.save(model_filename)
-    joblib.dump(scalers, scalers_filename)
+    # NumPy export for TensorFlow-free serving, rewritten with the model so it never goes stale
+    export_npz(model, artifacts.numpy_model, source=artifacts.model)
+    scaler.save(scaler_filename)
     np.save(scaled_data_filename, scaled_data)
     
-    print(f"Model saved as: {model_filename}")
-    print(f"Scalers saved as: {scalers_filename}")
+    print(f"Model saved as: {model_filename} (+ {os.path.basename(artifacts.numpy_model)})")
+    print(f"Scaler saved as: {scaler_filename}")
     print(f"Scaled data saved as: {scaled_data_filename}")
     
     # Save model configuration and performance metrics
@@ -581,28 +537,28 @@ def train_enhanced_lstm_model(csv_file: str) -> Tuple[Sequential, Dict[str, MinM
         'metrics': metrics
     }
     
-    config_filename = f"{model_dir}/config.json"
+    config_filename = artifacts.config
     with open(config_filename, 'w') as f:
         json.dump(config, f, indent=2)
     
     print(f"Configuration saved as: {config_filename}")
     
-    return model, scalers, scaled_data, feature_names
+    return model, scaler, scaled_data, feature_names
 
 
-def predict_next_day(model: Sequential, scalers: Dict[str, MinMaxScaler], 
+def predict_next_day(model: Sequential, scaler: FeatureScaler, 
                     scaled_data: np.ndarray, sequence_length: int = None) -> float:
     """
-    Predict next day's Bitcoin closing price using trained LSTM model.
+    Predict next day's closing price using trained LSTM model.
     
     Args:
         model: Trained LSTM model
-        scalers: Feature normalization scalers
+        scaler: Packed feature normalization scaler
         scaled_data: Normalized historical feature data
         sequence_length: Input sequence length for prediction
         
     Returns:
-        Predicted Bitcoin closing price
+        Predicted closing price
     """
     if sequence_length is None:
         sequence_length = HYPERPARAMS['sequence_length']
@@ -610,17 +566,16 @@ def predict_next_day(model: Sequential, scalers: Dict[str, MinMaxScaler],
     # Extract recent historical sequence for prediction
     last_sequence = scaled_data[-sequence_length:].reshape(1, sequence_length, scaled_data.shape[1])
     
-    # Generate price prediction
-    next_day_prediction = model.predict(last_sequence, verbose=0)
+    # Generate price prediction (compiled forward pass, no model.predict overhead)
+    next_day_prediction = compiled_predictor(model)(last_sequence)
     
     # Convert normalized prediction back to actual price
-    close_scaler = scalers['close']
-    next_day_price = close_scaler.inverse_transform(next_day_prediction)[0, 0]
+    next_day_price = scaler.inverse_column(next_day_prediction[0, 0])
     
     return next_day_price
 
 
-def predict_multi_step(model: Sequential, scalers: Dict[str, MinMaxScaler], 
+def predict_multi_step(model: Sequential, scaler: FeatureScaler, 
                       scaled_data: np.ndarray, num_days: int = 7, 
                       sequence_length: int = None) -> np.ndarray:
     """
@@ -628,26 +583,24 @@ def predict_multi_step(model: Sequential, scalers: Dict[str, MinMaxScaler],
     
     Args:
         model: Trained LSTM model
-        scalers: Feature normalization scalers
+        scaler: Packed feature normalization scaler
         scaled_data: Normalized historical feature data
         num_days: Number of future days to predict
         sequence_length: Input sequence length for prediction
         
     Returns:
-        Array of predicted Bitcoin prices for future days
+        Array of predicted prices for future days
     """
     if sequence_length is None:
         sequence_length = HYPERPARAMS['sequence_length']
     
+    predictor = compiled_predictor(model)
     predictions = []
     current_sequence = scaled_data[-sequence_length:].copy()
     
     for i in range(num_days):
-        # Prepare sequence for prediction
-        sequence_input = current_sequence.reshape(1, sequence_length, scaled_data.shape[1])
-        
         # Generate next day prediction
-        next_prediction = model.predict(sequence_input, verbose=0)[0, 0]
+        next_prediction = predictor.predict_one(current_sequence)
         
         # Store prediction for output
         predictions.append(next_prediction)
@@ -660,50 +613,61 @@ def predict_multi_step(model: Sequential, scalers: Dict[str, MinMaxScaler],
         current_sequence = np.vstack([current_sequence[1:], new_row])
     
     # Convert normalized predictions to actual price scale
-    close_scaler = scalers['close']
-    predicted_prices = close_scaler.inverse_transform(np.array(predictions).reshape(-1, 1)).flatten()
+    predicted_prices = scaler.inverse_column(np.array(predictions))
     
     return predicted_prices
 
 
-if __name__ == "__main__":
+def main(symbol: str = 'BTC', lazy: bool = False, stream: bool = False, cache: bool = True) -> None:
+    """Train, evaluate and save the model of `symbol`, then print a 7-day forecast."""
+    artifacts = artifact_paths(symbol)
+    asset = asset_name(symbol)
+
     # Set random seeds for reproducible results
     np.random.seed(42)
     tf.random.set_seed(42)
     
     try:
         # Execute complete model training pipeline
-        model, scalers, scaled_data, feature_names = train_enhanced_lstm_model("python/data/BTC.csv")
+        model, scaler, scaled_data, feature_names = train_enhanced_lstm_model(artifacts.data, symbol, lazy, stream,
+                                                                                cache=cache)
         
         # Generate next day price prediction
-        print("\nStep 12: Predicting next day's Bitcoin price...")
-        next_day_price = predict_next_day(model, scalers, scaled_data)
+        print(f"\nStep 12: Predicting next day's {asset} price...")
+        next_day_price = predict_next_day(model, scaler, scaled_data)
         
-        print(f"\nPredicted next day's Bitcoin closing price: ${next_day_price:.2f}")
+        print(f"\nPredicted next day's {asset} closing price: ${next_day_price:.2f}")
         
         # Generate extended price forecast
         print("\nStep 13: Generating 7-day price forecast...")
-        multi_predictions = predict_multi_step(model, scalers, scaled_data, num_days=7)
+        multi_predictions = predict_multi_step(model, scaler, scaled_data, num_days=7)
         
-        print("\n7-Day Bitcoin Price Forecast:")
+        print(f"\n7-Day {asset} Price Forecast:")
         print("-" * 30)
         for i, price in enumerate(multi_predictions, 1):
             print(f"Day +{i}: ${price:.2f}")
         
         print("\nLSTM model training completed successfully!")
         print("\nGenerated files:")
-        print(f"- lstm_model.keras (trained LSTM model)")
-        print(f"- scalers.joblib (feature normalization scalers)")
-        print(f"- config.json (model configuration and metrics)")
-        print(f"- training_history.json (training performance data)")
-        print(f"- Visualization plots in python/plots/ directory")
+        print(f"- {os.path.basename(artifacts.model)} (trained LSTM model)")
+        print(f"- {os.path.basename(artifacts.scaler)} (packed feature normalization scaler)")
+        print(f"- {os.path.basename(artifacts.config)} (model configuration and metrics)")
+        print(f"- {os.path.basename(artifacts.training_history)} (training performance data)")
+        print(f"- Visualization plots in {PLOTS_DIR}/ directory")
         
         print(f"\nTechnical features used: {feature_names}")
         
     except FileNotFoundError:
-        print("Error: 'python/data/BTC.csv' file not found!")
+        print(f"Error: '{artifacts.data}' file not found!")
         print("Please ensure the CSV file exists and contains 'date', 'close' columns.")
     except Exception as e:
         print(f"An error occurred: {str(e)}")
         import traceback
-        traceback.print_exc()
\ No newline at end of file
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    # python python/lstm_train.py [SYMBOL] [--lazy | --stream] [--no-cache]  (reads python/data/<SYMBOL>.csv)
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    main(args[0] if args else 'BTC', '--lazy' in sys.argv[1:], '--stream' in sys.argv[1:],
+         '--no-cache' not in sys.argv[1:])
@@ -0,0 +1,286 @@
+"""
+Columnar, memory-mapped market-data store in front of the date,close CSVs.
+
+The first read of a CSV converts it once into one .npy file per column (the
+parsed dates plus every numeric column) under data/store/<NAME>/, sorted by
+date, with a small meta.json. Later reads memory-map those columns instead of
+parsing the CSV again, and date ranges are cut with a binary search on the
+date column. The store is rebuilt automatically when the CSV's size or
+modification time changes.
+
+New candles can be appended without rewriting the store: the column files
+grow in place (the .npy headers reserve room for a longer shape) and meta.json
+records the committed row count, written last, so readers never see a
+half-appended row. Appended rows live in the store only; rewriting the CSV
+replaces them with the CSV's contents on the next read.
+
+    data = open_store("python/data/BTC.csv")
+    recent = data.frame(years=5)                     # DataFrame like predict_lstm.load_data
+    closes = data.slice("2024-01-01", "2024-06-30")['close']
+    data.append(["2025-01-02"], close=[97000.0])
+
+    python python/market_data.py build BTC ETH
+    python python/market_data.py info BTC
+"""
+
+import argparse
+import json
+import os
+import threading
+from datetime import timedelta
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = "python/data"
+STORE_DIRNAME = "store"
+
+_META = "meta.json"
+_FORMAT_VERSION = 1
+# Rows parsed per CSV chunk while building, so the conversion never holds the whole text table
+_BUILD_CHUNKSIZE = 1_000_000
+
+_build_lock = threading.Lock()
+
+
+def store_dir(csv_path: str) -> str:
+    """Store directory of a CSV: <csv dir>/store/<file name without extension>."""
+    directory, name = os.path.split(csv_path)
+    return os.path.join(directory, STORE_DIRNAME, os.path.splitext(name)[0])
+
+
+def symbol_path(symbol: str, data_dir: str = DATA_DIR) -> str:
+    return os.path.join(data_dir, f"{symbol.upper()}.csv")
+
+
+def _source_signature(csv_path: str) -> Optional[Dict[str, int]]:
+    if not os.path.exists(csv_path):
+        return None
+    stat = os.stat(csv_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _write_json(path: str, value: Dict) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(value, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _column_path(directory: str, name: str) -> str:
+    return os.path.join(directory, f"{name}.npy")
+
+
+def _create_column(path: str, dtype: np.dtype) -> None:
+    """Empty 1-D .npy file; numpy pads the header so the length can grow in place."""
+    with open(path, 'wb') as f:
+        np.lib.format.write_array_header_1_0(
+            f, {'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': (0,)})
+
+
+def _append_column(path: str, rows: int, values: np.ndarray) -> None:
+    """Write `values` after the first `rows` elements of a column and update its header."""
+    with open(path, 'r+b') as f:
+        version = np.lib.format.read_magic(f)
+        read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) \
+            else np.lib.format.read_array_header_2_0
+        _, _, dtype = read_header(f)
+        offset = f.tell()
+        values = np.ascontiguousarray(values, dtype=dtype)
+        # Anything past `rows` is left over from an interrupted append and gets overwritten
+        f.seek(offset + rows * dtype.itemsize)
+        f.write(values.tobytes())
+        f.truncate()
+        f.seek(0)
+        np.lib.format.write_array_header_1_0(
+            f, {'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False,
+                'shape': (rows + len(values),)})
+        if f.tell() != offset:
+            raise RuntimeError(f"{path}: header no longer fits, rebuild the store")
+
+
+class MarketData:
+    """
+    Memory-mapped columns of one stored CSV.
+
+    Args:
+        directory: Store directory written by build_store.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, _META)) as f:
+            self.meta = json.load(f)
+        rows = self.meta['rows']
+        # Columns may hold a few uncommitted rows after an interrupted append; meta.json decides
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.load(_column_path(directory, name), mmap_mode='r')[:rows]
+            for name in self.meta['columns']
+        }
+
+    @property
+    def dates(self) -> np.ndarray:
+        return self.columns['date']
+
+    @property
+    def version(self) -> Tuple:
+        """Changes whenever the stored rows change (rebuild or append)."""
+        return self.meta['rows'], self.meta['built_at'], self.meta['appended_at']
+
+    def __len__(self) -> int:
+        return self.meta['rows']
+
+    def index(self, start=None, end=None) -> slice:
+        """Row range with start <= date <= end (either bound optional), by binary search."""
+        lo = 0 if start is None else int(np.searchsorted(self.dates, self._date(start), side='left'))
+        hi = len(self) if end is None else int(np.searchsorted(self.dates, self._date(end), side='right'))
+        return slice(lo, max(lo, hi))
+
+    def slice(self, start=None, end=None, columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Read-only views of `columns` (all by default) for start <= date <= end."""
+        rows = self.index(start, end)
+        return {name: self.columns[name][rows] for name in columns or self.columns}
+
+    def start_of_last(self, years: float):
+        """First date of the last `years` years, counted back 365 days per year from the last date."""
+        return self.dates[-1] - np.timedelta64(timedelta(days=years * 365))
+
+    def frame(self, start=None, end=None, years: Optional[float] = None,
+              columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        DataFrame of the rows in range (or the last `years` years), with a 0-based
+        index like the read_csv / to_datetime / sort_values loaders it replaces.
+        """
+        if years is not None and len(self):
+            start = self.start_of_last(years)
+        names = ['date', *[name for name in columns or self.columns if name != 'date']]
+        return pd.DataFrame({name: np.array(values) for name, values in self.slice(start, end, names).items()})
+
+    def append(self, dates: Iterable, **values: Iterable) -> 'MarketData':
+        """
+        Append candles newer than the last stored date. Every stored column needs
+        a value per date. Returns the reopened store.
+        """
+        dates = np.asarray(pd.to_datetime(list(dates)).to_numpy(), dtype=self.dates.dtype)
+        names = [name for name in self.columns if name != 'date']
+        if set(values) != set(names):
+            raise ValueError(f"append needs exactly the columns {names}, got {sorted(values)}")
+        arrays = {name: np.asarray(values[name], dtype=self.columns[name].dtype) for name in names}
+        if any(len(array) != len(dates) for array in arrays.values()):
+            raise ValueError("every column needs one value per date")
+        if len(dates) == 0:
+            return self
+        if np.any(dates[1:] <= dates[:-1]) or (len(self) and dates[0] <= self.dates[-1]):
+            raise ValueError("appended dates must be increasing and after the last stored date")
+
+        rows = len(self)
+        with _build_lock:
+            for name, array in (('date', dates), *arrays.items()):
+                _append_column(_column_path(self.directory, name), rows, array)
+            meta = {**self.meta, 'rows': rows + len(dates), 'appended_at': pd.Timestamp.now().isoformat()}
+            _write_json(os.path.join(self.directory, _META), meta)
+        return MarketData(self.directory)
+
+    def _date(self, value) -> np.datetime64:
+        return pd.Timestamp(value).to_datetime64().astype(self.dates.dtype)
+
+
+def build_store(csv_path: str, directory: Optional[str] = None,
+                chunksize: int = _BUILD_CHUNKSIZE) -> MarketData:
+    """Convert a CSV with a 'date' column into the columnar store (replacing an existing one)."""
+    directory = directory or store_dir(csv_path)
+    os.makedirs(directory, exist_ok=True)
+    signature = _source_signature(csv_path)
+
+    rows = 0
+    names = None
+    last_date = None
+    ordered = True
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+        if 'date' not in chunk.columns:
+            raise ValueError(f"{csv_path}: missing required column 'date'")
+        dates = pd.to_datetime(chunk['date']).to_numpy()
+        numeric = chunk.drop(columns='date').select_dtypes('number')
+        if names is None:
+            names = ['date', *numeric.columns]
+            for name in names:
+                dtype = dates.dtype if name == 'date' else np.dtype(np.float64)
+                _create_column(_column_path(directory, f"{name}.{os.getpid()}.tmp"), dtype)
+        if len(dates) == 0:
+            continue
+        if (last_date is not None and dates[0] < last_date) or np.any(dates[1:] < dates[:-1]):
+            ordered = False
+        last_date = dates[-1]
+        for name in names:
+            values = dates if name == 'date' else numeric[name].to_numpy(dtype=np.float64)
+            _append_column(_column_path(directory, f"{name}.{os.getpid()}.tmp"), rows, values)
+        rows += len(dates)
+
+    if names is None:
+        raise ValueError(f"{csv_path} is empty")
+    tmp_paths = {name: _column_path(directory, f"{name}.{os.getpid()}.tmp") for name in names}
+    if not ordered:
+        # Unsorted input is the exception; only then is the whole table sorted in memory
+        order = np.argsort(np.load(tmp_paths['date']), kind='stable')
+        for name, path in tmp_paths.items():
+            np.save(path, np.load(path)[order], allow_pickle=False)
+
+    for name, path in tmp_paths.items():
+        os.replace(path, _column_path(directory, name))
+    _write_json(os.path.join(directory, _META), {
+        'format': _FORMAT_VERSION,
+        'source': os.path.abspath(csv_path),
+        'source_signature': signature,
+        'columns': names,
+        'rows': rows,
+        'built_at': pd.Timestamp.now().isoformat(),
+        'appended_at': None
+    })
+    return MarketData(directory)
+
+
+def open_store(csv_path: str, directory: Optional[str] = None) -> MarketData:
+    """
+    The store of `csv_path`, built on first use and rebuilt when the CSV changed.
+    A store without its CSV is opened as it is.
+    """
+    directory = directory or store_dir(csv_path)
+    meta_path = os.path.join(directory, _META)
+    signature = _source_signature(csv_path)
+    if signature is None and not os.path.exists(meta_path):
+        raise FileNotFoundError(csv_path)
+
+    with _build_lock:
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta.get('format') == _FORMAT_VERSION and \
+                    (signature is None or meta.get('source_signature') == signature):
+                return MarketData(directory)
+        return build_store(csv_path, directory)
+
+
+def load_frame(csv_path: str, years: Optional[float] = None,
+               columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Sorted DataFrame of a CSV (optionally the last `years` years) read through its store."""
+    return open_store(csv_path).frame(years=years, columns=columns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar market-data store")
+    parser.add_argument('command', choices=['build', 'info'])
+    parser.add_argument('symbols', nargs='+', help="symbols in --data-dir or CSV paths")
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    args = parser.parse_args()
+
+    for symbol in args.symbols:
+        csv_path = symbol if symbol.endswith('.csv') else symbol_path(symbol, args.data_dir)
+        data = build_store(csv_path) if args.command == 'build' else open_store(csv_path)
+        first, last = (str(data.dates[0]), str(data.dates[-1])) if len(data) else ('-', '-')
+        print(f"{csv_path} -> {data.directory}: {len(data)} rows, {first} .. {last}, "
+              f"columns {', '.join(data.meta['columns'])}")
+
+
+if __name__ == "__main__":
+    main()
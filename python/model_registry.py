@@ -0,0 +1,235 @@
+"""
+Per-symbol LSTM artifacts and a lazily loading, memory-bounded model registry.
+
+Artifacts follow the names the training pipeline writes (BTC keeps the
+original unsuffixed names):
+
+    BTC: lstm_model.keras, lstm_model.npz, scaler.json, config.json, ...
+    ETH: lstm_eth_model.keras, lstm_eth_model.npz, scaler_eth.json, config_eth.json, ...
+
+Models trained before the packed scaler have scalers{_sym}.joblib instead of
+scaler{_sym}.json; those still load (with joblib and sklearn).
+
+ModelRegistry discovers every symbol with a model and a scaler in the models
+directory and loads a symbol on first use. Loaded models are kept in LRU
+order and the least recently used ones are dropped once the total weight size
+exceeds max_bytes (or the count exceeds max_models).
+
+Example:
+    registry = ModelRegistry(max_bytes=64 * 2**20, prefer_numpy=True)
+    entry = registry.get('ETH')
+    next_day, multi_step = predict_lstm.predict(entry.model, entry.scalers, df,
+                                                params=entry.technical_parameters)
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import predict_lstm
+from lstm_numpy import export_fingerprint, model_fingerprint
+from lstm_scaling import FeatureScaler
+
+MODELS_DIR = "python/models"
+DATA_DIR = "python/data"
+PLOTS_DIR = "python/plots"
+
+# Display names used by the training output; other symbols print as themselves
+ASSET_NAMES = {
+    'BTC': 'Bitcoin',
+    'ETH': 'Ethereum'
+}
+
+_MODEL_FILE = re.compile(r'^lstm(?:_(?P<symbol>[a-z0-9]+))?_model\.(?:keras|npz)$')
+
+
+class Artifacts(NamedTuple):
+    symbol: str
+    model: str
+    numpy_model: str
+    scaler: str
+    scalers: str
+    config: str
+    scaled_data: str
+    training_history: str
+    data: str
+    suffix: str
+
+
+def artifact_paths(symbol: str, models_dir: str = MODELS_DIR, data_dir: str = DATA_DIR) -> Artifacts:
+    """Paths of every artifact of `symbol` (files need not exist yet)."""
+    symbol = symbol.upper()
+    suffix = '' if symbol == 'BTC' else f"_{symbol.lower()}"
+    model_stem = 'lstm' if symbol == 'BTC' else f"lstm_{symbol.lower()}"
+    return Artifacts(
+        symbol=symbol,
+        model=os.path.join(models_dir, f"{model_stem}_model.keras"),
+        numpy_model=os.path.join(models_dir, f"{model_stem}_model.npz"),
+        scaler=os.path.join(models_dir, f"scaler{suffix}.json"),
+        scalers=os.path.join(models_dir, f"scalers{suffix}.joblib"),
+        config=os.path.join(models_dir, f"config{suffix}.json"),
+        scaled_data=os.path.join(models_dir, f"scaled_data{suffix}.npy"),
+        training_history=os.path.join(models_dir, f"training_history{suffix}.json"),
+        data=os.path.join(data_dir, f"{symbol}.csv"),
+        suffix=suffix
+    )
+
+
+def asset_name(symbol: str) -> str:
+    return ASSET_NAMES.get(symbol.upper(), symbol.upper())
+
+
+def scaler_path(artifacts: Artifacts) -> str:
+    """The packed scaler.json, or the legacy scalers.joblib when only that exists."""
+    return artifacts.scalers if not os.path.exists(artifacts.scaler) and os.path.exists(artifacts.scalers) \
+        else artifacts.scaler
+
+
+def model_path(artifacts: Artifacts, prefer_numpy: bool = False) -> str:
+    """
+    The .npz export when preferred and exported from the current .keras model (by the
+    fingerprint stored at export), else the .keras model (a stale export would pair old
+    weights with the new scaler). Modification times are not used: after a clone or
+    copy they say nothing about which file was written first.
+    """
+    if prefer_numpy and os.path.exists(artifacts.numpy_model):
+        if not os.path.exists(artifacts.model) or \
+                export_fingerprint(artifacts.numpy_model) == model_fingerprint(artifacts.model):
+            return artifacts.numpy_model
+        print(f"{artifacts.numpy_model} was not exported from {artifacts.model}; using the .keras model "
+              f"(re-export with lstm_numpy.py)", file=sys.stderr)
+    return artifacts.model
+
+
+def discover_symbols(models_dir: str = MODELS_DIR) -> List[str]:
+    """Symbols with a model (.keras or .npz) and a scaler in models_dir."""
+    symbols = set()
+    for name in os.listdir(models_dir) if os.path.isdir(models_dir) else []:
+        match = _MODEL_FILE.match(name)
+        if match:
+            symbol = (match.group('symbol') or 'btc').upper()
+            if os.path.exists(scaler_path(artifact_paths(symbol, models_dir))):
+                symbols.add(symbol)
+    return sorted(symbols)
+
+
+class LoadedModel:
+    """A loaded model with its FeatureScaler (`scalers`), config and approximate weight size in bytes."""
+
+    def __init__(self, artifacts: Artifacts, model: Any, scalers: FeatureScaler,
+                 config: Optional[Dict[str, Any]], nbytes: int):
+        self.symbol = artifacts.symbol
+        self.artifacts = artifacts
+        self.model = model
+        self.scalers = scalers
+        self.config = config
+        self.nbytes = nbytes
+
+    @property
+    def technical_parameters(self) -> Optional[Dict[str, Any]]:
+        """TECH_PARAMS the model was trained with (None: lstm_features.TECH_DEFAULTS)."""
+        return (self.config or {}).get('technical_parameters')
+
+
+def _weight_bytes(model: Any) -> int:
+    if hasattr(model, 'layers') and hasattr(model, 'get_weights'):
+        return sum(weights.nbytes for weights in model.get_weights())
+    return sum(value.nbytes for layer in model.layers for value in layer.values() if hasattr(value, 'nbytes'))
+
+
+class ModelRegistry:
+    """
+    Lazily loaded models by symbol with an LRU memory budget.
+
+    Args:
+        models_dir: Directory with the trained artifacts.
+        max_bytes: Budget for the weights of all loaded models.
+        max_models: Optional limit on the number of loaded models.
+        prefer_numpy: Load the .npz export (no TensorFlow) when it exists.
+    """
+
+    def __init__(self, models_dir: str = MODELS_DIR, data_dir: str = DATA_DIR,
+                 max_bytes: int = 256 * 2**20, max_models: Optional[int] = None,
+                 prefer_numpy: bool = False):
+        self.models_dir = models_dir
+        self.data_dir = data_dir
+        self.max_bytes = max_bytes
+        self.max_models = max_models
+        self.prefer_numpy = prefer_numpy
+        self._loaded: 'OrderedDict[str, LoadedModel]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def symbols(self) -> List[str]:
+        return discover_symbols(self.models_dir)
+
+    def artifacts(self, symbol: str) -> Artifacts:
+        return artifact_paths(symbol, self.models_dir, self.data_dir)
+
+    def get(self, symbol: str) -> LoadedModel:
+        """The loaded model of `symbol`, loading it (and evicting others) if needed."""
+        symbol = symbol.upper()
+        with self._lock:
+            entry = self._loaded.get(symbol)
+            if entry is not None:
+                self._loaded.move_to_end(symbol)
+                self.hits += 1
+                return entry
+
+            self.misses += 1
+            entry = self._load(symbol)
+            self._loaded[symbol] = entry
+            self._evict(keep=symbol)
+            return entry
+
+    def evict(self, symbol: str) -> bool:
+        with self._lock:
+            return self._loaded.pop(symbol.upper(), None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._loaded.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "loaded": list(self._loaded),
+                "bytes": sum(entry.nbytes for entry in self._loaded.values()),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+    def _load(self, symbol: str) -> LoadedModel:
+        artifacts = self.artifacts(symbol)
+        path = model_path(artifacts, self.prefer_numpy)
+        scalers_path = scaler_path(artifacts)
+        if not os.path.exists(path) or not os.path.exists(scalers_path):
+            available = ', '.join(self.symbols()) or 'none'
+            raise ValueError(f"No trained model for {symbol}. Available: {available}")
+
+        model, scalers = predict_lstm.load_artifacts(path, scalers_path)
+        config = None
+        if os.path.exists(artifacts.config):
+            with open(artifacts.config) as f:
+                config = json.load(f)
+        return LoadedModel(artifacts, model, scalers, config, _weight_bytes(model))
+
+    def _evict(self, keep: str) -> None:
+        """Drop least recently used models until the budget holds (never `keep`)."""
+        def over_budget():
+            total = sum(entry.nbytes for entry in self._loaded.values())
+            too_many = self.max_models is not None and len(self._loaded) > self.max_models
+            return total > self.max_bytes or too_many
+
+        while len(self._loaded) > 1 and over_budget():
+            oldest = next(iter(self._loaded))
+            if oldest == keep:
+                break
+            del self._loaded[oldest]
+            self.evictions += 1
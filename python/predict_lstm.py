@@ -1,141 +1,145 @@
 import os
+import sys
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
 
 import numpy as np
 import pandas as pd
-from tensorflow.keras.models import load_model
-from datetime import timedelta
-import joblib
 import json
+from collections import deque
 
-# Load model
-model = load_model("python/models/lstm_model.keras")
+# List of feature names (cùng thứ tự với lúc train)
+from lstm_features import FEATURES, FeatureState, feature_matrix
+from lstm_scaling import as_scaler, load_scaler
+from market_data import load_frame
 
-# Load scalers (dictionary)
-scalers = joblib.load("python/models/scalers.joblib")
-close_scaler = scalers['close']
+MODEL_PATH = "python/models/lstm_model.keras"
+SCALERS_PATH = "python/models/scaler.json"
+DATA_PATH = "python/data/BTC.csv"
 
-# List of feature names
-FEATURES = [
-    'close', 'rsi_14', 'ema_30', 'sma_10', 'sma_50',
-    'bb_upper', 'bb_lower', 'bb_width', 'bb_position',
-    'price_sma10_ratio', 'price_sma50_ratio'
-]
+SEQ_LEN = 30
+FORECAST_STEPS = 7
 
 # =========================
-# Feature calculation utils
+# Load model + scalers
 # =========================
-def calculate_rsi(prices, window=14):
-    delta = prices.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
-
-def calculate_ema(prices, window=30):
-    return prices.ewm(span=window, adjust=False).mean()
+def load_artifacts(model_path=MODEL_PATH, scalers_path=SCALERS_PATH):
+    """
+    Load model và scaler (lstm_scaling.FeatureScaler). TensorFlow chỉ được import ở đây,
+    nên import module này không tốn chi phí khởi động TF
+    File .npz được chạy bằng lstm_numpy, không cần TensorFlow
+    scaler.json không cần sklearn; scalers.joblib cũ vẫn đọc được (cần joblib + sklearn)
+    """
+    if model_path.endswith('.npz'):
+        from lstm_numpy import NumpyLSTMModel
+        model = NumpyLSTMModel(model_path)
+    else:
+        from tensorflow.keras.models import load_model
+        model = load_model(model_path)
+    scalers = load_scaler(scalers_path)
+    return model, scalers
 
-def calculate_sma(prices, window):
-    return prices.rolling(window=window).mean()
+def as_predictor(model):
+    """
+    Predictor cho vòng lặp dự đoán: NumpyLSTMModel / CompiledPredictor dùng trực tiếp,
+    Keras model được bọc bằng tf.function (lstm_inference)
+    """
+    if hasattr(model, 'predict_one'):
+        return model
+    from lstm_inference import compiled_predictor
+    return compiled_predictor(model)
 
-def calculate_bollinger_bands(prices, window=20, num_std=2):
-    sma = prices.rolling(window=window).mean()
-    std = prices.rolling(window=window).std()
-    upper = sma + (std * num_std)
-    lower = sma - (std * num_std)
-    return upper, lower
+def sequence_length(model):
+    """
+    Độ dài cửa sổ đầu vào của model (sequence_length lúc train, có thể khác SEQ_LEN
+    nếu model đến từ hyperparameter search); SEQ_LEN nếu model không cố định độ dài
+    """
+    return getattr(as_predictor(model), 'sequence_length', None) or SEQ_LEN
 
-def engineer_features(df):
+# =========================
+# Feature engineering
+# =========================
+def engineer_features(df, params=None):
     """
-    Tính đầy đủ 11 features
+    Tính đầy đủ 11 features bằng lstm_features.feature_matrix (cùng định nghĩa với lúc train),
+    giữ các cột khác của df (vd. date) cho những dòng có đủ features
+    params: TECH_PARAMS của model (config 'technical_parameters'), mặc định TECH_DEFAULTS
     """
-    df = df.copy()
-    df['rsi_14'] = calculate_rsi(df['close'])
-    df['ema_30'] = calculate_ema(df['close'])
-    df['sma_10'] = calculate_sma(df['close'], window=10)
-    df['sma_50'] = calculate_sma(df['close'], window=50)
-    bb_upper, bb_lower = calculate_bollinger_bands(df['close'])
-    df['bb_upper'] = bb_upper
-    df['bb_lower'] = bb_lower
-    df['bb_width'] = df['bb_upper'] - df['bb_lower']
-    df['bb_position'] = (df['close'] - df['bb_lower']) / df['bb_width']
-    df['price_sma10_ratio'] = df['close'] / df['sma_10']
-    df['price_sma50_ratio'] = df['close'] / df['sma_50']
-    df = df.dropna().reset_index(drop=True)
-    return df
+    rows, kept = feature_matrix(df['close'].to_numpy(dtype=np.float64), dtype=np.float64, params=params)
+    other = df.loc[kept, [col for col in df.columns if col not in FEATURES]].reset_index(drop=True)
+    return pd.concat([other, pd.DataFrame(rows, columns=FEATURES)], axis=1)
 
 # =========================
 # Load and preprocess data
 # =========================
-def load_data():
-    df = pd.read_csv("python/data/BTC.csv", usecols=["date","close"])
-    df['date'] = pd.to_datetime(df['date'])
-    df = df.sort_values('date').reset_index(drop=True)
-    end_date = df['date'].max()
-    start_date = end_date - timedelta(days=5*365)
-    df = df[df['date'] >= start_date].reset_index(drop=True)
-    return df
+def load_data(data_path=DATA_PATH):
+    """5 năm gần nhất (date, close), đọc từ store cột của market_data thay vì parse lại CSV"""
+    return load_frame(data_path, years=5, columns=['close'])
 
 # =========================
 # Predict function
 # =========================
-def predict():
-    df = load_data()
-    df_feat = engineer_features(df)
-    
-    seq_len = 30
-    last_seq_df = df_feat.iloc[-seq_len:].reset_index(drop=True)
+def scale_rows(rows, scalers):
+    """Scale feature rows (cột theo thứ tự FEATURES): một phép affine cho tất cả các cột"""
+    return as_scaler(scalers).transform(rows)
+
+def predict(model, scalers, df, steps=FORECAST_STEPS, seq_len=None, params=None):
+    """
+    Dự đoán giá ngày tiếp theo và `steps` ngày sau đó (mỗi bước dùng giá vừa dự đoán)
+    df: DataFrame có cột date, close (như load_data)
+    Features chỉ tính một lần trên toàn bộ lịch sử, các bước sau cập nhật tăng dần
+    model: Keras model, lstm_inference.CompiledPredictor hoặc lstm_numpy.NumpyLSTMModel
+    scalers: lstm_scaling.FeatureScaler (hoặc dict MinMaxScaler cũ)
+    seq_len: độ dài cửa sổ, mặc định lấy từ model (sequence_length)
+    params: TECH_PARAMS lúc train model (config 'technical_parameters'), mặc định TECH_DEFAULTS
+    """
+    predictor = as_predictor(model)
+    scaler = as_scaler(scalers)
+    seq_len = seq_len or sequence_length(model)
+    state = FeatureState.from_closes(df['close'].values, seq_len, params)
     
     # Scale all features
-    scaled = np.zeros_like(last_seq_df[FEATURES].values)
-    for i, col in enumerate(FEATURES):
-        scaled[:, i] = scalers[col].transform(last_seq_df[col].values.reshape(-1,1)).flatten()
+    scaled = deque(scaler.transform(state.window()), maxlen=seq_len)
     
     # Predict next day
-    inp = scaled.reshape(1, seq_len, scaled.shape[1])
-    pred = model.predict(inp, verbose=0)[0,0]
-    next_price = close_scaler.inverse_transform([[pred]])[0,0]
+    pred = predictor.predict_one(np.array(scaled))
+    next_price = scaler.inverse_column(pred)
     
-    # Multi-step forecast
+    # Multi-step forecast: mỗi bước chỉ tính features + scale cho nến mới
     preds = []
-    df_future = df.copy()
-    for _ in range(7):
-        # Append predicted close to df_future
-        pred_close = close_scaler.inverse_transform([[pred]])[0,0]
-        next_date = df_future['date'].iloc[-1] + timedelta(days=1)
-        df_future = pd.concat([
-            df_future,
-            pd.DataFrame({'date':[next_date],'close':[pred_close]})
-        ], ignore_index=True)
-        
-        # Recompute features
-        df_feat_future = engineer_features(df_future)
-        last_seq_df = df_feat_future.iloc[-seq_len:].reset_index(drop=True)
-        
-        # Scale
-        scaled = np.zeros_like(last_seq_df[FEATURES].values)
-        for i, col in enumerate(FEATURES):
-            scaled[:, i] = scalers[col].transform(last_seq_df[col].values.reshape(-1,1)).flatten()
+    for _ in range(steps):
+        pred_close = scaler.inverse_column(pred)
+        row = state.append(pred_close)
+        scaled.append(scaler.transform(row))
         
         # Predict next
-        inp = scaled.reshape(1, seq_len, scaled.shape[1])
-        pred = model.predict(inp, verbose=0)[0,0]
+        pred = predictor.predict_one(np.array(scaled))
         preds.append(pred)
     
     # Inverse transform all predictions
-    dummy_multi = np.zeros((len(preds),1))
-    dummy_multi[:,0] = preds
-    multi_prices = close_scaler.inverse_transform(dummy_multi).flatten().tolist()
+    multi_prices = scaler.inverse_column(np.array(preds, dtype=np.float64)).tolist()
     
     return next_price, multi_prices
 
 # =========================
 # Main
 # =========================
-if __name__ == "__main__":
-    next_day, multi = predict()
+def main(symbol='BTC', use_numpy=False):
+    """Dự đoán cho một symbol, artifacts lấy theo model_registry (lstm_model.keras, lstm_eth_model.keras, ...)"""
+    from model_registry import artifact_paths, model_path, scaler_path
+    artifacts = artifact_paths(symbol)
+    model, scalers = load_artifacts(model_path(artifacts, use_numpy), scaler_path(artifacts))
+    params = None
+    if os.path.exists(artifacts.config):
+        with open(artifacts.config) as f:
+            params = json.load(f).get('technical_parameters')
+    next_day, multi = predict(model, scalers, load_data(artifacts.data), params=params)
     print(json.dumps({
         "next_day": next_day,
         "multi_step": multi
     }))
+
+if __name__ == "__main__":
+    # python python/predict_lstm.py [SYMBOL] [--numpy]
+    # --numpy: chạy bằng weights .npz, không import TensorFlow
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    main(args[0] if args else 'BTC', '--numpy' in sys.argv[1:])
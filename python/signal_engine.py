@@ -0,0 +1,297 @@
+"""
+Vectorized per-bar signal scoring and a simple backtest over the composite signal.
+
+TechnicalIndicators._summarize produces the weighted verdict for the last bar
+only. signal_series() computes, for every bar t at once, the same signal each
+indicator would report for prices[:t + 1], the weighted average score, the
+overall signal and the confidence - as NumPy arrays, using SIGNAL_WEIGHTS and
+the default indicator parameters of calculate_multiple_indicators.
+
+Usage (backtest on daily closes):
+    python python/signal_engine.py [--csv python/data/BTC.csv] [--years 5] [--short] [--fee 0.001]
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+import indicator_kernels as kernels
+from market_data import open_store
+from technical_indicators import (
+    DEFAULT_INDICATORS,
+    SIGNAL_WEIGHTS,
+    TechnicalIndicators,
+    _BATCH_MIN_LENGTH,
+    _has_values,
+)
+
+# Per-indicator signal codes index into SIGNAL_LABELS; -1 means the indicator
+# has no value at that bar (not enough data, same as the {"error": ...} result)
+SIGNAL_LABELS = tuple(SIGNAL_WEIGHTS)
+OVERALL_LABELS = ('UNKNOWN', 'STRONG_BEARISH', 'BEARISH', 'NEUTRAL', 'BULLISH', 'STRONG_BULLISH')
+
+_CODES = {label: code for code, label in enumerate(SIGNAL_LABELS)}
+_OVERALL_CODES = {label: code for code, label in enumerate(OVERALL_LABELS)}
+# Weight per code, with a trailing 0 so that code -1 contributes nothing
+_WEIGHTS = np.array([SIGNAL_WEIGHTS[label] for label in SIGNAL_LABELS] + [0], dtype=np.float64)
+
+# calculate_multiple_indicators reads MACD's 'signal' key, which holds the numeric
+# signal line rather than a label, so MACD never enters the summary score
+_UNSCORED = ('macd',)
+
+
+def _select(conditions: List[np.ndarray], labels: List[str], default: str) -> np.ndarray:
+    """Label code of the first true condition per bar (the if/elif chains of the _*_result methods)."""
+    return np.select(conditions, [_CODES[label] for label in labels], _CODES[default]).astype(np.int8)
+
+
+def _previous(values: np.ndarray, first: Any) -> np.ndarray:
+    """values shifted by one bar; bar 0 gets `first` (what the scalar code uses without a previous bar)."""
+    previous = np.empty_like(values)
+    if len(values):
+        previous[0] = values[0] if first is None else first
+        previous[1:] = values[:-1]
+    return previous
+
+
+def _slope(values: np.ndarray) -> np.ndarray:
+    """Percent change of a line versus the previous bar, 0 at bar 0 (as in _ema_result/_sma_result)."""
+    previous = _previous(values, None)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (values - previous) / previous * 100
+    if len(slope):
+        slope[0] = 0
+    return slope
+
+
+def _trend_signals(price: np.ndarray, line: np.ndarray) -> np.ndarray:
+    slope = _slope(line)
+    above = price > line
+    return _select(
+        [above & (slope > 0), above, slope < 0],
+        ['STRONG_BULLISH', 'BULLISH', 'STRONG_BEARISH'],
+        'BEARISH'
+    )
+
+
+def indicator_signals(prices: List[float], volumes: Optional[List[float]] = None,
+                      highs: Optional[List[float]] = None, lows: Optional[List[float]] = None,
+                      indicators: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    Signal code of every indicator at every bar.
+
+    Returns:
+        {indicator: int8 array of codes into SIGNAL_LABELS, -1 where the indicator is unavailable}
+    """
+    closes = np.asarray(prices, dtype=np.float64)
+    n = len(closes)
+    if indicators is None:
+        indicators = list(DEFAULT_INDICATORS) + (['volume'] if _has_values(volumes) else [])
+    bars = np.arange(1, n + 1)
+
+    signals = {}
+    for indicator in (name.lower() for name in indicators):
+        if indicator == 'rsi':
+            rsi = kernels.rsi_series(closes, 14)
+            codes = _select([rsi >= 70, rsi <= 30], ['OVERBOUGHT', 'OVERSOLD'], 'NEUTRAL')
+
+        elif indicator == 'macd':
+            macd_line, signal_line, histogram = kernels.macd_series(closes, 12, 26, 9)
+            prev_histogram = _previous(histogram, 0.0)
+            above, below = macd_line > signal_line, macd_line < signal_line
+            codes = _select(
+                [above & (prev_histogram <= 0) & (histogram > 0),
+                 below & (prev_histogram >= 0) & (histogram < 0),
+                 above],
+                ['BUY', 'SELL', 'BULLISH'],
+                'BEARISH'
+            )
+
+        elif indicator == 'bollinger':
+            upper, middle, lower = kernels.bollinger_series(closes, 20, 2)
+            codes = _select(
+                [closes >= upper, closes <= lower, closes > middle],
+                ['OVERBOUGHT', 'OVERSOLD', 'BULLISH'],
+                'BEARISH'
+            )
+
+        elif indicator == 'ema':
+            codes = _trend_signals(closes, kernels.ema(closes, 21))
+
+        elif indicator == 'sma':
+            codes = _trend_signals(closes, kernels.rolling_mean(closes, 20))
+
+        elif indicator == 'stochastic':
+            k_percent, d_percent = kernels.stochastic_series(
+                closes,
+                TechnicalIndicators._high_low(highs, closes),
+                TechnicalIndicators._high_low(lows, closes),
+                14, 3
+            )
+            prev_k, prev_d = _previous(k_percent, None), _previous(d_percent, None)
+            codes = _select(
+                [(k_percent >= 80) & (d_percent >= 80),
+                 (k_percent <= 20) & (d_percent <= 20),
+                 (k_percent > d_percent) & (prev_k <= prev_d),
+                 (k_percent < d_percent) & (prev_k >= prev_d),
+                 k_percent > d_percent],
+                ['OVERBOUGHT', 'OVERSOLD', 'BUY', 'SELL', 'BULLISH'],
+                'BEARISH'
+            )
+
+        elif indicator == 'volume' and _has_values(volumes):
+            volume_values = np.asarray(volumes, dtype=np.float64)
+            if len(volume_values) != n:
+                raise ValueError(f"volumes has {len(volume_values)} values, prices has {n}")
+            sma_volume = kernels.rolling_mean(volume_values, 20)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                volume_ratio = volume_values / sma_volume
+            rising = closes > _previous(closes, None)
+            codes = _select(
+                [(volume_ratio > 1.5) & rising, volume_ratio > 1.5,
+                 (volume_ratio > 1.2) & rising, volume_ratio > 1.2],
+                ['STRONG_BULLISH', 'STRONG_BEARISH', 'BULLISH', 'BEARISH'],
+                'NEUTRAL'
+            )
+            # _volume_result divides by the previous volume / price with Python floats,
+            # so a previous value of 0 ends in the {"error": ...} result
+            codes[1:][(volume_values[:-1] == 0) | (closes[:-1] == 0)] = -1
+
+        else:
+            continue
+
+        codes[bars < _BATCH_MIN_LENGTH[indicator]] = -1
+        signals[indicator] = codes
+
+    return signals
+
+
+def score_signals(signals: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Weighted score of every bar, as TechnicalIndicators._summarize does for the last one.
+
+    Returns:
+        overall_signal (int8 codes into OVERALL_LABELS), average_score, total_score,
+        valid_indicators and confidence (0-100), each one value per bar.
+    """
+    scored = [codes for name, codes in signals.items() if name not in _UNSCORED]
+    if scored:
+        codes = np.vstack(scored)
+        total_score = _WEIGHTS[codes].sum(axis=0)
+        valid_indicators = (codes >= 0).sum(axis=0)
+    else:
+        length = len(next(iter(signals.values()))) if signals else 0
+        total_score = np.zeros(length)
+        valid_indicators = np.zeros(length, dtype=np.int64)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        average_score = np.where(valid_indicators > 0, total_score / valid_indicators, 0.0)
+
+    overall_signal = np.select(
+        [valid_indicators == 0, average_score >= 1.5, average_score >= 0.5,
+         average_score <= -1.5, average_score <= -0.5],
+        [_OVERALL_CODES[label] for label in
+         ('UNKNOWN', 'STRONG_BULLISH', 'BULLISH', 'STRONG_BEARISH', 'BEARISH')],
+        _OVERALL_CODES['NEUTRAL']
+    ).astype(np.int8)
+
+    return {
+        "overall_signal": overall_signal,
+        "average_score": average_score,
+        "total_score": total_score.astype(np.int64),
+        "valid_indicators": valid_indicators,
+        "confidence": np.minimum(100, np.abs(average_score) * 30)
+    }
+
+
+def signal_series(prices: List[float], volumes: Optional[List[float]] = None,
+                  highs: Optional[List[float]] = None, lows: Optional[List[float]] = None,
+                  indicators: Optional[List[str]] = None) -> Dict[str, Any]:
+    """indicator_signals + score_signals: {'signals': {...}, 'overall_signal': ..., ...}"""
+    signals = indicator_signals(prices, volumes, highs, lows, indicators)
+    return {"signals": signals, **score_signals(signals)}
+
+
+def labels(codes: np.ndarray, names: tuple = SIGNAL_LABELS) -> np.ndarray:
+    """Codes -> label strings ('' for -1)."""
+    return np.append(np.array(names), '')[codes]
+
+
+def backtest(prices: List[float], overall_signal: np.ndarray, allow_short: bool = False,
+             fee: float = 0.0) -> Dict[str, Any]:
+    """
+    Trade the composite signal: go long at the close of a STRONG_BULLISH bar, go flat
+    (or short with allow_short) at the close of a STRONG_BEARISH bar, hold otherwise.
+
+    Args:
+        prices: Close prices.
+        overall_signal: Codes from score_signals.
+        allow_short: Short on STRONG_BEARISH instead of going flat.
+        fee: Fraction of equity paid per unit of position change.
+
+    Returns:
+        Dict with total / buy-and-hold return (%), max drawdown (%), trades and time in market (%).
+    """
+    closes = np.asarray(prices, dtype=np.float64)
+    target = np.full(len(closes), np.nan)
+    target[overall_signal == _OVERALL_CODES['STRONG_BULLISH']] = 1.0
+    target[overall_signal == _OVERALL_CODES['STRONG_BEARISH']] = -1.0 if allow_short else 0.0
+
+    # Forward-fill the last target, flat before the first one
+    last = np.where(np.isnan(target), 0, np.arange(len(target)))
+    np.maximum.accumulate(last, out=last)
+    position = np.nan_to_num(target[last]) if len(target) else target
+
+    returns = np.diff(closes) / closes[:-1]
+    changes = np.abs(np.diff(position, prepend=0.0))
+    strategy = position[:-1] * returns - fee * changes[:-1]
+    equity = np.cumprod(1 + strategy)
+    drawdown = 1 - equity / np.maximum.accumulate(equity) if len(equity) else equity
+
+    return {
+        "bars": int(len(closes)),
+        "total_return": round(float(equity[-1] - 1) * 100, 2) if len(equity) else 0.0,
+        "buy_and_hold_return": round(float(closes[-1] / closes[0] - 1) * 100, 2) if len(closes) > 1 else 0.0,
+        "max_drawdown": round(float(drawdown.max()) * 100, 2) if len(drawdown) else 0.0,
+        "trades": int(np.count_nonzero(changes[:-1])),
+        "time_in_market": round(float(np.mean(position[:-1] != 0)) * 100, 2) if len(position) > 1 else 0.0
+    }
+
+
+def load_closes(csv_file: str, years: Optional[float] = None) -> np.ndarray:
+    """Close prices from a date,close CSV (read through its market_data store), optionally only the last `years` years."""
+    data = open_store(csv_file)
+    start = None
+    if years is not None and len(data):
+        start = data.dates[-1] - np.timedelta64(int(years * 365.25), 'D')
+    return np.array(data.slice(start, columns=['close'])['close'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default='python/data/BTC.csv')
+    parser.add_argument('--years', type=float, default=None, help='Only the last N years')
+    parser.add_argument('--short', action='store_true', help='Short on STRONG_BEARISH instead of going flat')
+    parser.add_argument('--fee', type=float, default=0.0, help='Cost per unit of position change')
+    args = parser.parse_args()
+
+    closes = load_closes(args.csv, args.years)
+
+    start = time.perf_counter()
+    scores = signal_series(closes)
+    elapsed = time.perf_counter() - start
+
+    result = backtest(closes, scores['overall_signal'], args.short, args.fee)
+    result['signal_counts'] = {
+        label: int(np.count_nonzero(scores['overall_signal'] == code))
+        for code, label in enumerate(OVERALL_LABELS)
+    }
+    result['scoring_ms'] = round(elapsed * 1000, 2)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
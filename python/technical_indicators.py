@@ -1,16 +1,122 @@
+import os
 import sys
 import json
+import base64
+import struct
+import socketserver
+import threading
 import numpy as np
-import pandas as pd
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import warnings
+import indicator_kernels as kernels
+import indicator_sweep as sweeps
 warnings.filterwarnings('ignore')
 
+# Các chỉ báo mặc định khi không chỉ định (thêm 'volume' nếu có dữ liệu khối lượng)
+DEFAULT_INDICATORS = ['rsi', 'macd', 'bollinger', 'ema', 'sma', 'stochastic']
+
+# Thông báo khi chuỗi quá ngắn và độ dài tối thiểu với tham số mặc định
+INSUFFICIENT_DATA_ERRORS = {
+    'rsi': "Không đủ dữ liệu để tính RSI",
+    'macd': "Không đủ dữ liệu để tính MACD",
+    'bollinger': "Không đủ dữ liệu để tính Bollinger Bands",
+    'ema': "Không đủ dữ liệu để tính EMA",
+    'sma': "Không đủ dữ liệu để tính SMA",
+    'stochastic': "Không đủ dữ liệu để tính Stochastic",
+    'volume': "Không đủ dữ liệu để tính khối lượng giao dịch"
+}
+
+_BATCH_MIN_LENGTH = {
+    'rsi': 14 + 1,
+    'macd': 26 + 9,
+    'bollinger': 20,
+    'ema': 21,
+    'sma': 20,
+    'stochastic': 14 + 3,
+    'volume': 20
+}
+
+# Trọng số tín hiệu cho phân tích tổng hợp
+SIGNAL_WEIGHTS = {
+    'STRONG_BULLISH': 3,
+    'BULLISH': 2,
+    'BUY': 2,
+    'OVERSOLD': 1,
+    'NEUTRAL': 0,
+    'BEARISH': -2,
+    'SELL': -2,
+    'STRONG_BEARISH': -3,
+    'OVERBOUGHT': -1
+}
+
+
+# Định dạng input nhị phân (--binary / request "file"):
+#   b'TIND' + uint32 little-endian độ dài header + header JSON (đệm khoảng trắng tới bội số của 8 byte)
+#   + dữ liệu float64 little-endian theo cột: mỗi cột trong header["columns"] gồm header["length"] giá trị
+# Header ví dụ: {"indicator": "all", "length": 525600, "columns": ["prices", "volumes", "highs", "lows"]}
+BINARY_MAGIC = b'TIND'
+BINARY_COLUMNS = ('prices', 'volumes', 'highs', 'lows')
+_BINARY_DTYPE = np.dtype('<f8')
+
+
+def _has_values(values: Optional[Any]) -> bool:
+    """List hoặc mảng numpy có phần tử (thay cho `if volumes:` vốn lỗi với ndarray)"""
+    return values is not None and np.size(values) > 0
+
+
+def json_safe(value: Any) -> Any:
+    """
+    NaN / inf -> None trong dict, list và số numpy, để json.dumps(allow_nan=False) ra JSON hợp lệ
+    (JSON.parse bên Node không đọc được token NaN)
+    """
+    if isinstance(value, dict):
+        return {key: json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_safe(item) for item in value]
+    if isinstance(value, (float, np.floating)):
+        return float(value) if np.isfinite(value) else None
+    if isinstance(value, np.integer):
+        return int(value)
+    return value
+
+
+# Cách mã hóa chuỗi đầy đủ (cho biểu đồ) khi gọi calculate_indicator_series / batch với series_encoding
+SERIES_ENCODINGS = ('base64', 'list')
+
+
+def encode_series(values: np.ndarray, encoding: str = 'base64') -> Any:
+    """
+    Mã hóa một chuỗi chỉ báo đầy đủ:
+      'base64' - float32 little-endian dạng base64 (NaN giữ nguyên, ~5.3 byte/điểm)
+      'list'   - list số, NaN -> None
+    """
+    if encoding == 'base64':
+        return base64.b64encode(np.ascontiguousarray(values, dtype='<f4').tobytes()).decode('ascii')
+    if encoding == 'list':
+        return [None if np.isnan(v) else v for v in np.asarray(values, dtype=np.float64).tolist()]
+    raise ValueError(f"series_encoding phải là một trong {list(SERIES_ENCODINGS)}")
+
+
+def decode_series(data: Any) -> np.ndarray:
+    """Ngược lại của encode_series"""
+    if isinstance(data, str):
+        return np.frombuffer(base64.b64decode(data), dtype='<f4').astype(np.float64)
+    return np.array([np.nan if v is None else v for v in data], dtype=np.float64)
+
+
+def _history(values: np.ndarray, decimals: int, count: int = 10) -> List[float]:
+    """
+    `count` giá trị hợp lệ cuối cùng của một chuỗi chỉ báo (bỏ NaN, làm tròn)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    return np.round(values[~np.isnan(values)], decimals).tolist()[-count:]
+
+
 class TechnicalIndicators:
     """
     Lớp tính toán các chỉ báo kỹ thuật cho crypto
     """
-    
+
     @staticmethod
     def calculate_rsi(prices: List[float], period: int = 14) -> Dict[str, Any]:
         """
@@ -20,45 +126,43 @@ class TechnicalIndicators:
         """
         try:
             if len(prices) < period + 1:
-                return {"error": "Không đủ dữ liệu để tính RSI"}
-            
-            df = pd.DataFrame({'price': prices})
-            delta = df['price'].diff()
-            
-            gain = delta.where(delta > 0, 0)
-            loss = -delta.where(delta < 0, 0)
-            
-            avg_gain = gain.ewm(alpha=1/period, min_periods=period).mean()
-            avg_loss = loss.ewm(alpha=1/period, min_periods=period).mean()
-    
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-            
-            current_rsi = rsi.iloc[-1]
-            
-            # Phân tích RSI - SỬA LẠI: RSI >= 70 là quá mua, RSI <= 30 là quá bán
-            if current_rsi >= 70:
-                signal = "OVERBOUGHT"
-                message = "Vùng quá mua - Có thể bán"
-            elif current_rsi <= 30:
-                signal = "OVERSOLD"
-                message = "Vùng quá bán - Có thể mua"
-            else:
-                signal = "NEUTRAL"
-                message = "Vùng trung tính"
-            
-            return {
-                "indicator": "RSI",
-                "value": round(current_rsi, 2),
-                "signal": signal,
-                "message": message,
-                "period": period,
-                "history": rsi.dropna().round(2).tolist()[-10:]
-            }
-            
+                return {"error": INSUFFICIENT_DATA_ERRORS['rsi']}
+
+            # Làm mượt Wilder (alpha = 1/period) trên chênh lệch giá
+            rsi = kernels.rsi_series(prices, period)
+
+            return TechnicalIndicators._rsi_result(rsi, period)
+
         except Exception as e:
             return {"error": f"Lỗi tính RSI: {str(e)}"}
-    
+
+    @staticmethod
+    def _rsi_result(rsi: np.ndarray, period: int) -> Dict[str, Any]:
+        """
+        Phân tích chuỗi RSI đã tính
+        """
+        current_rsi = rsi[-1]
+
+        # Phân tích RSI - SỬA LẠI: RSI >= 70 là quá mua, RSI <= 30 là quá bán
+        if current_rsi >= 70:
+            signal = "OVERBOUGHT"
+            message = "Vùng quá mua - Có thể bán"
+        elif current_rsi <= 30:
+            signal = "OVERSOLD"
+            message = "Vùng quá bán - Có thể mua"
+        else:
+            signal = "NEUTRAL"
+            message = "Vùng trung tính"
+
+        return {
+            "indicator": "RSI",
+            "value": round(current_rsi, 2),
+            "signal": signal,
+            "message": message,
+            "period": period,
+            "history": _history(rsi, 2)
+        }
+
     @staticmethod
     def calculate_macd(prices: List[float], fast_period: int = 12, slow_period: int = 26, signal_period: int = 9) -> Dict[str, Any]:
         """
@@ -66,55 +170,56 @@ class TechnicalIndicators:
         """
         try:
             if len(prices) < slow_period + signal_period:
-                return {"error": "Không đủ dữ liệu để tính MACD"}
-            
-            df = pd.DataFrame({'price': prices})
-            
-            # Tính EMA
-            ema_fast = df['price'].ewm(span=fast_period).mean()
-            ema_slow = df['price'].ewm(span=slow_period).mean()
-            
-            # Tính MACD
-            macd_line = ema_fast - ema_slow
-            signal_line = macd_line.ewm(span=signal_period).mean()
-            histogram = macd_line - signal_line
-            
-            current_macd = macd_line.iloc[-1]
-            current_signal = signal_line.iloc[-1]
-            current_histogram = histogram.iloc[-1]
-            prev_histogram = histogram.iloc[-2] if len(histogram) > 1 else 0
-            
-            # Phân tích MACD
-            if current_macd > current_signal and prev_histogram <= 0 and current_histogram > 0:
-                signal = "BUY"
-                message = "MACD cắt lên Signal - Tín hiệu mua mạnh"
-            elif current_macd < current_signal and prev_histogram >= 0 and current_histogram < 0:
-                signal = "SELL"
-                message = "MACD cắt xuống Signal - Tín hiệu bán mạnh"
-            elif current_macd > current_signal:
-                signal = "BULLISH"
-                message = "MACD trên Signal - Xu hướng tăng"
-            else:
-                signal = "BEARISH"
-                message = "MACD dưới Signal - Xu hướng giảm"
-            
-            return {
-                "indicator": "MACD",
-                "macd": round(current_macd, 4),
-                "signal": round(current_signal, 4),
-                "histogram": round(current_histogram, 4),
-                "trend": signal,
-                "message": message,
-                "history": {
-                    "macd": macd_line.dropna().round(4).tolist()[-10:],
-                    "signal": signal_line.dropna().round(4).tolist()[-10:],
-                    "histogram": histogram.dropna().round(4).tolist()[-10:]
-                }
-            }
-            
+                return {"error": INSUFFICIENT_DATA_ERRORS['macd']}
+
+            # MACD = EMA nhanh - EMA chậm, Signal = EMA của MACD
+            macd_line, signal_line, histogram = kernels.macd_series(
+                prices, fast_period, slow_period, signal_period
+            )
+
+            return TechnicalIndicators._macd_result(macd_line, signal_line, histogram)
+
         except Exception as e:
             return {"error": f"Lỗi tính MACD: {str(e)}"}
-    
+
+    @staticmethod
+    def _macd_result(macd_line: np.ndarray, signal_line: np.ndarray, histogram: np.ndarray) -> Dict[str, Any]:
+        """
+        Phân tích chuỗi MACD đã tính
+        """
+        current_macd = macd_line[-1]
+        current_signal = signal_line[-1]
+        current_histogram = histogram[-1]
+        prev_histogram = histogram[-2] if len(histogram) > 1 else 0
+
+        # Phân tích MACD
+        if current_macd > current_signal and prev_histogram <= 0 and current_histogram > 0:
+            signal = "BUY"
+            message = "MACD cắt lên Signal - Tín hiệu mua mạnh"
+        elif current_macd < current_signal and prev_histogram >= 0 and current_histogram < 0:
+            signal = "SELL"
+            message = "MACD cắt xuống Signal - Tín hiệu bán mạnh"
+        elif current_macd > current_signal:
+            signal = "BULLISH"
+            message = "MACD trên Signal - Xu hướng tăng"
+        else:
+            signal = "BEARISH"
+            message = "MACD dưới Signal - Xu hướng giảm"
+
+        return {
+            "indicator": "MACD",
+            "macd": round(current_macd, 4),
+            "signal": round(current_signal, 4),
+            "histogram": round(current_histogram, 4),
+            "trend": signal,
+            "message": message,
+            "history": {
+                "macd": _history(macd_line, 4),
+                "signal": _history(signal_line, 4),
+                "histogram": _history(histogram, 4)
+            }
+        }
+
     @staticmethod
     def calculate_bollinger_bands(prices: List[float], period: int = 20, std_dev: float = 2) -> Dict[str, Any]:
         """
@@ -122,53 +227,51 @@ class TechnicalIndicators:
         """
         try:
             if len(prices) < period:
-                return {"error": "Không đủ dữ liệu để tính Bollinger Bands"}
-            
-            df = pd.DataFrame({'price': prices})
-            
-            # Tính SMA và standard deviation
-            sma = df['price'].rolling(window=period).mean()
-            std = df['price'].rolling(window=period).std()
-            
-            upper_band = sma + (std * std_dev)
-            lower_band = sma - (std * std_dev)
-            
-            current_price = prices[-1]
-            current_upper = upper_band.iloc[-1]
-            current_lower = lower_band.iloc[-1]
-            current_middle = sma.iloc[-1]
-            
-            # Phân tích Bollinger Bands
-            band_position = (current_price - current_lower) / (current_upper - current_lower)
-            
-            if current_price >= current_upper:
-                signal = "OVERBOUGHT"
-                message = "Giá chạm band trên - Có thể quá mua"
-            elif current_price <= current_lower:
-                signal = "OVERSOLD"
-                message = "Giá chạm band dưới - Có thể quá bán"
-            elif current_price > current_middle:
-                signal = "BULLISH"
-                message = "Giá trên đường giữa - Xu hướng tăng"
-            else:
-                signal = "BEARISH"
-                message = "Giá dưới đường giữa - Xu hướng giảm"
-            
-            return {
-                "indicator": "BOLLINGER_BANDS",
-                "current_price": round(current_price, 2),
-                "upper_band": round(current_upper, 2),
-                "middle_band": round(current_middle, 2),
-                "lower_band": round(current_lower, 2),
-                "signal": signal,
-                "message": message,
-                "bandwidth": round(((current_upper - current_lower) / current_middle) * 100, 2),
-                "band_position": round(band_position, 2)
-            }
-            
+                return {"error": INSUFFICIENT_DATA_ERRORS['bollinger']}
+
+            # SMA và độ lệch chuẩn trên cửa sổ cuối
+            upper_band, sma, lower_band = kernels.bollinger_series(prices, period, std_dev)
+
+            return TechnicalIndicators._bollinger_result(
+                prices[-1], upper_band[-1], sma[-1], lower_band[-1]
+            )
+
         except Exception as e:
             return {"error": f"Lỗi tính Bollinger Bands: {str(e)}"}
-    
+
+    @staticmethod
+    def _bollinger_result(current_price: float, current_upper: float, current_middle: float,
+                          current_lower: float) -> Dict[str, Any]:
+        """
+        Phân tích giá hiện tại so với Bollinger Bands
+        """
+        band_position = (current_price - current_lower) / (current_upper - current_lower)
+
+        if current_price >= current_upper:
+            signal = "OVERBOUGHT"
+            message = "Giá chạm band trên - Có thể quá mua"
+        elif current_price <= current_lower:
+            signal = "OVERSOLD"
+            message = "Giá chạm band dưới - Có thể quá bán"
+        elif current_price > current_middle:
+            signal = "BULLISH"
+            message = "Giá trên đường giữa - Xu hướng tăng"
+        else:
+            signal = "BEARISH"
+            message = "Giá dưới đường giữa - Xu hướng giảm"
+
+        return {
+            "indicator": "BOLLINGER_BANDS",
+            "current_price": round(current_price, 2),
+            "upper_band": round(current_upper, 2),
+            "middle_band": round(current_middle, 2),
+            "lower_band": round(current_lower, 2),
+            "signal": signal,
+            "message": message,
+            "bandwidth": round(((current_upper - current_lower) / current_middle) * 100, 2),
+            "band_position": round(band_position, 2)
+        }
+
     @staticmethod
     def calculate_ema(prices: List[float], period: int = 21) -> Dict[str, Any]:
         """
@@ -176,49 +279,54 @@ class TechnicalIndicators:
         """
         try:
             if len(prices) < period:
-                return {"error": "Không đủ dữ liệu để tính EMA"}
-            
-            df = pd.DataFrame({'price': prices})
-            ema = df['price'].ewm(span=period).mean()
-            
-            current_price = prices[-1]
-            current_ema = ema.iloc[-1]
-            
-            # Tính độ dốc của EMA
-            if len(ema) >= 2:
-                ema_slope = (ema.iloc[-1] - ema.iloc[-2]) / ema.iloc[-2] * 100
-            else:
-                ema_slope = 0
-            
-            # Phân tích EMA
-            if current_price > current_ema:
-                if ema_slope > 0:
-                    signal = "STRONG_BULLISH"
-                    message = f"Giá trên EMA{period} và EMA đang tăng - Xu hướng tăng mạnh"
-                else:
-                    signal = "BULLISH"
-                    message = f"Giá trên EMA{period} - Xu hướng tăng"
-            else:
-                if ema_slope < 0:
-                    signal = "STRONG_BEARISH"
-                    message = f"Giá dưới EMA{period} và EMA đang giảm - Xu hướng giảm mạnh"
-                else:
-                    signal = "BEARISH"
-                    message = f"Giá dưới EMA{period} - Xu hướng giảm"
-            
-            return {
-                "indicator": f"EMA_{period}",
-                "current_price": round(current_price, 2),
-                "ema_value": round(current_ema, 2),
-                "signal": signal,
-                "message": message,
-                "ema_slope": round(ema_slope, 4),
-                "history": ema.dropna().round(2).tolist()[-10:]
-            }
-            
+                return {"error": INSUFFICIENT_DATA_ERRORS['ema']}
+
+            ema = kernels.ema(prices, period)
+
+            return TechnicalIndicators._ema_result(prices[-1], ema, period)
+
         except Exception as e:
             return {"error": f"Lỗi tính EMA: {str(e)}"}
-    
+
+    @staticmethod
+    def _ema_result(current_price: float, ema: np.ndarray, period: int) -> Dict[str, Any]:
+        """
+        Phân tích giá hiện tại so với chuỗi EMA đã tính
+        """
+        current_ema = ema[-1]
+
+        # Tính độ dốc của EMA
+        if len(ema) >= 2:
+            ema_slope = (ema[-1] - ema[-2]) / ema[-2] * 100
+        else:
+            ema_slope = 0
+
+        # Phân tích EMA
+        if current_price > current_ema:
+            if ema_slope > 0:
+                signal = "STRONG_BULLISH"
+                message = f"Giá trên EMA{period} và EMA đang tăng - Xu hướng tăng mạnh"
+            else:
+                signal = "BULLISH"
+                message = f"Giá trên EMA{period} - Xu hướng tăng"
+        else:
+            if ema_slope < 0:
+                signal = "STRONG_BEARISH"
+                message = f"Giá dưới EMA{period} và EMA đang giảm - Xu hướng giảm mạnh"
+            else:
+                signal = "BEARISH"
+                message = f"Giá dưới EMA{period} - Xu hướng giảm"
+
+        return {
+            "indicator": f"EMA_{period}",
+            "current_price": round(current_price, 2),
+            "ema_value": round(current_ema, 2),
+            "signal": signal,
+            "message": message,
+            "ema_slope": round(ema_slope, 4),
+            "history": _history(ema, 2)
+        }
+
     @staticmethod
     def calculate_sma(prices: List[float], period: int = 20) -> Dict[str, Any]:
         """
@@ -226,49 +334,54 @@ class TechnicalIndicators:
         """
         try:
             if len(prices) < period:
-                return {"error": "Không đủ dữ liệu để tính SMA"}
-            
-            df = pd.DataFrame({'price': prices})
-            sma = df['price'].rolling(window=period).mean()
-            
-            current_price = prices[-1]
-            current_sma = sma.iloc[-1]
-            
-            # Tính độ dốc của SMA
-            if len(sma) >= 2:
-                sma_slope = (sma.iloc[-1] - sma.iloc[-2]) / sma.iloc[-2] * 100
-            else:
-                sma_slope = 0
-            
-            # Phân tích SMA
-            if current_price > current_sma:
-                if sma_slope > 0:
-                    signal = "STRONG_BULLISH"
-                    message = f"Giá trên SMA{period} và SMA đang tăng - Xu hướng tăng mạnh"
-                else:
-                    signal = "BULLISH"
-                    message = f"Giá trên SMA{period} - Xu hướng tăng"
-            else:
-                if sma_slope < 0:
-                    signal = "STRONG_BEARISH"
-                    message = f"Giá dưới SMA{period} và SMA đang giảm - Xu hướng giảm mạnh"
-                else:
-                    signal = "BEARISH"
-                    message = f"Giá dưới SMA{period} - Xu hướng giảm"
-            
-            return {
-                "indicator": f"SMA_{period}",
-                "current_price": round(current_price, 2),
-                "sma_value": round(current_sma, 2),
-                "signal": signal,
-                "message": message,
-                "sma_slope": round(sma_slope, 4),
-                "history": sma.dropna().round(2).tolist()[-10:]
-            }
-            
+                return {"error": INSUFFICIENT_DATA_ERRORS['sma']}
+
+            sma = kernels.rolling_mean(prices, period)
+
+            return TechnicalIndicators._sma_result(prices[-1], sma, period)
+
         except Exception as e:
             return {"error": f"Lỗi tính SMA: {str(e)}"}
-    
+
+    @staticmethod
+    def _sma_result(current_price: float, sma: np.ndarray, period: int) -> Dict[str, Any]:
+        """
+        Phân tích giá hiện tại so với chuỗi SMA đã tính
+        """
+        current_sma = sma[-1]
+
+        # Tính độ dốc của SMA
+        if len(sma) >= 2:
+            sma_slope = (sma[-1] - sma[-2]) / sma[-2] * 100
+        else:
+            sma_slope = 0
+
+        # Phân tích SMA
+        if current_price > current_sma:
+            if sma_slope > 0:
+                signal = "STRONG_BULLISH"
+                message = f"Giá trên SMA{period} và SMA đang tăng - Xu hướng tăng mạnh"
+            else:
+                signal = "BULLISH"
+                message = f"Giá trên SMA{period} - Xu hướng tăng"
+        else:
+            if sma_slope < 0:
+                signal = "STRONG_BEARISH"
+                message = f"Giá dưới SMA{period} và SMA đang giảm - Xu hướng giảm mạnh"
+            else:
+                signal = "BEARISH"
+                message = f"Giá dưới SMA{period} - Xu hướng giảm"
+
+        return {
+            "indicator": f"SMA_{period}",
+            "current_price": round(current_price, 2),
+            "sma_value": round(current_sma, 2),
+            "signal": signal,
+            "message": message,
+            "sma_slope": round(sma_slope, 4),
+            "history": _history(sma, 2)
+        }
+
     @staticmethod
     def calculate_volume(prices: List[float], volumes: List[float], period: int = 20) -> Dict[str, Any]:
         """
@@ -276,60 +389,67 @@ class TechnicalIndicators:
         """
         try:
             if len(volumes) < period:
-                return {"error": "Không đủ dữ liệu để tính khối lượng giao dịch"}
-            
-            df = pd.DataFrame({'volume': volumes, 'price': prices})
-            sma_volume = df['volume'].rolling(window=period).mean()
-            
-            current_volume = volumes[-1]
-            current_sma_volume = sma_volume.iloc[-1]
-            
-            # Tính Volume Rate of Change
-            if len(volumes) >= 2:
-                volume_roc = (current_volume - volumes[-2]) / volumes[-2] * 100
-            else:
-                volume_roc = 0
-            
-            # Tính tỷ lệ volume so với trung bình
-            volume_ratio = current_volume / current_sma_volume
-            
-            # Phân tích khối lượng với price action
-            price_change = (prices[-1] - prices[-2]) / prices[-2] * 100 if len(prices) >= 2 else 0
-            
-            if volume_ratio > 1.5:  # Volume cao hơn 50% so với trung bình
-                if price_change > 0:
-                    signal = "STRONG_BULLISH"
-                    message = "Khối lượng cao với giá tăng - Tín hiệu tăng mạnh"
-                else:
-                    signal = "STRONG_BEARISH"
-                    message = "Khối lượng cao với giá giảm - Tín hiệu giảm mạnh"
-            elif volume_ratio > 1.2:  # Volume cao hơn 20% so với trung bình
-                if price_change > 0:
-                    signal = "BULLISH"
-                    message = "Khối lượng tăng với giá tăng - Tín hiệu tăng"
-                else:
-                    signal = "BEARISH"
-                    message = "Khối lượng tăng với giá giảm - Tín hiệu giảm"
-            else:
-                signal = "NEUTRAL"
-                message = "Khối lượng thấp - Tín hiệu không rõ ràng"
-            
-            return {
-                "indicator": f"VOLUME_{period}",
-                "current_volume": round(current_volume, 2),
-                "sma_volume": round(current_sma_volume, 2),
-                "volume_ratio": round(volume_ratio, 2),
-                "volume_roc": round(volume_roc, 2),
-                "signal": signal,
-                "message": message,
-                "history": sma_volume.dropna().round(2).tolist()[-10:]
-            }
-            
+                return {"error": INSUFFICIENT_DATA_ERRORS['volume']}
+
+            sma_volume = kernels.rolling_mean(volumes, period)
+
+            return TechnicalIndicators._volume_result(prices, volumes, sma_volume, period)
+
         except Exception as e:
             return {"error": f"Lỗi tính khối lượng giao dịch: {str(e)}"}
-    
+
     @staticmethod
-    def calculate_stochastic(prices: List[float], highs: Optional[List[float]] = None, 
+    def _volume_result(prices: List[float], volumes: List[float], sma_volume: np.ndarray,
+                       period: int) -> Dict[str, Any]:
+        """
+        Phân tích khối lượng hiện tại so với trung bình khối lượng đã tính
+        """
+        current_volume = volumes[-1]
+        current_sma_volume = sma_volume[-1]
+
+        # Tính Volume Rate of Change
+        if len(volumes) >= 2:
+            volume_roc = (current_volume - volumes[-2]) / volumes[-2] * 100
+        else:
+            volume_roc = 0
+
+        # Tính tỷ lệ volume so với trung bình
+        volume_ratio = current_volume / current_sma_volume
+
+        # Phân tích khối lượng với price action
+        price_change = (prices[-1] - prices[-2]) / prices[-2] * 100 if len(prices) >= 2 else 0
+
+        if volume_ratio > 1.5:  # Volume cao hơn 50% so với trung bình
+            if price_change > 0:
+                signal = "STRONG_BULLISH"
+                message = "Khối lượng cao với giá tăng - Tín hiệu tăng mạnh"
+            else:
+                signal = "STRONG_BEARISH"
+                message = "Khối lượng cao với giá giảm - Tín hiệu giảm mạnh"
+        elif volume_ratio > 1.2:  # Volume cao hơn 20% so với trung bình
+            if price_change > 0:
+                signal = "BULLISH"
+                message = "Khối lượng tăng với giá tăng - Tín hiệu tăng"
+            else:
+                signal = "BEARISH"
+                message = "Khối lượng tăng với giá giảm - Tín hiệu giảm"
+        else:
+            signal = "NEUTRAL"
+            message = "Khối lượng thấp - Tín hiệu không rõ ràng"
+
+        return {
+            "indicator": f"VOLUME_{period}",
+            "current_volume": round(current_volume, 2),
+            "sma_volume": round(current_sma_volume, 2),
+            "volume_ratio": round(volume_ratio, 2),
+            "volume_roc": round(volume_roc, 2),
+            "signal": signal,
+            "message": message,
+            "history": _history(sma_volume, 2)
+        }
+
+    @staticmethod
+    def calculate_stochastic(prices: List[float], highs: Optional[List[float]] = None,
                         lows: Optional[List[float]] = None, k_period: int = 14, d_period: int = 3) -> Dict[str, Any]:
         """
         Tính Stochastic Oscillator
@@ -338,78 +458,82 @@ class TechnicalIndicators:
         """
         try:
             if len(prices) < k_period + d_period:
-                return {"error": "Không đủ dữ liệu để tính Stochastic"}
-            
-            df = pd.DataFrame({
-                'close': prices,
-                'high': highs if highs else prices,
-                'low': lows if lows else prices
-            })
-            
-            # Tính %K
-            lowest_low = df['low'].rolling(window=k_period).min()
-            highest_high = df['high'].rolling(window=k_period).max()
-            
-            k_percent = ((df['close'] - lowest_low) / (highest_high - lowest_low)) * 100
-            d_percent = k_percent.rolling(window=d_period).mean()
-            
-            current_k = k_percent.iloc[-1]
-            current_d = d_percent.iloc[-1]
-            
-            # Phân tích Stochastic với crossover
-            prev_k = k_percent.iloc[-2] if len(k_percent) > 1 else current_k
-            prev_d = d_percent.iloc[-2] if len(d_percent) > 1 else current_d
-            
-            if current_k >= 80 and current_d >= 80:
-                signal = "OVERBOUGHT"
-                message = "Stochastic trong vùng quá mua - Có thể bán"
-            elif current_k <= 20 and current_d <= 20:
-                signal = "OVERSOLD"
-                message = "Stochastic trong vùng quá bán - Có thể mua"
-            elif current_k > current_d and prev_k <= prev_d:
-                signal = "BUY"
-                message = "%K cắt lên %D - Tín hiệu mua"
-            elif current_k < current_d and prev_k >= prev_d:
-                signal = "SELL"
-                message = "%K cắt xuống %D - Tín hiệu bán"
-            elif current_k > current_d:
-                signal = "BULLISH"
-                message = "%K trên %D - Xu hướng tăng"
-            else:
-                signal = "BEARISH"
-                message = "%K dưới %D - Xu hướng giảm"
-            
-            return {
-                "indicator": "STOCHASTIC",
-                "k_percent": round(current_k, 2),
-                "d_percent": round(current_d, 2),
-                "signal": signal,
-                "message": message,
-                "k_period": k_period,
-                "d_period": d_period,
-                "history": {
-                    "k_percent": k_percent.dropna().round(2).tolist()[-10:],
-                    "d_percent": d_percent.dropna().round(2).tolist()[-10:]
-                }
-            }
-            
+                return {"error": INSUFFICIENT_DATA_ERRORS['stochastic']}
+
+            closes = np.asarray(prices, dtype=np.float64)
+            high_values = TechnicalIndicators._high_low(highs, closes)
+            low_values = TechnicalIndicators._high_low(lows, closes)
+
+            # %K từ đáy/đỉnh của cửa sổ trượt, %D = SMA của %K
+            k_percent, d_percent = kernels.stochastic_series(
+                closes, high_values, low_values, k_period, d_period
+            )
+
+            return TechnicalIndicators._stochastic_result(k_percent, d_percent, k_period, d_period)
+
         except Exception as e:
             return {"error": f"Lỗi tính Stochastic: {str(e)}"}
-    
+
     @staticmethod
-    def calculate_multiple_indicators(prices: List[float], volumes: Optional[List[float]] = None, 
+    def _stochastic_result(k_percent: np.ndarray, d_percent: np.ndarray,
+                           k_period: int, d_period: int) -> Dict[str, Any]:
+        """
+        Phân tích chuỗi %K / %D đã tính
+        """
+        current_k = k_percent[-1]
+        current_d = d_percent[-1]
+
+        # Phân tích Stochastic với crossover
+        prev_k = k_percent[-2] if len(k_percent) > 1 else current_k
+        prev_d = d_percent[-2] if len(d_percent) > 1 else current_d
+
+        if current_k >= 80 and current_d >= 80:
+            signal = "OVERBOUGHT"
+            message = "Stochastic trong vùng quá mua - Có thể bán"
+        elif current_k <= 20 and current_d <= 20:
+            signal = "OVERSOLD"
+            message = "Stochastic trong vùng quá bán - Có thể mua"
+        elif current_k > current_d and prev_k <= prev_d:
+            signal = "BUY"
+            message = "%K cắt lên %D - Tín hiệu mua"
+        elif current_k < current_d and prev_k >= prev_d:
+            signal = "SELL"
+            message = "%K cắt xuống %D - Tín hiệu bán"
+        elif current_k > current_d:
+            signal = "BULLISH"
+            message = "%K trên %D - Xu hướng tăng"
+        else:
+            signal = "BEARISH"
+            message = "%K dưới %D - Xu hướng giảm"
+
+        return {
+            "indicator": "STOCHASTIC",
+            "k_percent": round(current_k, 2),
+            "d_percent": round(current_d, 2),
+            "signal": signal,
+            "message": message,
+            "k_period": k_period,
+            "d_period": d_period,
+            "history": {
+                "k_percent": _history(k_percent, 2),
+                "d_percent": _history(d_percent, 2)
+            }
+        }
+
+    @staticmethod
+    def calculate_multiple_indicators(prices: List[float], volumes: Optional[List[float]] = None,
                                     highs: Optional[List[float]] = None, lows: Optional[List[float]] = None,
                                     indicators: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Tính nhiều chỉ báo cùng lúc và đưa ra phân tích tổng hợp
         """
         if indicators is None:
-            indicators = ['rsi', 'macd', 'bollinger', 'ema', 'sma', 'stochastic']
-            if volumes:
+            indicators = list(DEFAULT_INDICATORS)
+            if _has_values(volumes):
                 indicators.append('volume')
-        
+
         results = {}
-        
+
         for indicator in indicators:
             try:
                 if indicator.lower() == 'rsi':
@@ -424,28 +548,191 @@ class TechnicalIndicators:
                     results['sma'] = TechnicalIndicators.calculate_sma(prices)
                 elif indicator.lower() == 'stochastic':
                     results['stochastic'] = TechnicalIndicators.calculate_stochastic(prices, highs, lows)
-                elif indicator.lower() == 'volume' and volumes:
+                elif indicator.lower() == 'volume' and _has_values(volumes):
                     results['volume'] = TechnicalIndicators.calculate_volume(prices, volumes)
             except Exception as e:
                 results[indicator] = {"error": f"Lỗi tính {indicator}: {str(e)}"}
-        
-        # Phân tích tổng hợp với trọng số
-        signal_weights = {
-            'STRONG_BULLISH': 3,
-            'BULLISH': 2,
-            'BUY': 2,
-            'OVERSOLD': 1,
-            'NEUTRAL': 0,
-            'BEARISH': -2,
-            'SELL': -2,
-            'STRONG_BEARISH': -3,
-            'OVERBOUGHT': -1
+
+        results['summary'] = TechnicalIndicators._summarize(results)
+
+        return results
+
+    @staticmethod
+    def calculate_batch_indicators(symbols: Dict[str, Dict[str, Any]],
+                                   indicators: Optional[List[str]] = None,
+                                   series_encoding: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Tính nhiều chỉ báo cho nhiều symbol trong một lần
+        symbols: {"BTC": {"prices": [...], "volumes": [...], "highs": [...], "lows": [...]}, ...}
+
+        Các chuỗi có độ dài khác nhau được căn phải và đệm NaN thành một mảng 2-D
+        (n_symbols, T); mỗi chỉ báo được tính một lần cho cả mảng bằng indicator_kernels.
+        Kết quả của mỗi symbol có cùng dạng với calculate_multiple_indicators.
+
+        series_encoding ('base64' hoặc 'list'): thêm key 'series' chứa toàn bộ chuỗi của các chỉ báo
+        đã tính, để vẽ biểu đồ mà không phải gọi tính lại.
+        """
+        if series_encoding is not None and series_encoding not in SERIES_ENCODINGS:
+            raise ValueError(f"series_encoding phải là một trong {list(SERIES_ENCODINGS)}")
+
+        names = list(symbols.keys())
+        closes = [np.asarray(symbols[name]['prices'], dtype=np.float64) for name in names]
+        volumes = [symbols[name].get('volumes') for name in names]
+
+        highs, lows, high_low_errors = [], [], {}
+        for name, close in zip(names, closes):
+            try:
+                high = TechnicalIndicators._high_low(symbols[name].get('highs'), close)
+                low = TechnicalIndicators._high_low(symbols[name].get('lows'), close)
+            except ValueError as e:
+                high = low = close
+                high_low_errors[name] = str(e)
+            highs.append(high)
+            lows.append(low)
+
+        # Danh sách chỉ báo của từng symbol
+        requested = {}
+        for name, volume in zip(names, volumes):
+            if indicators is None:
+                requested[name] = list(DEFAULT_INDICATORS) + (['volume'] if _has_values(volume) else [])
+            else:
+                requested[name] = list(indicators)
+        needed = {indicator.lower() for symbol_indicators in requested.values() for indicator in symbol_indicators}
+
+        # Tính tất cả chuỗi chỉ báo trên mảng 2-D (tham số mặc định như calculate_multiple_indicators)
+        price_matrix = kernels.pad_series(closes)
+        series = {}
+        if 'rsi' in needed:
+            series['rsi'] = kernels.rsi_series(price_matrix, 14)
+        if 'macd' in needed:
+            series['macd'] = kernels.macd_series(price_matrix, 12, 26, 9)
+        if 'bollinger' in needed:
+            series['bollinger'] = kernels.bollinger_series(price_matrix, 20, 2)
+        if 'ema' in needed:
+            series['ema'] = kernels.ema(price_matrix, 21)
+        if 'sma' in needed:
+            series['sma'] = kernels.rolling_mean(price_matrix, 20)
+        if 'stochastic' in needed:
+            series['stochastic'] = kernels.stochastic_series(
+                price_matrix, kernels.pad_series(highs), kernels.pad_series(lows), 14, 3
+            )
+        if 'volume' in needed:
+            series['volume'] = kernels.rolling_mean(kernels.pad_series(volumes), 20)
+
+        batch_results = {}
+        for row, name in enumerate(names):
+            prices = closes[row].tolist()
+            n = len(prices)
+            results = {}
+
+            for indicator in requested[name]:
+                key = indicator.lower()
+                try:
+                    if key == 'volume' and not _has_values(volumes[row]):
+                        continue
+                    if key not in _BATCH_MIN_LENGTH:
+                        continue
+
+                    length = len(volumes[row]) if key == 'volume' else n
+                    if length < _BATCH_MIN_LENGTH[key]:
+                        results[key] = {"error": INSUFFICIENT_DATA_ERRORS[key]}
+                    elif key == 'rsi':
+                        results['rsi'] = TechnicalIndicators._rsi_result(series['rsi'][row, -n:], 14)
+                    elif key == 'macd':
+                        macd_line, signal_line, histogram = (s[row, -n:] for s in series['macd'])
+                        results['macd'] = TechnicalIndicators._macd_result(macd_line, signal_line, histogram)
+                    elif key == 'bollinger':
+                        upper, middle, lower = (s[row, -1] for s in series['bollinger'])
+                        results['bollinger'] = TechnicalIndicators._bollinger_result(prices[-1], upper, middle, lower)
+                    elif key == 'ema':
+                        results['ema'] = TechnicalIndicators._ema_result(prices[-1], series['ema'][row, -n:], 21)
+                    elif key == 'sma':
+                        results['sma'] = TechnicalIndicators._sma_result(prices[-1], series['sma'][row, -n:], 20)
+                    elif key == 'stochastic':
+                        if name in high_low_errors:
+                            results['stochastic'] = {"error": f"Lỗi tính Stochastic: {high_low_errors[name]}"}
+                        else:
+                            k_percent, d_percent = (s[row, -n:] for s in series['stochastic'])
+                            results['stochastic'] = TechnicalIndicators._stochastic_result(k_percent, d_percent, 14, 3)
+                    elif key == 'volume':
+                        volume_list = list(volumes[row])
+                        results['volume'] = TechnicalIndicators._volume_result(
+                            prices, volume_list, series['volume'][row, -length:], 20
+                        )
+                except Exception as e:
+                    results[indicator] = {"error": f"Lỗi tính {indicator}: {str(e)}"}
+
+            results['summary'] = TechnicalIndicators._summarize(results)
+            if series_encoding is not None:
+                results['series'] = TechnicalIndicators._series_output(
+                    series, results, row, n, len(volumes[row]) if _has_values(volumes[row]) else 0, series_encoding
+                )
+            batch_results[name] = results
+
+        return batch_results
+
+    @staticmethod
+    def calculate_indicator_series(prices: List[float], volumes: Optional[List[float]] = None,
+                                   highs: Optional[List[float]] = None, lows: Optional[List[float]] = None,
+                                   indicators: Optional[List[str]] = None,
+                                   encoding: str = 'base64') -> Dict[str, Any]:
+        """
+        Như calculate_multiple_indicators, kèm theo key 'series' chứa toàn bộ chuỗi chỉ báo
+        (cùng một lần tính phục vụ cả phân tích tổng hợp lẫn biểu đồ)
+        """
+        symbol = {'prices': prices, 'volumes': volumes, 'highs': highs, 'lows': lows}
+        return TechnicalIndicators.calculate_batch_indicators({'_': symbol}, indicators, encoding)['_']
+
+    @staticmethod
+    def _series_output(series: Dict[str, Any], results: Dict[str, Any], row: int, n: int,
+                       volume_length: int, encoding: str) -> Dict[str, Any]:
+        """
+        Chuỗi đầy đủ (độ dài n, căn theo prices) của các chỉ báo đã có trong results
+        Volume căn phải theo nến mới nhất như prices: thiếu thì đệm NaN bên trái, thừa thì cắt bớt đầu
+        """
+        names = {
+            'rsi': ('rsi',),
+            'macd': ('macd', 'signal', 'histogram'),
+            'bollinger': ('upper', 'middle', 'lower'),
+            'ema': ('ema',),
+            'sma': ('sma',),
+            'stochastic': ('k_percent', 'd_percent'),
+            'volume': ('sma_volume',)
         }
-        
+        output = {"encoding": encoding, "length": n}
+        for key, parts in names.items():
+            if key not in results or key not in series:
+                continue
+            values = series[key] if isinstance(series[key], tuple) else (series[key],)
+            length = min(volume_length, n) if key == 'volume' else n
+            output[key] = {
+                part: encode_series(kernels.pad_series([value[row, -length:] if length else value[row, :0]], n)[0],
+                                    encoding)
+                for part, value in zip(parts, values)
+            }
+        return output
+
+    @staticmethod
+    def _high_low(values: Optional[Any], prices: np.ndarray) -> np.ndarray:
+        """
+        Chuẩn hóa highs/lows theo độ dài prices: rỗng -> dùng prices, một số -> lặp lại
+        """
+        if values is None or np.size(values) == 0 or (np.isscalar(values) and not values):
+            return prices
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim and len(values) != len(prices):
+            raise ValueError(f"highs/lows có {len(values)} phần tử, prices có {len(prices)}")
+        return np.broadcast_to(values, prices.shape)
+
+    @staticmethod
+    def _summarize(results: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Phân tích tổng hợp với trọng số từ kết quả các chỉ báo
+        """
         total_score = 0
         valid_indicators = 0
         signal_details = []
-        
+
         for key, value in results.items():
             if isinstance(value, dict) and 'error' not in value:
                 # Lấy signal từ các key khác nhau
@@ -454,9 +741,9 @@ class TechnicalIndicators:
                     signal = value['signal']
                 elif 'trend' in value:
                     signal = value['trend']
-                
-                if signal and signal in signal_weights:
-                    score = signal_weights[signal]
+
+                if signal and signal in SIGNAL_WEIGHTS:
+                    score = SIGNAL_WEIGHTS[signal]
                     total_score += score
                     valid_indicators += 1
                     signal_details.append({
@@ -465,11 +752,11 @@ class TechnicalIndicators:
                         'score': score,
                         'message': value.get('message', '')
                     })
-        
+
         # Tính điểm trung bình
         if valid_indicators > 0:
             average_score = total_score / valid_indicators
-            
+
             if average_score >= 1.5:
                 overall_signal = "STRONG_BULLISH"
                 recommendation = "Tín hiệu mua mạnh - Nên mua"
@@ -489,8 +776,8 @@ class TechnicalIndicators:
             overall_signal = "UNKNOWN"
             recommendation = "Không thể phân tích - Cần kiểm tra dữ liệu"
             average_score = 0
-        
-        results['summary'] = {
+
+        return {
             "overall_signal": overall_signal,
             "recommendation": recommendation,
             "average_score": round(average_score, 2),
@@ -499,11 +786,345 @@ class TechnicalIndicators:
             "signal_details": signal_details,
             "confidence": min(100, abs(average_score) * 30)  # Độ tin cậy 0-100%
         }
-        
-        return results
+
+
+def pack_binary_input(prices: Any, volumes: Optional[Any] = None, highs: Optional[Any] = None,
+                      lows: Optional[Any] = None, indicator: str = 'all') -> bytes:
+    """
+    Đóng gói dữ liệu theo định dạng nhị phân của --binary (dùng cho client Python và để test)
+    """
+    columns = {'prices': prices, 'volumes': volumes, 'highs': highs, 'lows': lows}
+    names = [name for name in BINARY_COLUMNS if _has_values(columns[name])]
+    data = [np.ascontiguousarray(columns[name], dtype=_BINARY_DTYPE) for name in names]
+    length = len(data[0])
+    if any(len(column) != length for column in data):
+        raise ValueError("Các cột phải có cùng độ dài")
+
+    header = json.dumps({"indicator": indicator, "length": length, "columns": names}).encode('utf-8')
+    header += b' ' * (-(len(BINARY_MAGIC) + 4 + len(header)) % 8)
+    return BINARY_MAGIC + struct.pack('<I', len(header)) + header + b''.join(column.tobytes() for column in data)
+
+
+def _parse_binary_header(prefix: bytes) -> Tuple[Dict[str, Any], int]:
+    """Trả về (header, offset của dữ liệu)"""
+    if len(prefix) < 8 or bytes(prefix[:4]) != BINARY_MAGIC:
+        raise ValueError("Input nhị phân không hợp lệ (sai magic)")
+    header_length = struct.unpack('<I', prefix[4:8])[0]
+    header = json.loads(bytes(prefix[8:8 + header_length]).decode('utf-8'))
+
+    unknown = set(header.get('columns', [])) - set(BINARY_COLUMNS)
+    if 'prices' not in header.get('columns', []) or unknown:
+        raise ValueError(f"Header phải có cột 'prices' và chỉ gồm {list(BINARY_COLUMNS)}")
+    return header, 8 + header_length
+
+
+def read_binary_input(source: Any) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """
+    Đọc input nhị phân từ bytes (stdin) hoặc đường dẫn file.
+    File được np.memmap nên không phải copy dữ liệu, kể cả file trong /dev/shm dùng chung với process khác.
+
+    Trả về (header, {tên cột: mảng float64})
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        header, offset = _parse_binary_header(memoryview(source))
+        count = len(header['columns']) * header['length']
+        if len(source) < offset + count * _BINARY_DTYPE.itemsize:
+            raise ValueError("Input nhị phân bị thiếu dữ liệu")
+        data = np.frombuffer(source, dtype=_BINARY_DTYPE, count=count, offset=offset)
+    else:
+        with open(source, 'rb') as f:
+            prefix = f.read(8)
+            if len(prefix) == 8 and prefix[:4] == BINARY_MAGIC:
+                prefix += f.read(struct.unpack('<I', prefix[4:8])[0])
+        header, offset = _parse_binary_header(prefix)
+        data = np.memmap(source, dtype=_BINARY_DTYPE, mode='r', offset=offset,
+                         shape=(len(header['columns']) * header['length'],))
+
+    data = data.reshape(len(header['columns']), header['length'])
+    return header, dict(zip(header['columns'], data))
+
+
+def compute_sweep(name: str, prices: List[float], params: Dict[str, Any],
+                  encoding: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Quét một chỉ báo trên lưới tham số (indicator_sweep) và trả về dạng JSON:
+    giá trị cuối của mỗi biến thể, kèm toàn bộ chuỗi nếu có encoding ('base64' / 'list')
+    """
+    if name not in sweeps.SWEEPS:
+        return {"error": f"Sweep '{name}' không được hỗ trợ. Hỗ trợ: {list(sweeps.SWEEPS)}"}
+
+    output = sweeps.SWEEPS[name](prices, **params)
+    lines = {key: value for key, value in output.items() if key != 'params'}
+    result = {
+        "params": output['params'].tolist(),
+        "last": {key: [None if np.isnan(v) else v for v in value[:, -1].tolist()] if value.shape[-1] else []
+                 for key, value in lines.items()}
+    }
+    if encoding is not None:
+        result['series'] = {key: [encode_series(row, encoding) for row in value] for key, value in lines.items()}
+    return result
+
+
+def compute_indicator(indicator_name: str, prices: List[float], volumes: Optional[List[float]] = None,
+                      highs: Optional[List[float]] = None, lows: Optional[List[float]] = None) -> Dict[str, Any]:
+    """
+    Tính chỉ báo theo tên - dùng chung cho chế độ argv và chế độ server
+    """
+    ta = TechnicalIndicators()
+    name = indicator_name.lower()
+
+    if name == 'rsi':
+        return ta.calculate_rsi(prices)
+    elif name == 'macd':
+        return ta.calculate_macd(prices)
+    elif name == 'bollinger':
+        return ta.calculate_bollinger_bands(prices)
+    elif name == 'ema':
+        return ta.calculate_ema(prices)
+    elif name == 'sma':
+        return ta.calculate_sma(prices)
+    elif name == 'stochastic':
+        return ta.calculate_stochastic(prices, highs, lows)
+    elif name == 'volume' and _has_values(volumes):
+        return ta.calculate_volume(prices, volumes)
+    elif name == 'all':
+        return ta.calculate_multiple_indicators(prices, volumes, highs, lows)
+    elif name == 'series':
+        return ta.calculate_indicator_series(prices, volumes, highs, lows)
+    return {"error": f"Chỉ báo '{indicator_name}' không được hỗ trợ"}
+
+
+# Trạng thái streaming theo key (symbol/interval) của worker, xem indicator_state.py
+_STREAMS: Dict[str, Any] = {}
+_STREAMS_LOCK = threading.Lock()
+
+
+# Cache kết quả 'all' của worker (tạo khi cần), xem indicator_cache.py
+_RESULT_CACHE = None
+# serve_socket xử lý request trên nhiều thread: chỉ một thread được tạo cache
+_RESULT_CACHE_LOCK = threading.Lock()
+
+
+def _result_cache():
+    global _RESULT_CACHE
+    if _RESULT_CACHE is None:
+        with _RESULT_CACHE_LOCK:
+            if _RESULT_CACHE is None:
+                # Import tại chỗ vì indicator_cache import ngược lại module này
+                from indicator_cache import IndicatorCache
+                _RESULT_CACHE = IndicatorCache(
+                    maxsize=int(os.environ.get('INDICATOR_CACHE_SIZE', 256)),
+                    ttl=float(os.environ.get('INDICATOR_CACHE_TTL', 60))
+                )
+    return _RESULT_CACHE
+
+
+def _handle_stream_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Cập nhật chỉ báo tăng dần cho một key thay vì tính lại từ toàn bộ lịch sử
+
+    stream:         thêm các nến mới (prices/volumes/highs/lows) rồi trả về kết quả như 'all'
+    stream_state:   trả về trạng thái đã serialize để lưu lại
+    stream_restore: khôi phục trạng thái đã lưu (sau khi restart worker)
+    """
+    # Import tại chỗ vì indicator_state import ngược lại module này
+    from indicator_state import IndicatorSet, StreamingState
+
+    op = request['indicator']
+    key = request.get('key')
+    if key is None:
+        return {"error": "Thiếu tham số. Cần: key"}
+
+    with _STREAMS_LOCK:
+        if op == 'stream_restore':
+            _STREAMS[key] = StreamingState.from_dict(request['state'])
+            return {"key": key, "count": _STREAMS[key].count}
+
+        if op == 'stream_state':
+            if key not in _STREAMS:
+                return {"error": f"Không có trạng thái cho key '{key}'"}
+            return _STREAMS[key].to_dict()
+
+        state = _STREAMS.get(key)
+        if state is None or request.get('reset'):
+            state = _STREAMS[key] = IndicatorSet(request.get('indicators'))
+        state.extend(
+            request.get('prices') or [],
+            request.get('volumes'),
+            request.get('highs'),
+            request.get('lows')
+        )
+        return state.result()
+
+
+def handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Xử lý một request JSON của chế độ server
+
+    Request:  {"id": ..., "indicator": "rsi", "prices": [...], "volumes": [...], "highs": [...], "lows": [...]}
+              {"id": ..., "indicator": "batch", "symbols": {"BTC": {"prices": [...], ...}, ...}, "series": "base64"}
+              {"id": ..., "indicator": "stream", "key": "BTCUSDT", "prices": [<nến mới>], ...}
+              {"id": ..., "indicator": "all", "file": "/dev/shm/btc.bin"}  (định dạng nhị phân, xem BINARY_MAGIC)
+    Response: {"id": ..., "result": {...}} hoặc {"id": ..., "error": "..."}
+    """
+    request_id = request.get('id')
+    try:
+        if request.get('indicator') in ('stream', 'stream_state', 'stream_restore'):
+            result = _handle_stream_request(request)
+            if 'error' in result:
+                return {"id": request_id, "error": result['error']}
+            return {"id": request_id, "result": result}
+
+        # Batch nhiều symbol: {"id": ..., "indicator": "batch", "symbols": {...}, "indicators": [...]}
+        if request.get('indicator') == 'batch':
+            if not isinstance(request.get('symbols'), dict):
+                return {"id": request_id, "error": "Thiếu tham số. Cần: symbols"}
+            result = TechnicalIndicators.calculate_batch_indicators(
+                request['symbols'], request.get('indicators'), request.get('series')
+            )
+            return {"id": request_id, "result": result}
+
+        # Dữ liệu lớn: client ghi file nhị phân (vd. trong /dev/shm) và chỉ gửi đường dẫn
+        if 'file' in request:
+            header, columns = read_binary_input(request['file'])
+            result = compute_indicator(
+                request.get('indicator') or header.get('indicator', 'all'),
+                columns['prices'],
+                columns.get('volumes'),
+                columns.get('highs'),
+                columns.get('lows')
+            )
+            return {"id": request_id, "result": result}
+
+        if request.get('indicator') == 'cache_stats':
+            return {"id": request_id, "result": _result_cache().stats()}
+
+        if 'prices' not in request or 'indicator' not in request:
+            return {"id": request_id, "error": "Thiếu tham số. Cần: prices và indicator"}
+
+        # Quét tham số: {"indicator": "sweep", "sweep": "rsi", "params": {"periods": [7, 14, 21]}, "encoding": ...}
+        if request['indicator'].lower() == 'sweep':
+            return {"id": request_id, "result": compute_sweep(
+                request.get('sweep', ''), request['prices'], request.get('params') or {}, request.get('encoding')
+            )}
+
+        # Toàn bộ chuỗi cho biểu đồ: {"indicator": "series", "encoding": "base64" | "list", "indicators": [...]}
+        if request['indicator'].lower() == 'series':
+            result = TechnicalIndicators.calculate_indicator_series(
+                request['prices'],
+                request.get('volumes'),
+                request.get('highs'),
+                request.get('lows'),
+                request.get('indicators'),
+                request.get('encoding', 'base64')
+            )
+            return {"id": request_id, "result": result}
+
+        # Dashboard, cảnh báo và bot thường hỏi cùng một symbol cách nhau vài giây
+        if request['indicator'].lower() == 'all':
+            result = _result_cache().calculate_multiple_indicators(
+                request['prices'],
+                request.get('volumes'),
+                request.get('highs'),
+                request.get('lows')
+            )
+            return {"id": request_id, "result": result}
+
+        result = compute_indicator(
+            request['indicator'],
+            request['prices'],
+            request.get('volumes'),
+            request.get('highs'),
+            request.get('lows')
+        )
+        return {"id": request_id, "result": result}
+
+    except Exception as e:
+        return {"id": request_id, "error": f"Lỗi: {str(e)}"}
+
+
+def serve_lines(reader, writer) -> None:
+    """
+    Đọc request JSON theo từng dòng và ghi response theo từng dòng.
+    Mỗi response mang theo id của request nên client có thể gửi nhiều request liên tiếp
+    mà không cần chờ response trước đó.
+    """
+    for line in reader:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response = {"id": None, "error": f"JSON không hợp lệ: {str(e)}"}
+        else:
+            response = handle_request(request) if isinstance(request, dict) else \
+                {"id": None, "error": "Request phải là một JSON object"}
+
+        writer.write(json.dumps(json_safe(response), ensure_ascii=False, allow_nan=False) + "\n")
+        writer.flush()
+
+
+class _SocketWriter:
+    """Bọc wfile (bytes) để serve_lines có thể ghi str"""
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, text: str) -> None:
+        self.wfile.write(text.encode('utf-8'))
+
+    def flush(self) -> None:
+        self.wfile.flush()
+
+
+def serve_socket(socket_path: str) -> None:
+    """
+    Chạy worker trên Unix socket, mỗi kết nối được xử lý trong một thread riêng
+    """
+    class IndicatorRequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            reader = (line.decode('utf-8') for line in self.rfile)
+            writer = _SocketWriter(self.wfile)
+            serve_lines(reader, writer)
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    with socketserver.ThreadingUnixStreamServer(socket_path, IndicatorRequestHandler) as server:
+        server.daemon_threads = True
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(socket_path)
+
 
 def main():
     # try:
+        # Chế độ worker: giữ process sống để tránh chi phí khởi động Python + import pandas/numpy mỗi lần gọi
+        if len(sys.argv) > 1 and sys.argv[1] == '--serve':
+            serve_lines(sys.stdin, sys.stdout)
+            return
+
+        if len(sys.argv) > 2 and sys.argv[1] == '--socket':
+            serve_socket(sys.argv[2])
+            return
+
+        # Input nhị phân: --binary <file | -> [indicator] (file được memmap, '-' đọc từ stdin)
+        # Kết quả in JSON gọn trên một dòng
+        if len(sys.argv) > 2 and sys.argv[1] == '--binary':
+            try:
+                source = sys.stdin.buffer.read() if sys.argv[2] == '-' else sys.argv[2]
+                header, columns = read_binary_input(source)
+                indicator_name = sys.argv[3] if len(sys.argv) > 3 else header.get('indicator', 'all')
+                result = compute_indicator(indicator_name, columns['prices'], columns.get('volumes'),
+                                           columns.get('highs'), columns.get('lows'))
+            except Exception as e:
+                result = {"error": f"Lỗi: {str(e)}"}
+            print(json.dumps(json_safe(result), ensure_ascii=False, allow_nan=False, separators=(',', ':')))
+            return
+
         if len(sys.argv) < 3:
             print(json.dumps({"error": "Thiếu tham số. Cần: prices_json và indicator_name"}))
             return
@@ -537,33 +1158,12 @@ def main():
             except:
                 pass
         
-        # Tạo instance
-        ta = TechnicalIndicators()
-        
-        # Tính chỉ báo dựa trên tên
-        if indicator_name.lower() == 'rsi':
-            result = ta.calculate_rsi(prices)
-        elif indicator_name.lower() == 'macd':
-            result = ta.calculate_macd(prices)
-        elif indicator_name.lower() == 'bollinger':
-            result = ta.calculate_bollinger_bands(prices)
-        elif indicator_name.lower() == 'ema':
-            result = ta.calculate_ema(prices)
-        elif indicator_name.lower() == 'sma':
-            result = ta.calculate_sma(prices)
-        elif indicator_name.lower() == 'stochastic':
-            result = ta.calculate_stochastic(prices, highs, lows)
-        elif indicator_name.lower() == 'volume' and volumes:
-            result = ta.calculate_volume(prices, volumes)
-        elif indicator_name.lower() == 'all':
-            result = ta.calculate_multiple_indicators(prices, volumes, highs, lows)
-        else:
-            result = {"error": f"Chỉ báo '{indicator_name}' không được hỗ trợ"}
+        result = compute_indicator(indicator_name, prices, volumes, highs, lows)
         
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+        print(json.dumps(json_safe(result), ensure_ascii=False, allow_nan=False, indent=2))
         
     # except Exception as e:
     #     print(json.dumps({"error": f"Lỗi: {str(e)}"}, ensure_ascii=False))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
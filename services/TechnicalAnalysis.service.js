@@ -8,6 +8,8 @@ import {
 
 import path from 'path';
 
+import readline from 'readline';
+
 import coinGeckoService from './CoinGecko.service.js';
 
 
@@ -19,64 +21,164 @@ class TechnicalAnalysisService {
     constructor() {
         this.pythonScriptPath = path.join(__dirname, '../python/technical_indicators.py');
         this.priceCache = new Map();
+
+        // Worker Python chạy lâu dài (technical_indicators.py --serve)
+        this.worker = null;
+        this.pendingRequests = new Map();
+        this.nextRequestId = 1;
+        this.requestTimeout = 30000;
     }
 
     /**
-     *  RSI: chỉ báo động lực, > 70: quá mua (có thể giảm), < 30: quá bán (có thể tăng)
-     * @param {*} symbol 
-     * @param {*} exchange 
-     * @param {*} interval 
+     * Khởi động (hoặc tái sử dụng) worker Python, tránh chi phí khởi động interpreter
+     * và import pandas/numpy cho mỗi lần tính chỉ báo.
+     * @returns {ChildProcess} - Worker process
      */
+    getWorker() {
+        if (this.worker) {
+            return this.worker;
+        }
 
-    async runPythonScript(prices, indicator, volumes = null, highs = null, lows = null) {
-        return new Promise((resolve, reject) => {
-            const args = [
-                this.pythonScriptPath,
-                JSON.stringify(prices),
-                indicator
-            ];
-
-            if (volumes) {
-                args.push(JSON.stringify(volumes));
+        const worker = spawn('python', [this.pythonScriptPath, '--serve']);
+        const lines = readline.createInterface({
+            input: worker.stdout
+        });
+
+        lines.on('line', (line) => {
+            let response;
+            try {
+                response = JSON.parse(line);
+            } catch (error) {
+                console.error(`Error parse worker response: ${error.message}`);
+                // Không parse được thì vẫn lấy id (nếu có) để request không phải chờ tới timeout;
+                // không có id thì không biết dòng này của request nào, nên reject tất cả
+                const match = /"id"\s*:\s*(\d+)/.exec(line);
+                const ids = match ? [Number(match[1])] : [...this.pendingRequests.keys()];
+                for (const id of ids) {
+                    const pending = this.pendingRequests.get(id);
+                    if (pending) {
+                        this.pendingRequests.delete(id);
+                        clearTimeout(pending.timer);
+                        pending.reject(new Error(`Error parse worker response: ${error.message}`));
+                    }
+                }
+                return;
             }
 
-            if (highs) {
-                args.push(JSON.stringify(highs));
+            const pending = this.pendingRequests.get(response.id);
+            if (!pending) {
+                return;
             }
 
-            if (lows) {
-                args.push(JSON.stringify(lows));
+            this.pendingRequests.delete(response.id);
+            clearTimeout(pending.timer);
+
+            if (response.error) {
+                pending.reject(new Error(response.error));
+            } else {
+                pending.resolve(response.result);
+            }
+        });
+
+        worker.stderr.on('data', (data) => {
+            console.error(`Python worker: ${data.toString()}`);
+        });
+
+        const failPending = (error) => {
+            if (this.worker === worker) {
+                this.worker = null;
+            }
+            for (const [id, pending] of this.pendingRequests) {
+                clearTimeout(pending.timer);
+                pending.reject(error);
+                this.pendingRequests.delete(id);
             }
+        };
 
-            const pythonProcess = spawn('python', args);
+        worker.on('exit', (code) => {
+            failPending(new Error(`Python worker exited with code ${code}`));
+        });
 
-            let dataString = '';
-            let errorString = '';
+        worker.on('error', (error) => {
+            failPending(new Error(`Error run Python: ${error.message}`));
+        });
 
-            pythonProcess.stdout.on('data', (data) => {
-                dataString += data.toString();
-            });
+        // Ghi vào stdin của worker đã chết (EPIPE) báo lỗi ở đây, không phải ở worker.on('error')
+        worker.stdin.on('error', (error) => {
+            failPending(new Error(`Error write Python worker: ${error.message}`));
+        });
 
-            pythonProcess.stderr.on('data', (data) => {
-                errorString += data.toString();
-            });
+        this.worker = worker;
+        return worker;
+    }
 
-            pythonProcess.on('close', (code) => {
-                if (code === 0) {
-                    try {
-                        const result = JSON.parse(dataString);
-                        resolve(result);
-                    } catch (error) {
-                        reject(new Error(`Error parse JSON: ${error.message}`));
-                    }
-                } else {
-                    reject(new Error(`Python script failed: ${errorString}`));
-                }
+    /**
+     * Gửi một request tới worker Python, response được ghép lại theo id
+     * nên nhiều request có thể chạy đồng thời.
+     * @param {Object} payload - Request body (indicator, prices, volumes, highs, lows)
+     * @returns {Promise<Object>} - Calculation result
+     */
+    sendWorkerRequest(payload) {
+        return new Promise((resolve, reject) => {
+            const worker = this.getWorker();
+            const id = this.nextRequestId++;
+
+            const timer = setTimeout(() => {
+                this.pendingRequests.delete(id);
+                reject(new Error(`Python worker timeout after ${this.requestTimeout}ms`));
+            }, this.requestTimeout);
+
+            this.pendingRequests.set(id, {
+                resolve,
+                reject,
+                timer
             });
 
-            pythonProcess.on('error', (error) => {
-                reject(new Error(`Error run Python: ${error.message}`));
-            });
+            worker.stdin.write(JSON.stringify({
+                id,
+                ...payload
+            }) + '\n');
+        });
+    }
+
+    stopWorker() {
+        if (this.worker) {
+            this.worker.stdin.end();
+            this.worker = null;
+        }
+    }
+
+    /**
+     *  RSI: chỉ báo động lực, > 70: quá mua (có thể giảm), < 30: quá bán (có thể tăng)
+     * @param {*} symbol 
+     * @param {*} exchange 
+     * @param {*} interval 
+     */
+
+    async runPythonScript(prices, indicator, volumes = null, highs = null, lows = null) {
+        return this.sendWorkerRequest({
+            indicator,
+            prices,
+            volumes,
+            highs,
+            lows
+        });
+    }
+
+    /**
+     * Cập nhật chỉ báo tăng dần: worker giữ trạng thái theo key, chỉ cần gửi các nến mới
+     * @param {string} key - Ví dụ 'BTCUSDT:1h'
+     * @param {Object} candles - { prices, volumes, highs, lows } của các nến mới
+     * @returns {Promise<Object>} - Kết quả giống indicator 'all'
+     */
+    async updateIndicatorStream(key, { prices, volumes = null, highs = null, lows = null }) {
+        return this.sendWorkerRequest({
+            indicator: 'stream',
+            key,
+            prices,
+            volumes,
+            highs,
+            lows
         });
     }
 
@@ -171,6 +273,36 @@ class TechnicalAnalysisService {
         // }
     }
 
+    /**
+     * Tính tất cả chỉ báo kèm toàn bộ chuỗi (cho biểu đồ) trong một lần gọi
+     * @param {string} symbol - Coin symbol
+     * @returns {Promise<Object>} - Kết quả như calculateAllIndicators, thêm `series` đã giải mã thành Float32Array
+     */
+    async calculateIndicatorSeries(symbol) {
+        const priceData = await this.getPriceData(symbol);
+
+        const result = await this.runPythonScript(
+            priceData[symbol].prices,
+            'series',
+            priceData[symbol].volumes,
+            priceData[symbol].highs,
+            priceData[symbol].lows
+        );
+
+        if (result.series) {
+            for (const [indicator, lines] of Object.entries(result.series)) {
+                if (typeof lines !== 'object') continue;
+                for (const [line, encoded] of Object.entries(lines)) {
+                    // base64 float32 little-endian, NaN ở đầu chuỗi khi chưa đủ dữ liệu
+                    const bytes = Buffer.from(encoded, 'base64');
+                    lines[line] = new Float32Array(bytes.buffer.slice(bytes.byteOffset, bytes.byteOffset + bytes.length));
+                }
+            }
+        }
+
+        return result;
+    }
+
     async getSingleIndicator(symbol, indicator) {
         try {
             const result = await this.calculateSingleIndicator(symbol, indicator);